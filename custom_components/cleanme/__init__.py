@@ -45,8 +45,21 @@ from .const import (
     ATTR_DASHBOARD_STATUS,
     SIGNAL_SYSTEM_STATE_UPDATED,
     SIGNAL_ZONE_STATE_UPDATED,
+    DATA_DASHBOARD_LATENCY,
 )
-from .coordinator import CleanMeZone
+from .coordinator import CleanMeZone, async_check_all_zones
+from .executor import async_shutdown_cpu_executor
+from .session import async_close_session_manager, async_get_session_manager
+from .settings import SETTINGS_SCHEMA
+from .timing import (
+    SPAN_DASHBOARD_GENERATE,
+    SPAN_DASHBOARD_REGISTER,
+    SPAN_DASHBOARD_WRITE,
+    LatencyRecorder,
+    span,
+    track_check,
+)
+from .watchdog import async_setup_loop_watchdog, operation
 from . import dashboard as cleanme_dashboard
 
 LOGGER = logging.getLogger(__name__)
@@ -59,6 +72,18 @@ except ImportError:
     YAML_AVAILABLE = False
     LOGGER.warning("CleanMe: PyYAML not available, YAML dashboard export disabled")
 
+# Zones are set up through the UI; the optional YAML block only holds global tuning
+CONFIG_SCHEMA = vol.Schema(
+    {vol.Optional(DOMAIN): SETTINGS_SCHEMA},
+    extra=vol.ALLOW_EXTRA,
+)
+
+
+def _get_dashboard_latency(hass: HomeAssistant) -> LatencyRecorder:
+    """Return the recorder for dashboard regeneration timings."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    return domain_data.setdefault(DATA_DASHBOARD_LATENCY, LatencyRecorder())
+
 
 def _get_dashboard_state(hass: HomeAssistant) -> dict[str, Any]:
     """Return mutable dashboard state dict stored in hass.data."""
@@ -113,7 +138,10 @@ async def async_setup_cleanme_logger(hass: HomeAssistant):
 
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
-    """Set up from YAML (not used)."""
+    """Set up global tuning from YAML (zones are configured in the UI)."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    domain_data["settings"] = SETTINGS_SCHEMA(config.get(DOMAIN) or {})
+    async_setup_loop_watchdog(hass)
     return True
 
 
@@ -132,6 +160,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     )
 
     hass.data[DOMAIN][entry.entry_id] = zone
+    async_get_session_manager(hass)
 
     await zone.async_setup()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -176,6 +205,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
+    if not any(isinstance(value, CleanMeZone) for value in hass.data[DOMAIN].values()):
+        # Last zone gone - release pooled Gemini connections and worker threads
+        await async_close_session_manager(hass)
+        async_shutdown_cpu_executor(hass)
+
     if not hass.data[DOMAIN]:
         hass.services.async_remove(DOMAIN, SERVICE_REQUEST_CHECK)
         hass.services.async_remove(DOMAIN, SERVICE_SNOOZE_ZONE)
@@ -225,9 +259,16 @@ async def _regenerate_dashboard_yaml(hass: HomeAssistant) -> None:
         async_dispatcher_send(hass, SIGNAL_SYSTEM_STATE_UPDATED)
         return
 
+    with track_check() as timer, operation("dashboard"):
+        await _async_write_dashboard(hass, dashboard_state)
+    _get_dashboard_latency(hass).record(timer)
+
+
+async def _async_write_dashboard(hass: HomeAssistant, dashboard_state: dict[str, Any]) -> None:
     try:
         # Generate dashboard config
-        dashboard_config = cleanme_dashboard.generate_dashboard_config(hass)
+        with span(SPAN_DASHBOARD_GENERATE):
+            dashboard_config = cleanme_dashboard.generate_dashboard_config(hass)
         
         # Build full Lovelace dashboard config with views list
         lovelace_config = {
@@ -259,7 +300,8 @@ async def _regenerate_dashboard_yaml(hass: HomeAssistant) -> None:
                 )
             return yaml_file
 
-        yaml_file = await hass.async_add_executor_job(_write_yaml)
+        with span(SPAN_DASHBOARD_WRITE):
+            yaml_file = await hass.async_add_executor_job(_write_yaml)
 
         dashboard_state[ATTR_DASHBOARD_PATH] = yaml_file
         dashboard_state[ATTR_DASHBOARD_LAST_GENERATED] = utcnow()
@@ -269,7 +311,8 @@ async def _regenerate_dashboard_yaml(hass: HomeAssistant) -> None:
         LOGGER.info("CleanMe: Dashboard YAML written to %s", yaml_file)
 
         # Auto-register the dashboard in Home Assistant sidebar
-        await _auto_register_dashboard(hass, lovelace_config)
+        with span(SPAN_DASHBOARD_REGISTER):
+            await _auto_register_dashboard(hass, lovelace_config)
 
     except Exception as e:
         LOGGER.error("CleanMe: Failed to write dashboard: %s", e)
@@ -556,8 +599,7 @@ def _register_services(hass: HomeAssistant) -> None:
             if isinstance(zone, CleanMeZone)
         ]
         LOGGER.info("CleanMe: Checking all %d zones", len(zones))
-        for zone in zones:
-            await zone.async_request_check(reason="check_all")
+        await async_check_all_zones(hass, zones)
 
     async def handle_set_priority(call: ServiceCall) -> None:
         """Set zone priority."""
@@ -0,0 +1,119 @@
+"""Learn how quickly a zone gets messy and when to check it next.
+
+Fixed frequencies check a guest room that never changes as often as a
+playroom that is chaos by lunchtime. The adaptive frequency instead keeps
+a messiness rate per zone: after each analysis, the messiness score is
+divided by the hours since the room was last seen (or marked) tidy.
+Tidy observations count as zero points over their hours, so stable rooms
+drift towards a low rate. Older observations decay, so the rate follows
+changes in how the room is used.
+
+The next check is scheduled for when the predicted score crosses a
+threshold, bounded by a minimum interval and the zone's check interval.
+This module has no Home Assistant dependencies.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict
+
+# Weight kept by older observations each time a new one is learned
+DECAY = 0.8
+
+# Observations closer than this to the last tidy one say little about the rate
+MIN_SAMPLE_HOURS = 0.5
+
+
+@dataclass
+class MessinessModel:
+    """Decayed estimate of messiness points gained per hour."""
+
+    points: float = 0.0
+    hours: float = 0.0
+    samples: int = 0
+    # Last time the room was seen or marked tidy
+    reference: datetime | None = None
+    # The mess since reference has been learned; later checks only see it linger
+    sampled: bool = False
+
+    @property
+    def rate(self) -> float | None:
+        """Return messiness points per hour, or None before anything was learned."""
+        if not self.samples or self.hours <= 0:
+            return None
+        return self.points / self.hours
+
+    def observe(self, when: datetime, score: int) -> None:
+        """Learn from an analysis with messiness score (0-100) taken at when."""
+        if score <= 0:
+            if self.reference is not None and not self.sampled:
+                self._learn(0, when)
+            self.reference = when
+            self.sampled = False
+            return
+
+        if self.reference is None or self.sampled:
+            return
+        if self._learn(score, when):
+            self.sampled = True
+
+    def mark_clean(self, when: datetime) -> None:
+        """Restart the clock after the room was cleaned."""
+        self.reference = when
+        self.sampled = False
+
+    def next_check_in(
+        self,
+        now: datetime,
+        score: int,
+        threshold: float,
+        min_hours: float,
+        max_hours: float,
+    ) -> float:
+        """Return hours until the predicted score reaches threshold, within bounds.
+
+        Rooms already past the threshold, and rooms without enough history,
+        are checked at max_hours; there is nothing to catch early.
+        """
+        rate = self.rate
+        if not rate or self.reference is None or score >= threshold:
+            return max_hours
+
+        elapsed = max((now - self.reference).total_seconds() / 3600, 0.0)
+        predicted = max(score, rate * elapsed)
+        hours = (threshold - predicted) / rate
+        return min(max(hours, min_hours), max_hours)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return a JSON-serializable form for the zone's Store."""
+        return {
+            "points": self.points,
+            "hours": self.hours,
+            "samples": self.samples,
+            "reference": self.reference.isoformat() if self.reference else None,
+            "sampled": self.sampled,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any] | None) -> MessinessModel:
+        """Restore a model saved with as_dict()."""
+        if not data:
+            return cls()
+        reference = data.get("reference")
+        return cls(
+            points=float(data.get("points", 0.0)),
+            hours=float(data.get("hours", 0.0)),
+            samples=int(data.get("samples", 0)),
+            reference=datetime.fromisoformat(reference) if reference else None,
+            sampled=bool(data.get("sampled", False)),
+        )
+
+    def _learn(self, score: int, when: datetime) -> bool:
+        hours = (when - self.reference).total_seconds() / 3600
+        if hours < MIN_SAMPLE_HOURS:
+            return False
+        self.points = self.points * DECAY + score
+        self.hours = self.hours * DECAY + hours
+        self.samples += 1
+        return True
@@ -19,6 +19,7 @@ from .const import (
     ATTR_PICKINESS,
     ATTR_CAMERA_ENTITY,
     ATTR_LAST_CHECK,
+    ATTR_PARTIAL,
     ATTR_SNOOZE_UNTIL,
     ATTR_ZONE_COUNT,
     ATTR_DASHBOARD_PATH,
@@ -121,6 +122,10 @@ class CleanMeTidyBinarySensor(CleanMeZoneBinarySensor):
         if self._zone.snooze_until:
             attrs[ATTR_SNOOZE_UNTIL] = self._zone.snooze_until.isoformat()
 
+        if self._zone.state.partial:
+            # Streamed check in progress - tasks and comment are still arriving
+            attrs[ATTR_PARTIAL] = True
+
         return attrs
 
 
@@ -0,0 +1,231 @@
+"""Daily Gemini request budget shared by every zone.
+
+Free-tier and capped API keys have a daily request quota. Without a
+budget, zones simply fail with 429s once it is spent, often the ones
+scheduled late in the day. With daily_request_budget set, every
+generateContent request is counted against the cap, and a share of it is
+held back for manual checks. Checks that end without a request (a failed
+snapshot, a cached result, a local gate) hand their admission back.
+
+Scheduled checks share the rest by weight. Each zone's weight comes from
+its priority, whether it is overdue and how quickly it gets messy. A zone
+may go past its share only while the pool still covers what the other
+zones are owed. Scheduled checks that do not fit are deferred until the
+budget resets instead of failing.
+
+The day follows Gemini's quota day (midnight Pacific time). Counts are
+kept in a Store, so a restart does not hand out the day's budget again.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import date, datetime, time as dt_time, timedelta
+import logging
+import math
+from typing import Any, Dict, Mapping
+from zoneinfo import ZoneInfo
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    CONF_DAILY_REQUEST_BUDGET,
+    CONF_BUDGET_MANUAL_RESERVE,
+    BUDGET_SAVE_DELAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .settings import get_settings
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_REQUEST_BUDGET = "request_budget"
+
+# Gemini's per-day quotas reset at midnight Pacific time
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+
+class RequestBudget:
+    """Count Gemini requests per quota day and admit checks within the cap."""
+
+    def __init__(
+        self,
+        daily_limit: int,
+        manual_reserve_percent: int,
+        store: Store | None = None,
+    ) -> None:
+        """Initialize the budget; a daily_limit of 0 only counts requests."""
+        self._limit = daily_limit
+        self._reserve = math.ceil(daily_limit * manual_reserve_percent / 100)
+        self._store = store
+        self._load_lock = asyncio.Lock()
+        self._loaded = store is None
+
+        self._day = self._quota_day()
+        self._used = 0
+        # entry_id -> checks admitted today
+        self._admitted: Dict[str, int] = {}
+        self._deferred = 0
+        self._quota_exceeded = False
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if a daily cap is configured."""
+        return self._limit > 0
+
+    @property
+    def remaining(self) -> int | None:
+        """Return requests left today, or None without a cap."""
+        if not self.enabled:
+            return None
+        self._roll_over()
+        if self._quota_exceeded:
+            return 0
+        return max(self._limit - self._spent(), 0)
+
+    @property
+    def resets_at(self) -> datetime:
+        """Return when the current quota day ends."""
+        return datetime.combine(self._day + timedelta(days=1), dt_time(), QUOTA_TIMEZONE)
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return budget counters."""
+        remaining = self.remaining
+        return {
+            "daily_limit": self._limit or None,
+            "used_today": self._used,
+            "remaining": remaining,
+            "reserved_for_manual": self._reserve,
+            "deferred_checks": self._deferred,
+            "quota_exceeded": self._quota_exceeded,
+            "resets_at": self.resets_at.isoformat(),
+        }
+
+    async def async_acquire(
+        self, entry_id: str, scheduled: bool, weights: Mapping[str, float]
+    ) -> bool:
+        """Return True if a check may run now, counting it against entry_id's share.
+
+        ``weights`` maps the entry_id of every zone competing for scheduled
+        checks to its weight; it is only used for scheduled checks.
+        """
+        await self._async_ensure_loaded()
+        self._roll_over()
+
+        if self.enabled and not self._admits(entry_id, scheduled, weights):
+            if scheduled:
+                self._deferred += 1
+            return False
+
+        self._admitted[entry_id] = self._admitted.get(entry_id, 0) + 1
+        self._schedule_save()
+        return True
+
+    @callback
+    def release(self, entry_id: str) -> None:
+        """Give back a check admitted for entry_id that never sent a request."""
+        if not self.enabled:
+            return
+        self._roll_over()
+        if self._admitted.get(entry_id, 0) > 0:
+            self._admitted[entry_id] -= 1
+            self._schedule_save()
+
+    @callback
+    def count_request(self, status: int) -> None:
+        """Count a request sent to Gemini; a 429 means the quota is spent for today."""
+        self._roll_over()
+        self._used += 1
+        if status == 429 and self.enabled:
+            self._quota_exceeded = True
+        self._schedule_save()
+
+    def _admits(self, entry_id: str, scheduled: bool, weights: Mapping[str, float]) -> bool:
+        if self._quota_exceeded:
+            return False
+        remaining = self._limit - self._spent()
+        if not scheduled:
+            return remaining > 0
+
+        pool_left = remaining - self._reserve
+        if pool_left <= 0:
+            return False
+
+        pool = self._limit - self._reserve
+        total = sum(weights.values()) or 1.0
+        shares = {key: pool * weight / total for key, weight in weights.items()}
+        if self._admitted.get(entry_id, 0) < shares.get(entry_id, 0):
+            return True
+        # Past its share: only use what the other zones cannot still claim
+        owed = sum(
+            max(share - self._admitted.get(key, 0), 0)
+            for key, share in shares.items()
+            if key != entry_id
+        )
+        return pool_left > owed
+
+    def _spent(self) -> int:
+        # Admitted checks count as at least one request each, so checks
+        # started together cannot all pass before their requests are counted
+        return max(self._used, sum(self._admitted.values()))
+
+    @callback
+    def _roll_over(self) -> None:
+        today = self._quota_day()
+        if today != self._day:
+            self._day = today
+            self._used = 0
+            self._admitted.clear()
+            self._quota_exceeded = False
+
+    @staticmethod
+    def _quota_day() -> date:
+        return datetime.now(QUOTA_TIMEZONE).date()
+
+    async def _async_ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            data = await self._store.async_load() or {}
+            if data.get("day") == self._day.isoformat():
+                # Requests counted before the load belong to the same day
+                self._used += data.get("used", 0)
+                for entry_id, count in data.get("admitted", {}).items():
+                    self._admitted[entry_id] = self._admitted.get(entry_id, 0) + count
+                self._quota_exceeded = self._quota_exceeded or data.get("quota_exceeded", False)
+            self._loaded = True
+
+    @callback
+    def _schedule_save(self) -> None:
+        if self._store is not None and self._loaded:
+            self._store.async_delay_save(self._data_to_save, BUDGET_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {
+            "day": self._day.isoformat(),
+            "used": self._used,
+            "admitted": dict(self._admitted),
+            "quota_exceeded": self._quota_exceeded,
+        }
+
+
+@callback
+def async_get_request_budget(hass: HomeAssistant) -> RequestBudget:
+    """Return the shared request budget, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    budget: RequestBudget | None = domain_data.get(DATA_REQUEST_BUDGET)
+    if budget is None:
+        settings = get_settings(hass)
+        limit = settings[CONF_DAILY_REQUEST_BUDGET]
+        budget = RequestBudget(
+            limit,
+            settings[CONF_BUDGET_MANUAL_RESERVE],
+            Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.budget") if limit else None,
+        )
+        domain_data[DATA_REQUEST_BUDGET] = budget
+    return budget
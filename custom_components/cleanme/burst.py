@@ -0,0 +1,107 @@
+"""Burst capture: analyze the best of several snapshots.
+
+A single snapshot can catch motion blur, an IR switchover or someone
+walking through the room, and Gemini then judges a frame that says
+nothing about the room (or calls it messy). With burst_frames above 1,
+each capture grabs that many snapshots burst_interval seconds apart,
+scores them on the CPU executor (see imaging.score_frames) and hands only
+the best one on. The burst runs inside the snapshot broker's fetch, so
+zones sharing a camera share the chosen frame too.
+
+Scoring needs Pillow and NumPy; without them a single snapshot is taken.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, CONF_BURST_FRAMES, CONF_BURST_INTERVAL
+from .executor import async_get_cpu_executor
+from .imaging import SCORING_AVAILABLE, score_frames
+from .settings import get_settings
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_BURST_CAPTURE = "burst_capture"
+
+
+class BurstCapture:
+    """Take a burst of snapshots and keep the best-scoring frame."""
+
+    def __init__(self, hass: HomeAssistant, frames: int, interval: float) -> None:
+        """Initialize burst capture."""
+        self.hass = hass
+        self._frames = frames
+        self._interval = interval
+        if frames > 1 and not SCORING_AVAILABLE:
+            _LOGGER.warning("burst_frames needs Pillow and NumPy; taking single snapshots")
+            self._frames = 1
+
+        self._bursts = 0
+        self._frames_captured = 0
+        self._frames_failed = 0
+        self._scoring_failures = 0
+        self._last_scores: List[float] = []
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return burst counters."""
+        return {
+            "frames_per_burst": self._frames,
+            "bursts": self._bursts,
+            "frames_captured": self._frames_captured,
+            "frames_failed": self._frames_failed,
+            "scoring_failures": self._scoring_failures,
+            "last_scores": self._last_scores,
+        }
+
+    async def async_capture(self, fetch: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Return the best of a burst of fetch() snapshots."""
+        if self._frames <= 1:
+            return await fetch()
+
+        self._bursts += 1
+        frames: List[bytes] = []
+        for index in range(self._frames):
+            if index and self._interval:
+                await asyncio.sleep(self._interval)
+            try:
+                frames.append(await fetch())
+            except Exception as err:
+                self._frames_failed += 1
+                if not frames:
+                    # The camera is down; retrying the burst would only delay the error
+                    raise
+                _LOGGER.debug("Burst frame %d failed, keeping %d frames: %s", index, len(frames), err)
+                break
+        self._frames_captured += len(frames)
+        if len(frames) == 1:
+            return frames[0]
+
+        try:
+            scores = await async_get_cpu_executor(self.hass).async_run(score_frames, frames)
+        except Exception as err:
+            # Undecodable frames are for the vision backend to report
+            self._scoring_failures += 1
+            _LOGGER.debug("Could not score burst, using the last frame: %s", err)
+            return frames[-1]
+
+        self._last_scores = [round(score.score, 3) for score in scores]
+        best = max(range(len(frames)), key=lambda index: scores[index].score)
+        _LOGGER.debug("Burst scores %s, analyzing frame %d", self._last_scores, best)
+        return frames[best]
+
+
+@callback
+def async_get_burst_capture(hass: HomeAssistant) -> BurstCapture:
+    """Return the shared burst capture, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    burst: BurstCapture | None = domain_data.get(DATA_BURST_CAPTURE)
+    if burst is None:
+        settings = get_settings(hass)
+        burst = BurstCapture(hass, settings[CONF_BURST_FRAMES], settings[CONF_BURST_INTERVAL])
+        domain_data[DATA_BURST_CAPTURE] = burst
+    return burst
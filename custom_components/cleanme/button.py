@@ -15,7 +15,7 @@ from .const import (
     SIGNAL_SYSTEM_STATE_UPDATED,
     SIGNAL_ZONE_STATE_UPDATED,
 )
-from .coordinator import CleanMeZone
+from .coordinator import CleanMeZone, async_check_all_zones
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -185,8 +185,7 @@ class CleanMeCheckAllButton(ButtonEntity):
             if isinstance(zone, CleanMeZone)
         ]
         
-        for zone in zones:
-            await zone.async_request_check(reason="check_all")
+        await async_check_all_zones(self._hass, zones)
 
 
 class CleanMeMarkAllCleanButton(ButtonEntity):
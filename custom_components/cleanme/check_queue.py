@@ -0,0 +1,273 @@
+"""Priority queue that runs zone checks on a small pool of workers.
+
+Every check (button, services, check_all, timers, activity and the first
+check after setup) goes through one queue. Checks someone asked for go
+first, then check_all sweeps, then background checks. Within a class,
+higher-priority zones go first, then the oldest request.
+
+A zone has at most one queued and one running check. Further requests
+for it join the queued check, and a more urgent one (a button press while
+an auto check waits) takes it over. A background or check_all request for
+a zone whose check is already running is dropped: the running check
+answers it. A manual request waits for the running check to finish, so a
+zone never runs two checks at once. A batched check_all job names its
+zones as members and counts as the running check of each of them.
+
+At most check_workers checks run at once. Manual checks may use one more
+slot, so a button press never waits for a full pool of background checks.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from functools import partial
+import heapq
+import itertools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, CONF_CHECK_WORKERS
+from .settings import get_settings
+from .timing import LatencyHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CHECK_QUEUE = "check_queue"
+
+# Lower runs first
+RANK_MANUAL = 0
+RANK_SWEEP = 1
+RANK_BACKGROUND = 2
+
+_REASON_RANKS = {
+    "button": RANK_MANUAL,
+    "service": RANK_MANUAL,
+    "manual": RANK_MANUAL,
+    "check_all": RANK_SWEEP,
+    "initial": RANK_BACKGROUND,
+    "auto": RANK_BACKGROUND,
+    "activity": RANK_BACKGROUND,
+}
+
+
+def reason_rank(reason: str) -> int:
+    """Return the queue rank of a check reason; unknown reasons count as manual."""
+    return _REASON_RANKS.get(reason, RANK_MANUAL)
+
+
+@dataclass(eq=False)
+class _Job:
+    key: str
+    reason: str
+    rank: int
+    priority: int
+    run: Callable[[], Awaitable[None]]
+    future: asyncio.Future = field(repr=False)
+    queued_at: float = field(default_factory=time.monotonic)
+    # Started or cancelled; heap entries of dequeued jobs are skipped
+    dequeued: bool = False
+    task: asyncio.Task | None = field(default=None, repr=False)
+    # Zone keys a batched job also runs for
+    members: Tuple[str, ...] = ()
+
+    @property
+    def order(self) -> Tuple[int, int]:
+        return self.rank, -self.priority
+
+    @property
+    def keys(self) -> Tuple[str, ...]:
+        return (self.key, *self.members)
+
+
+class CheckQueue:
+    """Run checks in priority order on at most a fixed number of workers."""
+
+    def __init__(self, hass: HomeAssistant, workers: int) -> None:
+        """Initialize the queue."""
+        self.hass = hass
+        self._workers = workers
+        # (rank, -priority, sequence, job); entries whose job was dequeued or
+        # changed order since they were pushed are skipped when popped
+        self._heap: List[Tuple[int, int, int, _Job]] = []
+        self._sequence = itertools.count()
+        self._queued: Dict[str, _Job] = {}
+        self._running: Dict[str, _Job] = {}
+        # Queued jobs whose zone has a check running; pushed again once a check ends
+        self._blocked: Dict[str, _Job] = {}
+        self._active = 0
+
+        self._submitted = 0
+        self._merged = 0
+        self._dropped = 0
+        self._cancelled = 0
+        self._max_depth = 0
+        self._wait = LatencyHistogram()
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return queue depth, wait times and counters."""
+        return {
+            "workers": self._workers,
+            "depth": len(self._queued),
+            "running": self._active,
+            "max_depth": self._max_depth,
+            "submitted": self._submitted,
+            "merged": self._merged,
+            "dropped": self._dropped,
+            "cancelled": self._cancelled,
+            "wait": self._wait.summary(),
+        }
+
+    async def async_run(
+        self,
+        key: str,
+        reason: str,
+        priority: int,
+        run: Callable[[], Awaitable[None]],
+        members: Iterable[str] = (),
+    ) -> None:
+        """Queue run() for key and wait until it (or the check it joined) finishes.
+
+        ``priority`` is the zone's priority level; higher goes first.
+        ``members`` are the zone keys of a batched job; their own checks
+        wait for it or join it, like checks of a zone that is running.
+        """
+        rank = reason_rank(reason)
+
+        job = self._queued.get(key)
+        if job is not None:
+            self._merged += 1
+            if (rank, -priority) < job.order:
+                _LOGGER.debug("Queued %s check for %s upgraded to %s", job.reason, key, reason)
+                job.reason, job.rank, job.priority, job.run = reason, rank, priority, run
+                self._push(job)
+                self._pump()
+            await asyncio.shield(job.future)
+            return
+
+        running = self._running.get(key)
+        if running is not None and rank != RANK_MANUAL:
+            self._dropped += 1
+            _LOGGER.debug("Dropping %s check for %s: a check is already running", reason, key)
+            await asyncio.shield(running.future)
+            return
+
+        job = _Job(
+            key,
+            reason,
+            rank,
+            priority,
+            run,
+            asyncio.get_running_loop().create_future(),
+            members=tuple(members),
+        )
+        self._queued[key] = job
+        self._submitted += 1
+        self._max_depth = max(self._max_depth, len(self._queued))
+        self._push(job)
+        self._pump()
+        await asyncio.shield(job.future)
+
+    @callback
+    def cancel(self, key: str) -> None:
+        """Drop key's queued check (zone unloaded); its callers return without a check."""
+        self._blocked.pop(key, None)
+        job = self._queued.pop(key, None)
+        if job is None:
+            return
+        job.dequeued = True
+        self._cancelled += 1
+        job.future.set_result(None)
+
+    async def async_cancel(self, key: str) -> None:
+        """Drop key's queued check and stop its running one (zone unloaded).
+
+        Waits until the running check has stopped, including one whose task
+        was started but has not run yet.
+        """
+        self.cancel(key)
+        job = self._running.get(key)
+        if job is None or job.key != key:
+            # A batch the zone is part of keeps running for its other zones
+            return
+        self._cancelled += 1
+        job.task.cancel()
+        await asyncio.wait((job.task,))
+
+    @callback
+    def _push(self, job: _Job) -> None:
+        heapq.heappush(self._heap, (*job.order, next(self._sequence), job))
+
+    @callback
+    def _pump(self) -> None:
+        """Start queued jobs while workers are free."""
+        while self._heap:
+            rank, neg_priority, _, job = self._heap[0]
+            if job.dequeued or (rank, neg_priority) != job.order:
+                heapq.heappop(self._heap)
+                continue
+            if any(key in self._running for key in job.keys):
+                # Waits for the zone's running check
+                heapq.heappop(self._heap)
+                self._blocked[job.key] = job
+                continue
+            limit = self._workers + 1 if rank == RANK_MANUAL else self._workers
+            if self._active >= limit:
+                return
+            heapq.heappop(self._heap)
+            self._start(job)
+
+    @callback
+    def _start(self, job: _Job) -> None:
+        job.dequeued = True
+        del self._queued[job.key]
+        for key in job.keys:
+            self._running[key] = job
+        self._active += 1
+        self._wait.add(time.monotonic() - job.queued_at)
+        job.task = self.hass.async_create_task(
+            self._async_execute(job), f"cleanme_queued_check_{job.key}"
+        )
+        # A done callback, because a task cancelled before it starts never runs its finally
+        job.task.add_done_callback(partial(self._finished, job))
+
+    async def _async_execute(self, job: _Job) -> None:
+        try:
+            await job.run()
+        except Exception as err:  # pylint: disable=broad-except
+            job.future.set_exception(err)
+            # Retrieved here so a check whose callers went away is not logged as unhandled
+            job.future.exception()
+        else:
+            job.future.set_result(None)
+
+    @callback
+    def _finished(self, job: _Job, _task: asyncio.Task) -> None:
+        if not job.future.done():
+            # Cancelled (zone unloaded); its callers return without a check
+            job.future.set_result(None)
+        self._active -= 1
+        for key in job.keys:
+            if self._running.get(key) is job:
+                del self._running[key]
+        # Anything still blocked by another running check is blocked again
+        blocked = list(self._blocked.values())
+        self._blocked.clear()
+        for waiting in blocked:
+            if not waiting.dequeued:
+                self._push(waiting)
+        self._pump()
+
+
+@callback
+def async_get_check_queue(hass: HomeAssistant) -> CheckQueue:
+    """Return the shared check queue, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    queue: CheckQueue | None = domain_data.get(DATA_CHECK_QUEUE)
+    if queue is None:
+        queue = CheckQueue(hass, get_settings(hass)[CONF_CHECK_WORKERS])
+        domain_data[DATA_CHECK_QUEUE] = queue
+    return queue
@@ -22,12 +22,25 @@ from .const import (
     CONF_PERSONALITY,
     CONF_PICKINESS,
     CONF_CHECK_FREQUENCY,
+    CONF_VISION_BACKEND,
+    CONF_LOCAL_MODEL_PATH,
+    CONF_ROI,
+    CONF_ACTIVITY_ENTITIES,
+    CONF_QUIET_PERIOD,
+    ACTIVITY_DOMAINS,
+    DEFAULT_QUIET_PERIOD,
+    MAX_QUIET_PERIOD,
+    BACKEND_LOCAL,
+    VISION_BACKEND_OPTIONS,
+    DEFAULT_VISION_BACKEND,
+    DEFAULT_LOCAL_MODEL_PATH,
     PERSONALITY_OPTIONS,
     PERSONALITY_FRIENDLY,
     FREQUENCY_OPTIONS,
     FREQUENCY_MANUAL,
 )
 from .gemini_client import GeminiClient
+from .imaging import parse_roi
 
 
 LOGGER = logging.getLogger(__name__)
@@ -52,6 +65,16 @@ async def async_store_api_key(hass, api_key: str) -> None:
     await store.async_save(data)
 
 
+def _valid_roi(user_input: Dict[str, Any]) -> bool:
+    """Return True if the region of interest is empty or parses."""
+    try:
+        parse_roi(user_input.get(CONF_ROI))
+    except ValueError as err:
+        LOGGER.error("CleanMe: Invalid region of interest: %s", err)
+        return False
+    return True
+
+
 class CleanMeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for CleanMe."""
 
@@ -69,32 +92,44 @@ class CleanMeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             try:
                 LOGGER.info("CleanMe: Starting config flow validation for zone '%s'", user_input.get(CONF_NAME))
                 
-                # Validate API key
-                api_key = user_input[CONF_API_KEY]
-                session = aiohttp_client.async_get_clientsession(self.hass)
-                client = GeminiClient(api_key)
-
-                LOGGER.info("CleanMe: Validating Gemini API key...")
-                is_valid = await client.validate_api_key(session)
-                if not is_valid:
-                    LOGGER.error("CleanMe: API key validation failed")
-                    errors["base"] = "invalid_api_key"
-                else:
-                    LOGGER.info("CleanMe: API key validated successfully")
-                    
-                    # Store the API key globally for future zones
-                    await async_store_api_key(self.hass, api_key)
-                    
-                    name = user_input[CONF_NAME]
-                    await self.async_set_unique_id(f"{DOMAIN}_{name.lower().replace(' ', '_')}_{uuid.uuid4().hex[:8]}")
-                    self._abort_if_unique_id_configured()
-
-                    LOGGER.info("CleanMe: Creating config entry for zone '%s' with camera '%s'", 
-                               name, user_input.get(CONF_CAMERA_ENTITY))
-                    return self.async_create_entry(
-                        title=name,
-                        data=user_input,
-                    )
+                api_key = user_input.get(CONF_API_KEY, "")
+                if not _valid_roi(user_input):
+                    errors[CONF_ROI] = "invalid_roi"
+
+                if user_input.get(CONF_VISION_BACKEND) != BACKEND_LOCAL and not api_key:
+                    errors[CONF_API_KEY] = "missing_api_key"
+
+                if not errors:
+                    if user_input.get(CONF_VISION_BACKEND) == BACKEND_LOCAL:
+                        # Local zones never call Gemini, so the key is optional
+                        is_valid = True
+                    else:
+                        # Validate API key
+                        session = aiohttp_client.async_get_clientsession(self.hass)
+                        client = GeminiClient(api_key)
+
+                        LOGGER.info("CleanMe: Validating Gemini API key...")
+                        is_valid = await client.validate_api_key(session)
+                    if not is_valid:
+                        LOGGER.error("CleanMe: API key validation failed")
+                        errors["base"] = "invalid_api_key"
+                    else:
+                        LOGGER.info("CleanMe: API key validated successfully")
+
+                        # Store the API key globally for future zones
+                        if api_key:
+                            await async_store_api_key(self.hass, api_key)
+
+                        name = user_input[CONF_NAME]
+                        await self.async_set_unique_id(f"{DOMAIN}_{name.lower().replace(' ', '_')}_{uuid.uuid4().hex[:8]}")
+                        self._abort_if_unique_id_configured()
+
+                        LOGGER.info("CleanMe: Creating config entry for zone '%s' with camera '%s'",
+                                   name, user_input.get(CONF_CAMERA_ENTITY))
+                        return self.async_create_entry(
+                            title=name,
+                            data=user_input,
+                        )
             except Exception as err:
                 LOGGER.exception("CleanMe config flow failed: %s", err)
                 errors["base"] = "unknown"
@@ -105,6 +140,7 @@ class CleanMeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_CAMERA_ENTITY): selector.EntitySelector(
                     selector.EntitySelectorConfig(domain="camera")
                 ),
+                vol.Optional(CONF_ROI, default=""): str,
                 vol.Required(CONF_PERSONALITY, default=PERSONALITY_FRIENDLY): vol.In(
                     list(PERSONALITY_OPTIONS.keys())
                 ),
@@ -114,7 +150,17 @@ class CleanMeConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 vol.Required(CONF_CHECK_FREQUENCY, default=FREQUENCY_MANUAL): vol.In(
                     list(FREQUENCY_OPTIONS.keys())
                 ),
-                vol.Required(CONF_API_KEY, default=stored_api_key or ""): str,
+                vol.Optional(CONF_ACTIVITY_ENTITIES, default=[]): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain=ACTIVITY_DOMAINS, multiple=True)
+                ),
+                vol.Optional(CONF_QUIET_PERIOD, default=DEFAULT_QUIET_PERIOD): vol.All(
+                    int, vol.Range(min=0, max=MAX_QUIET_PERIOD)
+                ),
+                vol.Required(CONF_VISION_BACKEND, default=DEFAULT_VISION_BACKEND): vol.In(
+                    list(VISION_BACKEND_OPTIONS.keys())
+                ),
+                vol.Optional(CONF_API_KEY, default=stored_api_key or ""): str,
+                vol.Optional(CONF_LOCAL_MODEL_PATH, default=DEFAULT_LOCAL_MODEL_PATH): str,
             }
         )
 
@@ -147,21 +193,26 @@ class CleanMeOptionsFlow(config_entries.OptionsFlow):
             try:
                 LOGGER.info("CleanMe: Updating options for zone '%s'", user_input.get(CONF_NAME))
                 
-                # Validate API key if changed
-                api_key = user_input[CONF_API_KEY]
-                old_api_key = self._entry.data.get(CONF_API_KEY, "")
-
-                if api_key != old_api_key:
-                    LOGGER.info("CleanMe: API key changed, validating new key...")
-                    session = aiohttp_client.async_get_clientsession(self.hass)
-                    client = GeminiClient(api_key)
-
-                    is_valid = await client.validate_api_key(session)
-                    if not is_valid:
-                        LOGGER.error("CleanMe: New API key validation failed")
-                        errors["base"] = "invalid_api_key"
-                    else:
-                        LOGGER.info("CleanMe: New API key validated successfully")
+                # Validate the API key whenever the zone ends up on Gemini, even
+                # if unchanged: it may have been unused while the zone was local
+                api_key = user_input.get(CONF_API_KEY, "")
+
+                if not _valid_roi(user_input):
+                    errors[CONF_ROI] = "invalid_roi"
+                if user_input.get(CONF_VISION_BACKEND) != BACKEND_LOCAL:
+                    if not api_key:
+                        errors[CONF_API_KEY] = "missing_api_key"
+                    elif not errors:
+                        LOGGER.info("CleanMe: Validating Gemini API key...")
+                        session = aiohttp_client.async_get_clientsession(self.hass)
+                        client = GeminiClient(api_key)
+
+                        is_valid = await client.validate_api_key(session)
+                        if not is_valid:
+                            LOGGER.error("CleanMe: API key validation failed")
+                            errors["base"] = "invalid_api_key"
+                        else:
+                            LOGGER.info("CleanMe: API key validated successfully")
 
                 if not errors:
                     # Update the config entry data
@@ -188,6 +239,7 @@ class CleanMeOptionsFlow(config_entries.OptionsFlow):
                 ): selector.EntitySelector(
                     selector.EntitySelectorConfig(domain="camera")
                 ),
+                vol.Optional(CONF_ROI, default=data.get(CONF_ROI, "")): str,
                 vol.Required(
                     CONF_PERSONALITY,
                     default=data.get(CONF_PERSONALITY, PERSONALITY_FRIENDLY),
@@ -200,7 +252,25 @@ class CleanMeOptionsFlow(config_entries.OptionsFlow):
                     CONF_CHECK_FREQUENCY,
                     default=data.get(CONF_CHECK_FREQUENCY, FREQUENCY_MANUAL),
                 ): vol.In(list(FREQUENCY_OPTIONS.keys())),
-                vol.Required(CONF_API_KEY, default=data.get(CONF_API_KEY, "")): str,
+                vol.Optional(
+                    CONF_ACTIVITY_ENTITIES,
+                    default=data.get(CONF_ACTIVITY_ENTITIES, []),
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(domain=ACTIVITY_DOMAINS, multiple=True)
+                ),
+                vol.Optional(
+                    CONF_QUIET_PERIOD,
+                    default=int(data.get(CONF_QUIET_PERIOD, DEFAULT_QUIET_PERIOD)),
+                ): vol.All(int, vol.Range(min=0, max=MAX_QUIET_PERIOD)),
+                vol.Required(
+                    CONF_VISION_BACKEND,
+                    default=data.get(CONF_VISION_BACKEND, DEFAULT_VISION_BACKEND),
+                ): vol.In(list(VISION_BACKEND_OPTIONS.keys())),
+                vol.Optional(CONF_API_KEY, default=data.get(CONF_API_KEY, "")): str,
+                vol.Optional(
+                    CONF_LOCAL_MODEL_PATH,
+                    default=data.get(CONF_LOCAL_MODEL_PATH, DEFAULT_LOCAL_MODEL_PATH),
+                ): str,
             }
         )
 
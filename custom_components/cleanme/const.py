@@ -9,18 +9,42 @@ CONF_API_KEY = "api_key"
 CONF_PERSONALITY = "personality"
 CONF_PICKINESS = "pickiness"
 CONF_CHECK_FREQUENCY = "check_frequency"
+CONF_VISION_BACKEND = "vision_backend"
+CONF_LOCAL_MODEL_PATH = "local_model_path"
+CONF_ROI = "roi"  # "x,y; x,y; ..." in percent of the frame; empty = whole frame
+CONF_ACTIVITY_ENTITIES = "activity_entities"
+CONF_QUIET_PERIOD = "quiet_period"
+
+# Vision backends
+BACKEND_GEMINI = "gemini"
+BACKEND_LOCAL = "local"
+
+VISION_BACKEND_OPTIONS = {
+    BACKEND_GEMINI: "Gemini (cloud)",
+    BACKEND_LOCAL: "Local ONNX model (offline)",
+}
+
+DEFAULT_VISION_BACKEND = BACKEND_GEMINI
+
+# Activity-aware scheduling: motion/occupancy/presence entities a zone follows
+ACTIVITY_DOMAINS = ["binary_sensor", "person", "device_tracker"]
+DEFAULT_QUIET_PERIOD = 10  # minutes after activity ends before a check runs
+MAX_QUIET_PERIOD = 240
+DEFAULT_LOCAL_MODEL_PATH = "cleanme/tidy_classifier.onnx"  # relative to the HA config dir
 
 # Check frequency options
 FREQUENCY_MANUAL = "manual"
 FREQUENCY_1X = "1x"
 FREQUENCY_2X = "2x"
 FREQUENCY_4X = "4x"
+FREQUENCY_ADAPTIVE = "adaptive"
 
 FREQUENCY_OPTIONS = {
     FREQUENCY_MANUAL: "Manual only",
     FREQUENCY_1X: "1x daily",
     FREQUENCY_2X: "2x daily",
     FREQUENCY_4X: "4x daily",
+    FREQUENCY_ADAPTIVE: "Adaptive (learns how fast the room gets messy)",
 }
 
 FREQUENCY_TO_RUNS = {
@@ -28,8 +52,16 @@ FREQUENCY_TO_RUNS = {
     FREQUENCY_1X: 1,
     FREQUENCY_2X: 2,
     FREQUENCY_4X: 4,
+    FREQUENCY_ADAPTIVE: 0,  # no fixed timer; see adaptive.py
 }
 
+# Adaptive frequency: check when the predicted messiness score reaches the
+# threshold, at most every ADAPTIVE_MIN_INTERVAL_HOURS and at least every
+# check interval (the zone's Check Interval number)
+ADAPTIVE_MESSINESS_THRESHOLD = 50
+ADAPTIVE_MIN_INTERVAL_HOURS = 1
+ADAPTIVE_SAVE_DELAY = 60  # seconds; batches Store writes of the learned rate
+
 # AI Personality options - 8 distinct personalities with real character
 PERSONALITY_FRIENDLY = "friendly"
 PERSONALITY_SASSY = "sassy"
@@ -173,10 +205,17 @@ ATTR_PERSONALITY = "personality"
 ATTR_PICKINESS = "pickiness"
 ATTR_CAMERA_ENTITY = "camera_entity"
 ATTR_LAST_CHECK = "last_check"
+ATTR_PARTIAL = "partial"
 ATTR_STATUS = "status"
 ATTR_ERROR_MESSAGE = "error_message"
 ATTR_IMAGE_SIZE = "image_size"
 ATTR_API_RESPONSE_TIME = "api_response_time"
+ATTR_PARSE_FAILURES = "parse_failures"
+ATTR_PARSE_RETRIES = "parse_retries"
+ATTR_GATE_SAVED = "gate_saved"
+ATTR_GATE_PASSED = "gate_passed"
+ATTR_LATENCY = "latency"
+ATTR_LAST_CHECK_SPANS = "last_check_spans"
 ATTR_SNOOZE_UNTIL = "snooze_until"
 
 # AI status attributes
@@ -210,6 +249,15 @@ PRIORITY_OPTIONS = {
     PRIORITY_HIGH: "High",
 }
 
+# Ordered levels; zones store the index as a small int
+PRIORITY_LEVELS = (PRIORITY_LOW, PRIORITY_MEDIUM, PRIORITY_HIGH)
+
+# Mess severity reported by an analysis, stored as an index the same way
+SEVERITY_LOW = "low"
+SEVERITY_MEDIUM = "medium"
+SEVERITY_HIGH = "high"
+SEVERITY_LEVELS = (SEVERITY_LOW, SEVERITY_MEDIUM, SEVERITY_HIGH)
+
 # Default settings
 DEFAULT_CHECK_INTERVAL_HOURS = 24
 DEFAULT_OVERDUE_THRESHOLD_HOURS = 48
@@ -247,3 +295,108 @@ STORAGE_VERSION = 1
 # Dispatcher signals
 SIGNAL_SYSTEM_STATE_UPDATED = "cleanme_system_state_updated"
 SIGNAL_ZONE_STATE_UPDATED = "cleanme_zone_state_updated"
+SIGNAL_ZONE_LATENCY_UPDATED = "cleanme_zone_latency_updated_{}"  # formatted with entry_id
+
+# hass.data[DOMAIN] key for dashboard regeneration timings
+DATA_DASHBOARD_LATENCY = "dashboard_latency"
+
+# Global tuning options (configuration.yaml `cleanme:` block)
+CONF_CONNECTION_LIMIT = "connection_limit"
+CONF_KEEPALIVE_TIMEOUT = "keepalive_timeout"
+CONF_CONNECT_TIMEOUT = "connect_timeout"
+CONF_READ_TIMEOUT = "read_timeout"
+CONF_BATCH_SIZE = "batch_size"
+CONF_STREAMING = "streaming"
+CONF_PRE_FILTER = "pre_filter"
+CONF_PRE_FILTER_THRESHOLD = "pre_filter_threshold"
+CONF_LOOP_WATCHDOG = "loop_watchdog"
+CONF_LOOP_WATCHDOG_THRESHOLD = "loop_watchdog_threshold"
+CONF_FILE_UPLOAD = "file_upload"
+CONF_FILE_UPLOAD_MIN_SIZE = "file_upload_min_size"
+CONF_FILE_UPLOAD_TTL = "file_upload_ttl"
+CONF_RESULT_CACHE = "result_cache"
+CONF_RESULT_CACHE_SIZE = "result_cache_size"
+CONF_RESULT_CACHE_TTL = "result_cache_ttl"
+CONF_RESULT_CACHE_PERSIST = "result_cache_persist"
+CONF_SNAPSHOT_SHARE_WINDOW = "snapshot_share_window"
+CONF_BURST_FRAMES = "burst_frames"
+CONF_BURST_INTERVAL = "burst_interval"
+CONF_DAILY_REQUEST_BUDGET = "daily_request_budget"
+CONF_BUDGET_MANUAL_RESERVE = "budget_manual_reserve"
+CONF_CHECK_WORKERS = "check_workers"
+CONF_CHECK_TIMEOUT = "check_timeout"
+CONF_CPU_WORKERS = "cpu_workers"
+
+# Gemini connection pool defaults
+# Free tier allows ~15 RPM, so a handful of pooled connections is plenty
+DEFAULT_CONNECTION_LIMIT = 4
+DEFAULT_KEEPALIVE_TIMEOUT = 120  # seconds an idle connection is kept open
+DEFAULT_CONNECT_TIMEOUT = 10  # seconds to establish TCP + TLS
+DEFAULT_READ_TIMEOUT = 90  # seconds between bytes from Gemini
+
+# Zones packed into one Gemini request by check_all (1 = one request per zone)
+DEFAULT_BATCH_SIZE = 1
+MAX_BATCH_SIZE = 8
+
+# Stream replies and publish tidy/severity before tasks and comment arrive
+DEFAULT_STREAMING = False
+
+# Local pre-filter: skip the vision backend when the room looks unchanged
+# since the last frame it judged tidy
+DEFAULT_PRE_FILTER = False
+DEFAULT_PRE_FILTER_THRESHOLD = 0.04  # mean pixel difference (0..1) still counted as unchanged
+PRE_FILTER_EDGE_TOLERANCE = 0.15  # relative edge density increase still counted as unchanged
+
+# Event loop watchdog: log stack samples when CleanMe blocks the loop
+DEFAULT_LOOP_WATCHDOG = False
+DEFAULT_LOOP_WATCHDOG_THRESHOLD = 0.1  # seconds
+
+# Gemini File API: upload large snapshots once and reference them by URI
+DEFAULT_FILE_UPLOAD = False
+DEFAULT_FILE_UPLOAD_MIN_SIZE = 1024 * 1024  # bytes; smaller images are sent inline
+DEFAULT_FILE_UPLOAD_TTL = 3600  # seconds an uploaded image is reused before deletion
+
+# Analysis results reused for byte-identical snapshots (offline placeholders,
+# cameras shared by several checks)
+DEFAULT_RESULT_CACHE = False
+DEFAULT_RESULT_CACHE_SIZE = 256  # entries
+DEFAULT_RESULT_CACHE_TTL = 3600  # seconds
+DEFAULT_RESULT_CACHE_PERSIST = False
+RESULT_CACHE_SAVE_DELAY = 30  # seconds; batches disk writes of the persistent tier
+
+# Zones sharing a camera reuse one snapshot taken within this many seconds.
+# 0 only shares snapshots that are being fetched concurrently, so a manual
+# re-check always sees a fresh frame
+DEFAULT_SNAPSHOT_SHARE_WINDOW = 0
+
+# Burst capture: grab several snapshots per check and analyze only the
+# sharpest, best-exposed, steadiest one (1 = single snapshot)
+DEFAULT_BURST_FRAMES = 1
+MAX_BURST_FRAMES = 8
+DEFAULT_BURST_INTERVAL = 0.5  # seconds between snapshots of a burst
+
+# Daily Gemini request budget shared by all zones (0 = unlimited); the
+# reserve is the percentage held back for manual checks
+DEFAULT_DAILY_REQUEST_BUDGET = 0
+MAX_DAILY_REQUEST_BUDGET = 100000
+DEFAULT_BUDGET_MANUAL_RESERVE = 20
+MAX_BUDGET_MANUAL_RESERVE = 90
+BUDGET_SAVE_DELAY = 30  # seconds; batches Store writes of the day's counts
+
+# Checks running at once; queued checks wait in priority order
+DEFAULT_CHECK_WORKERS = 2
+MAX_CHECK_WORKERS = 8
+
+# End-to-end deadline of a check (snapshot, analysis and retries); the
+# default leaves room for a slow camera and one full Gemini read timeout
+DEFAULT_CHECK_TIMEOUT = 180  # seconds
+MAX_CHECK_TIMEOUT = 1800
+
+# Threads for CPU-bound work (hashing, encoding, cropping, scoring)
+DEFAULT_CPU_WORKERS = 2
+MAX_CPU_WORKERS = 8
+
+# Connection reuse attributes
+ATTR_CONNECTIONS_OPENED = "connections_opened"
+ATTR_CONNECTIONS_REUSED = "connections_reused"
+ATTR_CONNECTION_REUSE_RATIO = "connection_reuse_ratio"
@@ -1,12 +1,18 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import asyncio
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Callable
+from functools import partial
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Callable, Tuple
 import logging
+import sys
+import time
 
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import aiohttp_client, event
+from homeassistant.const import STATE_HOME, STATE_ON
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import event
 from homeassistant.helpers.device_registry import DeviceInfo, DeviceEntryType
 from homeassistant.helpers.storage import Store
 from homeassistant.util.dt import utcnow
@@ -16,37 +22,119 @@ from homeassistant.helpers.dispatcher import async_dispatcher_send
 from .const import (
     DOMAIN,
     CONF_CAMERA_ENTITY,
-    CONF_API_KEY,
     CONF_PERSONALITY,
     CONF_PICKINESS,
     CONF_CHECK_FREQUENCY,
+    CONF_ROI,
+    CONF_ACTIVITY_ENTITIES,
+    CONF_QUIET_PERIOD,
+    DEFAULT_QUIET_PERIOD,
     FREQUENCY_TO_RUNS,
     PERSONALITY_FRIENDLY,
     SIGNAL_ZONE_STATE_UPDATED,
+    SIGNAL_ZONE_LATENCY_UPDATED,
     DEFAULT_CHECK_INTERVAL_HOURS,
+    ADAPTIVE_MESSINESS_THRESHOLD,
+    ADAPTIVE_MIN_INTERVAL_HOURS,
+    ADAPTIVE_SAVE_DELAY,
+    FREQUENCY_ADAPTIVE,
     DEFAULT_OVERDUE_THRESHOLD_HOURS,
     DEFAULT_PRIORITY,
+    PRIORITY_LEVELS,
     PRIORITY_OPTIONS,
+    SEVERITY_LEVELS,
+    SEVERITY_MEDIUM,
+    CONF_BATCH_SIZE,
+    CONF_CHECK_TIMEOUT,
+    CONF_STREAMING,
+    CONF_VISION_BACKEND,
+    BACKEND_GEMINI,
+    DEFAULT_VISION_BACKEND,
     STORAGE_KEY,
     STORAGE_VERSION,
 )
-from .gemini_client import GeminiClient, GeminiClientError
+from .adaptive import MessinessModel
+from .budget import async_get_request_budget
+from .check_queue import RANK_BACKGROUND, RANK_MANUAL, async_get_check_queue, reason_rank
+from .executor import async_get_cpu_executor
+from .burst import async_get_burst_capture
+from .gemini_client import BatchImage, GeminiClient, GeminiClientError
+from .imaging import PIL_AVAILABLE, Roi, crop_regions, parse_roi
+from .session import async_get_session_manager
+from .settings import get_settings
+from .snapshots import async_get_snapshot_broker
+from .timing import (
+    SPAN_CAPTURE,
+    SPAN_NOTIFY,
+    SPAN_PERSIST,
+    CheckTimer,
+    LatencyRecorder,
+    span,
+    track_check,
+)
+from .vision import TieredBackend, VisionBackend, create_backend
+from .watchdog import operation
 
 _LOGGER = logging.getLogger(__name__)
 
 
-@dataclass
+# Result keys stored as CleanMeState fields; anything else goes to extra
+_STATE_RESULT_KEYS = frozenset(("tidy", "tasks", "comment", "severity", "image_size", "api_response_time"))
+_NO_EXTRA: Mapping[str, Any] = MappingProxyType({})
+_DEFAULT_SEVERITY_LEVEL = SEVERITY_LEVELS.index(SEVERITY_MEDIUM)
+
+# Activity entity states meaning someone is (or may be) in the room
+_ACTIVE_STATES = frozenset((STATE_ON, STATE_HOME))
+
+# Check reasons that come from a schedule rather than a person; these share
+# the daily request budget and are deferred when it runs out
+_SCHEDULED_REASONS = frozenset(("auto", "activity"))
+
+
+def _intern_tasks(tasks: Iterable[str]) -> Tuple[str, ...]:
+    """Return tasks as a tuple of interned strings.
+
+    The same few chores ("Make the bed", "Put away dishes") come back for
+    every zone on every check; interning keeps one copy of each.
+    """
+    return tuple(sys.intern(task) for task in tasks)
+
+
+def _zone_roi(name: str, text: str | None) -> Roi | None:
+    """Return the zone's region of interest, or None to analyze the whole frame."""
+    try:
+        roi = parse_roi(text)
+    except ValueError as err:
+        _LOGGER.error("Ignoring invalid region of interest for %s: %s", name, err)
+        return None
+    if roi is not None and not PIL_AVAILABLE:
+        _LOGGER.warning("Pillow is not installed; %s will analyze the whole camera frame", name)
+        return None
+    return roi
+
+
+def _priority_level(priority: str) -> int:
+    """Return the PRIORITY_LEVELS index for a priority, falling back to the default."""
+    if priority not in PRIORITY_LEVELS:
+        priority = DEFAULT_PRIORITY
+    return PRIORITY_LEVELS.index(priority)
+
+
+@dataclass(slots=True)
 class CleanMeState:
     """State data for a CleanMe zone."""
     tidy: bool = False
-    tasks: List[str] = field(default_factory=list)
+    tasks: Tuple[str, ...] = ()
     comment: str | None = None
-    severity: str = "medium"
+    severity_level: int = _DEFAULT_SEVERITY_LEVEL  # Index into SEVERITY_LEVELS
     last_error: str | None = None
     last_checked: datetime | None = None
     image_size: int = 0
     api_response_time: float = 0.0
-    full_analysis: Dict[str, Any] = field(default_factory=dict)
+    # Result keys without a field of their own (confidence, gated...);
+    # None until the first analysis
+    extra: Mapping[str, Any] | None = None
+    partial: bool = False  # True while a streamed analysis is still arriving
     
     # Extended state fields
     last_cleaned: datetime | None = None
@@ -54,6 +142,31 @@ class CleanMeState:
     total_cleans: int = 0
     messiness_score: int = 0  # 0-100 based on tasks/severity
     
+    @property
+    def severity(self) -> str:
+        return SEVERITY_LEVELS[self.severity_level]
+
+    @severity.setter
+    def severity(self, value: str) -> None:
+        self.severity_level = (
+            SEVERITY_LEVELS.index(value) if value in SEVERITY_LEVELS else _DEFAULT_SEVERITY_LEVEL
+        )
+
+    @property
+    def full_analysis(self) -> Dict[str, Any]:
+        """Return the last analysis, rebuilt from the state fields."""
+        if self.extra is None:
+            return {}
+        return {
+            "tidy": self.tidy,
+            "tasks": list(self.tasks),
+            "comment": self.comment,
+            "severity": self.severity,
+            "image_size": self.image_size,
+            "api_response_time": self.api_response_time,
+            **self.extra,
+        }
+
     @property
     def needs_tidy(self) -> bool:
         """Return True if the zone needs tidying."""
@@ -63,12 +176,55 @@ class CleanMeState:
 class CleanMeZone:
     """One tidy zone (room/area)."""
 
+    # Large installs keep hundreds of zones alive for the life of Home Assistant
+    __slots__ = (
+        "hass",
+        "entry_id",
+        "_name",
+        "_camera_entity_id",
+        "_roi",
+        "_unsub_region",
+        "_personality",
+        "_pickiness",
+        "_check_frequency",
+        "_runs_per_day",
+        "_backend_name",
+        "_backend",
+        "_state",
+        "_listeners",
+        "_unsub_timer",
+        "_activity_entities",
+        "_quiet_period",
+        "_activity_since_capture",
+        "_idle_skips",
+        "_unsub_activity",
+        "_unsub_quiet",
+        "_unsub_deferred",
+        "_deferred_checks",
+        "_snooze_until",
+        "_priority_level",
+        "_check_interval_hours",
+        "_adaptive",
+        "_next_scheduled_check",
+        "_store",
+        "_latency",
+        "_checks_in_flight",
+        "_check_task",
+        "_check_reason",
+        "_check_timer",
+        "_unloaded",
+        "_check_timeouts",
+        "_checks_superseded",
+    )
+
     def __init__(self, hass: HomeAssistant, entry_id: str, name: str, data: Dict[str, Any]) -> None:
         self.hass = hass
         self.entry_id = entry_id
         self._name = name
 
         self._camera_entity_id: str = data[CONF_CAMERA_ENTITY]
+        self._roi: Roi | None = _zone_roi(name, data.get(CONF_ROI))
+        self._unsub_region: Optional[Callable[[], None]] = None
         self._personality: str = data.get(CONF_PERSONALITY, PERSONALITY_FRIENDLY)
         self._pickiness: int = int(data.get(CONF_PICKINESS, 3))
         self._check_frequency: str = data.get(CONF_CHECK_FREQUENCY, "manual")
@@ -76,22 +232,45 @@ class CleanMeZone:
         # Calculate runs per day from frequency
         self._runs_per_day: int = FREQUENCY_TO_RUNS.get(self._check_frequency, 0)
 
-        api_key = data.get(CONF_API_KEY) or ""
-        self._gemini_client = GeminiClient(api_key)
+        self._backend_name: str = data.get(CONF_VISION_BACKEND, DEFAULT_VISION_BACKEND)
+        self._backend: VisionBackend = create_backend(hass, data)
 
         self._state = CleanMeState()
         self._listeners: list[Callable[[], None]] = []
         self._unsub_timer: Optional[Callable[[], None]] = None
         self._snooze_until: Optional[datetime] = None
+
+        # Activity-aware scheduling; until told otherwise, assume the room was used
+        self._activity_entities: Tuple[str, ...] = tuple(data.get(CONF_ACTIVITY_ENTITIES) or ())
+        self._quiet_period = timedelta(minutes=data.get(CONF_QUIET_PERIOD, DEFAULT_QUIET_PERIOD))
+        self._activity_since_capture = True
+        self._idle_skips = 0
+        self._unsub_activity: Optional[Callable[[], None]] = None
+        self._unsub_quiet: Optional[Callable[[], None]] = None
+
+        # Scheduled checks the request budget pushed to its next reset
+        self._unsub_deferred: Optional[Callable[[], None]] = None
+        self._deferred_checks = 0
         
         # New configurable fields
-        self._priority: str = data.get("priority", DEFAULT_PRIORITY)
+        self._priority_level: int = _priority_level(data.get("priority", DEFAULT_PRIORITY))
         self._check_interval_hours: float = data.get("check_interval", DEFAULT_CHECK_INTERVAL_HOURS)
+        self._adaptive = MessinessModel()
         self._next_scheduled_check: Optional[datetime] = None
         
         # Storage for persistence
         self._store: Store | None = None
 
+        self._latency = LatencyRecorder()
+        self._checks_in_flight = 0
+        self._check_task: asyncio.Task | None = None
+        self._check_reason = ""
+        self._check_timer: CheckTimer | None = None
+        # Set on unload; a batched check_all still running ignores the zone
+        self._unloaded = False
+        self._check_timeouts = 0
+        self._checks_superseded = 0
+
     @property
     def name(self) -> str:
         return self._name
@@ -112,6 +291,39 @@ class CleanMeZone:
     def state(self) -> CleanMeState:
         return self._state
 
+    @property
+    def backend_name(self) -> str:
+        return self._backend_name
+
+    @property
+    def checks_in_flight(self) -> int:
+        """Return the number of checks currently running for this zone."""
+        return self._checks_in_flight
+
+    @property
+    def check_timeouts(self) -> int:
+        """Return the number of checks stopped at the check_timeout deadline."""
+        return self._check_timeouts
+
+    @property
+    def checks_superseded(self) -> int:
+        """Return the number of running checks cancelled by a newer check."""
+        return self._checks_superseded
+
+    @property
+    def runs_per_day(self) -> int:
+        return self._runs_per_day
+
+    @property
+    def latency(self) -> LatencyRecorder:
+        """Return rolling per-span check latencies."""
+        return self._latency
+
+    @property
+    def analysis_metrics(self) -> Dict[str, Any]:
+        """Return counters from the vision backend (parse failures, retries...)."""
+        return self._backend.metrics
+
     @property
     def needs_tidy(self) -> bool:
         return self._state.needs_tidy
@@ -129,7 +341,7 @@ class CleanMeZone:
     
     @property
     def priority(self) -> str:
-        return self._priority
+        return PRIORITY_LEVELS[self._priority_level]
     
     @property
     def check_interval_hours(self) -> float:
@@ -138,6 +350,67 @@ class CleanMeZone:
     @property
     def next_scheduled_check(self) -> Optional[datetime]:
         return self._next_scheduled_check
+
+    @property
+    def adaptive(self) -> MessinessModel:
+        """Return the learned messiness rate (used by the adaptive frequency)."""
+        return self._adaptive
+
+    @property
+    def activity_entities(self) -> Tuple[str, ...]:
+        """Return the motion/occupancy/presence entities this zone follows."""
+        return self._activity_entities
+
+    @property
+    def activity_since_capture(self) -> bool:
+        """Return True if the room has been used since the last snapshot."""
+        return self._activity_since_capture
+
+    @property
+    def idle_skips(self) -> int:
+        """Return the number of auto checks skipped because nothing happened."""
+        return self._idle_skips
+
+    @property
+    def quiet_check_pending(self) -> bool:
+        """Return True while waiting out the quiet period after activity."""
+        return self._unsub_quiet is not None
+
+    @property
+    def deferred_checks(self) -> int:
+        """Return the number of scheduled checks deferred by the request budget."""
+        return self._deferred_checks
+
+    @property
+    def deferred_check_pending(self) -> bool:
+        """Return True while a deferred check waits for the budget to reset."""
+        return self._unsub_deferred is not None
+
+    @property
+    def schedules_checks(self) -> bool:
+        """Return True if this zone runs checks on its own (timer or activity)."""
+        return bool(
+            self._runs_per_day
+            or self._check_frequency == FREQUENCY_ADAPTIVE
+            or self._activity_entities
+        )
+
+    @property
+    def budget_weight(self) -> float:
+        """Return this zone's claim on the scheduled request budget.
+
+        Higher priority, overdue zones and rooms that get messy quickly
+        get a bigger share.
+        """
+        weight = 1.0 + self._priority_level
+        if self.is_overdue:
+            weight *= 2
+        rate = self._adaptive.rate
+        if rate:
+            # Points per day relative to the threshold, so a room crossing it
+            # several times a day counts up to four times as much
+            weight *= 1 + min(rate * 24 / ADAPTIVE_MESSINESS_THRESHOLD, 3)
+        return weight
     
     @property
     def needs_attention(self) -> bool:
@@ -175,10 +448,21 @@ class CleanMeZone:
         """Set up timers if auto mode is enabled and load persisted state."""
         # Initialize storage
         self._store = Store(self.hass, STORAGE_VERSION, f"{STORAGE_KEY}.{self.entry_id}")
-        await self._async_load_state()
+        with operation(f"setup:{self._name}"):
+            await self._async_load_state()
+
+        if self._roi is not None:
+            # Lets one decode of a shared frame serve every zone on this camera
+            self._unsub_region = async_get_snapshot_broker(self.hass).register_region(
+                self._camera_entity_id, self._roi
+            )
         
         if self._runs_per_day > 0:
             self._setup_auto_timer()
+        elif self._check_frequency == FREQUENCY_ADAPTIVE:
+            self._schedule_adaptive_check()
+        if self._activity_entities:
+            self._setup_activity_tracking()
 
     async def _async_load_state(self) -> None:
         """Load persisted state from storage."""
@@ -192,8 +476,9 @@ class CleanMeZone:
                 self._state.last_cleaned = datetime.fromisoformat(data["last_cleaned"])
             self._state.clean_streak = data.get("clean_streak", 0)
             self._state.total_cleans = data.get("total_cleans", 0)
-            self._priority = data.get("priority", DEFAULT_PRIORITY)
+            self._priority_level = _priority_level(data.get("priority", DEFAULT_PRIORITY))
             self._check_interval_hours = data.get("check_interval", DEFAULT_CHECK_INTERVAL_HOURS)
+            self._adaptive = MessinessModel.from_dict(data.get("adaptive"))
             
             _LOGGER.debug(
                 "Loaded persisted state for zone %s: streak=%d, total=%d",
@@ -207,14 +492,20 @@ class CleanMeZone:
         if self._store is None:
             return
         
-        data = {
+        start = time.perf_counter()
+        await self._store.async_save(self._data_to_save())
+        self._latency.add(SPAN_PERSIST, time.perf_counter() - start)
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        return {
             "last_cleaned": self._state.last_cleaned.isoformat() if self._state.last_cleaned else None,
             "clean_streak": self._state.clean_streak,
             "total_cleans": self._state.total_cleans,
-            "priority": self._priority,
+            "priority": self.priority,
             "check_interval": self._check_interval_hours,
+            "adaptive": self._adaptive.as_dict(),
         }
-        await self._store.async_save(data)
 
     @callback
     def _setup_auto_timer(self) -> None:
@@ -237,14 +528,98 @@ class CleanMeZone:
             self.hass, _handle, interval
         )
 
+    @callback
+    def _schedule_adaptive_check(self) -> None:
+        """Schedule the next check for when the room is predicted to need one."""
+        if self._unsub_timer:
+            self._unsub_timer()
+
+        now = utcnow()
+        hours = self._adaptive.next_check_in(
+            now,
+            self._state.messiness_score,
+            ADAPTIVE_MESSINESS_THRESHOLD,
+            ADAPTIVE_MIN_INTERVAL_HOURS,
+            max(self._check_interval_hours, ADAPTIVE_MIN_INTERVAL_HOURS),
+        )
+        self._next_scheduled_check = now + timedelta(hours=hours)
+        _LOGGER.debug("Zone %s: next adaptive check in %.1f hours", self._name, hours)
+        self._unsub_timer = event.async_track_point_in_utc_time(
+            self.hass, self._async_handle_adaptive, self._next_scheduled_check
+        )
+
+    async def _async_handle_adaptive(self, _now: datetime) -> None:
+        self._unsub_timer = None
+        await self.async_request_check(reason="auto")
+        # Also covers skipped and failed checks, which learn nothing
+        self._schedule_adaptive_check()
+
+    @callback
+    def _setup_activity_tracking(self) -> None:
+        """Follow the zone's activity entities to check once the room is quiet again."""
+        self._unsub_activity = event.async_track_state_change_event(
+            self.hass, list(self._activity_entities), self._handle_activity_event
+        )
+
+    @callback
+    def _handle_activity_event(self, evt: Event) -> None:
+        new_state = evt.data.get("new_state")
+        if new_state is not None and new_state.state in _ACTIVE_STATES:
+            self._activity_since_capture = True
+            self._cancel_quiet_check()
+        elif self._activity_since_capture and not self._room_active():
+            self._cancel_quiet_check()
+            self._unsub_quiet = event.async_call_later(
+                self.hass, self._quiet_period, self._async_handle_quiet
+            )
+
+    async def _async_handle_quiet(self, _now: datetime) -> None:
+        self._unsub_quiet = None
+        if self._activity_since_capture and not self._room_active():
+            await self.async_request_check(reason="activity")
+
+    @callback
+    def _room_active(self) -> bool:
+        for entity_id in self._activity_entities:
+            state = self.hass.states.get(entity_id)
+            if state is not None and state.state in _ACTIVE_STATES:
+                return True
+        return False
+
+    @callback
+    def _cancel_quiet_check(self) -> None:
+        if self._unsub_quiet:
+            self._unsub_quiet()
+            self._unsub_quiet = None
+
     async def async_unload(self) -> None:
         """Clean up on unload."""
+        # Stop checks first so the saved state is final; this includes a
+        # check the queue started whose task has not run yet. A batched
+        # check_all keeps running for the other zones and drops this one.
+        self._unloaded = True
+        await async_get_check_queue(self.hass).async_cancel(self.entry_id)
+        if self._check_task is not None:
+            self._check_task.cancel()
+            await asyncio.wait((self._check_task,))
+            self._check_task = None
+
         # Save state before unloading
         await self._async_save_state()
         
         if self._unsub_timer:
             self._unsub_timer()
             self._unsub_timer = None
+        if self._unsub_region:
+            self._unsub_region()
+            self._unsub_region = None
+        if self._unsub_activity:
+            self._unsub_activity()
+            self._unsub_activity = None
+        self._cancel_quiet_check()
+        if self._unsub_deferred:
+            self._unsub_deferred()
+            self._unsub_deferred = None
         self._listeners.clear()
 
     @callback
@@ -254,18 +629,19 @@ class CleanMeZone:
 
     @callback
     def _notify_listeners(self) -> None:
-        for listener in list(self._listeners):
-            try:
-                listener()
-            except Exception as err:
-                _LOGGER.error(
-                    "Error notifying listener for zone %s: %s",
-                    self._name,
-                    err,
-                    exc_info=True,
-                )
-                continue
-        async_dispatcher_send(self.hass, SIGNAL_ZONE_STATE_UPDATED)
+        with span(SPAN_NOTIFY):
+            for listener in list(self._listeners):
+                try:
+                    listener()
+                except Exception as err:
+                    _LOGGER.error(
+                        "Error notifying listener for zone %s: %s",
+                        self._name,
+                        err,
+                        exc_info=True,
+                    )
+                    continue
+            async_dispatcher_send(self.hass, SIGNAL_ZONE_STATE_UPDATED)
 
     async def async_snooze(self, minutes: int) -> None:
         """Snooze auto checks for some minutes."""
@@ -279,7 +655,7 @@ class CleanMeZone:
 
     async def async_clear_tasks(self) -> None:
         """Clear tasks and mark as tidy."""
-        self._state.tasks = []
+        self._state.tasks = ()
         self._state.tidy = True
         self._state.comment = "Tasks cleared manually."
         self._state.last_error = None
@@ -303,11 +679,15 @@ class CleanMeZone:
         
         self._state.total_cleans += 1
         self._state.last_cleaned = now
-        self._state.tasks = []
+        self._state.tasks = ()
         self._state.tidy = True
         self._state.messiness_score = 0
         self._state.comment = "Marked clean by user."
         self._state.last_error = None
+        self._adaptive.mark_clean(now)
+        self._reset_reference()
+        if self._check_frequency == FREQUENCY_ADAPTIVE:
+            self._schedule_adaptive_check()
         
         # Persist state
         await self._async_save_state()
@@ -326,7 +706,7 @@ class CleanMeZone:
             _LOGGER.warning("Invalid priority '%s' for zone %s", priority, self._name)
             return
         
-        self._priority = priority
+        self._priority_level = PRIORITY_LEVELS.index(priority)
         await self._async_save_state()
         self._notify_listeners()
     
@@ -338,72 +718,272 @@ class CleanMeZone:
             hours = 168
         
         self._check_interval_hours = hours
+        if self._check_frequency == FREQUENCY_ADAPTIVE:
+            self._schedule_adaptive_check()
         await self._async_save_state()
         self._notify_listeners()
     
     async def async_set_personality(self, personality: str) -> None:
         """Set the AI personality for this zone."""
         self._personality = personality
+        self._reset_reference()
         self._notify_listeners()
 
+    @callback
+    def _reset_reference(self) -> None:
+        """Send the next check to the model instead of the pre-filter's tidy reference.
+
+        Pickiness changes reload the zone, which starts without a reference.
+        """
+        if isinstance(self._backend, TieredBackend):
+            self._backend.reset_reference()
+
     async def async_request_check(self, reason: str = "manual") -> None:
-        """Run a check now (may be called by service or timer)."""
+        """Queue a check (service, button or timer) and wait until it has run."""
+        if reason_rank(reason) == RANK_MANUAL and self._check_supersedable():
+            # The queue runs the manual check as soon as the cancelled one ends
+            self._checks_superseded += 1
+            _LOGGER.debug("Zone %s: %s check supersedes the running check", self._name, reason)
+            self._check_task.cancel()
+
+        await async_get_check_queue(self.hass).async_run(
+            self.entry_id, reason, self._priority_level, partial(self._async_run_check, reason)
+        )
+
+    @callback
+    def _check_supersedable(self) -> bool:
+        """Return True if a background check is running that has not sent its request yet."""
+        return (
+            self._check_task is not None
+            and not self._check_task.done()
+            and reason_rank(self._check_reason) == RANK_BACKGROUND
+            and not (self._check_timer is not None and self._check_timer.requests)
+        )
+
+    async def _async_run_check(self, reason: str) -> None:
+        """Run a check in its own task so a manual check can supersede it; called by the check queue."""
+        task = self._check_task = self.hass.async_create_task(
+            self._async_check(reason), f"cleanme_check_{self.entry_id}"
+        )
+        self._check_reason = reason
+        try:
+            await task
+        except asyncio.CancelledError:
+            # Re-raised only if our caller was cancelled, not the check itself
+            if asyncio.current_task().cancelling():
+                raise
+            _LOGGER.debug("Zone %s: %s check was cancelled", self._name, reason)
+        finally:
+            if self._check_task is task:
+                self._check_task = None
+
+    async def _async_check(self, reason: str) -> None:
         now = utcnow()
 
         # Check if zone is snoozed
-        if reason == "auto" and self._snooze_until and now < self._snooze_until:
+        if reason in ("auto", "activity") and self._snooze_until and now < self._snooze_until:
             _LOGGER.debug("Zone %s is snoozed until %s", self._name, self._snooze_until)
             return
 
-        try:
-            image = await async_get_image(self.hass, self._camera_entity_id)
-            image_bytes = image.content
-        except Exception as err:
-            _LOGGER.error("Failed to capture camera image for %s: %s", self._name, err)
-            self._state.last_error = f"Failed to capture camera image: {err}"
-            self._state.tidy = False
-            self._state.last_checked = now
+        # Scheduled checks wait for the room to be used and then left alone
+        if reason == "auto" and self._activity_entities and (
+            not self._activity_since_capture or self._room_active()
+        ):
+            self._idle_skips += 1
+            _LOGGER.debug("Zone %s skipped its auto check: no finished activity", self._name)
+            return
+
+        if not await self._async_admit(reason):
+            return
+
+        deadline = get_settings(self.hass)[CONF_CHECK_TIMEOUT]
+        self._checks_in_flight += 1
+        with track_check() as timer:
+            self._check_timer = timer
+            try:
+                async with asyncio.timeout(deadline):
+                    with operation(f"check:{self._name}"):
+                        with span(SPAN_CAPTURE):
+                            image_bytes = await self._async_capture_image(now)
+                        if image_bytes is not None:
+                            await self._async_analyze(image_bytes, now)
+            except TimeoutError:
+                self._check_timeouts += 1
+                _LOGGER.warning("Check of %s did not finish within %s seconds", self._name, deadline)
+                # Nothing was judged, so any activity still needs a check
+                self._activity_since_capture = True
+                self._apply_error(f"Check did not finish within {deadline} seconds", now)
+                return
+            finally:
+                self._check_timer = None
+                self._end_check(sent=bool(timer.requests))
+        self._latency.record(timer)
+        async_dispatcher_send(self.hass, SIGNAL_ZONE_LATENCY_UPDATED.format(self.entry_id))
+
+    async def _async_admit(self, reason: str) -> bool:
+        """Return True if the daily request budget allows a check for reason."""
+        if self._backend_name != BACKEND_GEMINI:
+            return True
+        budget = async_get_request_budget(self.hass)
+        if not budget.enabled:
+            return True
+
+        scheduled = reason in _SCHEDULED_REASONS
+        weights = _budget_weights(self.hass) if scheduled else {}
+        if await budget.async_acquire(self.entry_id, scheduled, weights):
+            return True
+
+        if scheduled:
+            self._deferred_checks += 1
+            _LOGGER.info(
+                "Zone %s: daily request budget spent, deferring %s check to %s",
+                self._name,
+                reason,
+                budget.resets_at,
+            )
+            self._defer_check(reason, budget.resets_at)
+            # The zone's state is unchanged; only the budget sensor needs it
+            async_dispatcher_send(self.hass, SIGNAL_ZONE_STATE_UPDATED)
+        else:
+            _LOGGER.warning("Zone %s: daily request budget spent, check not run", self._name)
+            self._state.last_error = (
+                f"Daily request budget used up; checks resume at {budget.resets_at.isoformat()}"
+            )
             self._notify_listeners()
+        return False
+
+    @callback
+    def _end_check(self, sent: bool) -> None:
+        """Settle an admitted check however it ended (finished, failed, timed out or cancelled)."""
+        self._checks_in_flight -= 1
+        if not sent and self._backend_name == BACKEND_GEMINI:
+            # Hand back the budget admission of a check that sent no request
+            async_get_request_budget(self.hass).release(self.entry_id)
+        if self._state.partial:
+            # Cancelled mid-stream; the early result is all there is
+            self._state.partial = False
+            self._notify_listeners()
+
+    @callback
+    def _defer_check(self, reason: str, when: datetime) -> None:
+        """Run one check of the given reason once the budget resets."""
+        if self._unsub_deferred:
+            # Later denials fold into the check already waiting
             return
 
-        session = aiohttp_client.async_get_clientsession(self.hass)
+        async def _async_run_deferred(_now: datetime) -> None:
+            self._unsub_deferred = None
+            await self.async_request_check(reason=reason)
+
+        self._unsub_deferred = event.async_track_point_in_utc_time(
+            self.hass, _async_run_deferred, when
+        )
+
+    async def _async_analyze(self, image_bytes: bytes, now: datetime) -> None:
+        """Analyze a captured image with the zone's backend and apply the result."""
+        session_manager = async_get_session_manager(self.hass)
 
         try:
-            result = await self._gemini_client.analyze_image(
-                session=session,
+            result = await self._backend.analyze_image(
+                session=session_manager.get_session(),
                 image_bytes=image_bytes,
                 room_name=self._name,
                 personality=self._personality,
                 pickiness=self._pickiness,
+                timeout=session_manager.timeout,
+                on_partial=self._publish_partial if get_settings(self.hass)[CONF_STREAMING] else None,
             )
         except GeminiClientError as err:
             _LOGGER.error("Gemini API error for %s: %s", self._name, err)
-            self._state.last_error = str(err)
-            self._state.tidy = False
-            self._state.last_checked = now
-            self._notify_listeners()
+            self._apply_error(str(err), now)
             return
         except Exception as err:
             _LOGGER.exception("Unexpected error analyzing %s: %s", self._name, err)
-            self._state.last_error = f"Unexpected error: {err}"
-            self._state.tidy = False
-            self._state.last_checked = now
-            self._notify_listeners()
+            self._apply_error(f"Unexpected error: {err}", now)
             return
 
-        # Update state with results
+        self._apply_result(result, now)
+
+    async def _async_capture_image(self, now: datetime) -> bytes | None:
+        """Capture a camera snapshot (or the zone's region of it), recording an error state on failure."""
+        broker = async_get_snapshot_broker(self.hass)
+        # Activity from here on needs a newer snapshot
+        self._activity_since_capture = False
+        try:
+            # Zones sharing this camera reuse one snapshot
+            if self._roi is None:
+                return await broker.async_get_image(self._camera_entity_id, self._async_fetch_image)
+            return await broker.async_get_region(
+                self._camera_entity_id, self._roi, self._async_fetch_image, self._async_crop
+            )
+        except Exception as err:
+            _LOGGER.error("Failed to capture camera image for %s: %s", self._name, err)
+            self._activity_since_capture = True
+            self._apply_error(f"Failed to capture camera image: {err}", now)
+            return None
+
+    async def _async_fetch_image(self) -> bytes:
+        return await async_get_burst_capture(self.hass).async_capture(self._async_fetch_frame)
+
+    async def _async_fetch_frame(self) -> bytes:
+        image = await async_get_image(self.hass, self._camera_entity_id)
+        return image.content
+
+    async def _async_crop(self, image_bytes: bytes, rois: List[Roi]) -> List[bytes]:
+        return await async_get_cpu_executor(self.hass).async_run(crop_regions, image_bytes, rois)
+
+    @callback
+    def _publish_partial(self, fields: Dict[str, Any]) -> None:
+        """Publish tidy/severity from a streamed reply before it completes."""
+        if self._unloaded:
+            return
+        self._state.tidy = fields["tidy"]
+        self._state.severity = fields["severity"]
+        if self._state.tidy:
+            self._state.tasks = ()
+        self._state.partial = True
+        _LOGGER.debug(
+            "Zone %s early result: tidy=%s, severity=%s",
+            self._name,
+            self._state.tidy,
+            self._state.severity,
+        )
+        self._notify_listeners()
+
+    @callback
+    def _apply_error(self, message: str, now: datetime) -> None:
+        """Record a failed check and notify listeners."""
+        if self._unloaded:
+            # Left a batched check_all that was still running
+            return
+        self._state.partial = False
+        self._state.last_error = message
+        self._state.tidy = False
+        self._state.last_checked = now
+        self._notify_listeners()
+
+    @callback
+    def _apply_result(self, result: Dict[str, Any], now: datetime) -> None:
+        """Record a successful analysis and notify listeners."""
+        if self._unloaded:
+            return
         self._state.tidy = result.get("tidy", False)
-        self._state.tasks = result.get("tasks", [])
+        self._state.tasks = _intern_tasks(result.get("tasks", ()))
         self._state.comment = result.get("comment", "")
         self._state.severity = result.get("severity", "medium")
         self._state.image_size = result.get("image_size", 0)
         self._state.api_response_time = result.get("api_response_time", 0.0)
-        self._state.full_analysis = result
+        self._state.extra = {
+            key: value for key, value in result.items() if key not in _STATE_RESULT_KEYS
+        } or _NO_EXTRA
+        self._state.partial = False
         self._state.last_error = None
         self._state.last_checked = now
         
-        # Calculate messiness score (0-100)
-        self._state.messiness_score = self._calculate_messiness_score()
+        # Calculate messiness score (0-100); backends without an itemised
+        # task list (the local model) score the room themselves
+        score = result.get("messiness_score")
+        self._state.messiness_score = self._calculate_messiness_score() if score is None else score
 
         _LOGGER.info(
             "Zone %s analyzed: tidy=%s, tasks=%d, severity=%s, messiness=%d",
@@ -414,6 +994,12 @@ class CleanMeZone:
             self._state.messiness_score,
         )
 
+        self._adaptive.observe(now, self._state.messiness_score)
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, ADAPTIVE_SAVE_DELAY)
+        if self._check_frequency == FREQUENCY_ADAPTIVE:
+            self._schedule_adaptive_check()
+
         self._notify_listeners()
     
     def _calculate_messiness_score(self) -> int:
@@ -426,13 +1012,148 @@ class CleanMeZone:
         if task_count == 0:
             return 0
         
-        # Each task adds 10-20 points depending on severity
-        severity_multiplier = {
-            "low": 10,
-            "medium": 15,
-            "high": 20,
-        }
-        multiplier = severity_multiplier.get(self._state.severity, 15)
+        # Each task adds 10-20 points depending on severity (low/medium/high)
+        multiplier = 10 + 5 * self._state.severity_level
         
         score = min(100, task_count * multiplier)
         return score
+
+
+@callback
+def _budget_weights(hass: HomeAssistant) -> Dict[str, float]:
+    """Return the budget weight of every Gemini zone that runs scheduled checks."""
+    return {
+        zone.entry_id: zone.budget_weight
+        for zone in hass.data.get(DOMAIN, {}).values()
+        if isinstance(zone, CleanMeZone)
+        and zone.backend_name == BACKEND_GEMINI
+        and zone.schedules_checks
+    }
+
+
+async def async_check_all_zones(hass: HomeAssistant, zones: List[CleanMeZone]) -> None:
+    """Check every zone, packing images into batched requests when enabled."""
+    batch_size = get_settings(hass)[CONF_BATCH_SIZE]
+    # Zones on one camera share its snapshot even when the queue runs them apart
+    with async_get_snapshot_broker(hass).hold():
+        if batch_size <= 1 or len(zones) <= 1:
+            # Queued together so the check queue runs them in zone priority order
+            await asyncio.gather(*(zone.async_request_check(reason="check_all") for zone in zones))
+            return
+
+        # The batched requests are one job for the queue, running for every zone in it
+        await async_get_check_queue(hass).async_run(
+            "check_all",
+            "check_all",
+            max(zone._priority_level for zone in zones),
+            partial(_async_check_zones_batched_job, hass, zones, batch_size),
+            members=[zone.entry_id for zone in zones],
+        )
+
+
+async def _async_check_zones_batched_job(
+    hass: HomeAssistant, zones: List[CleanMeZone], batch_size: int
+) -> None:
+    now = utcnow()
+    deadline = get_settings(hass)[CONF_CHECK_TIMEOUT]
+    zones = [zone for zone in zones if await zone._async_admit("check_all")]
+    # entry_ids of zones keeping their budget admission: one per batched request
+    sent: set[str] = set()
+    for zone in zones:
+        zone._checks_in_flight += 1
+    try:
+        async with asyncio.timeout(deadline):
+            with operation("check_all"):
+                await _async_check_zones_batched(hass, zones, batch_size, now, sent)
+    except TimeoutError:
+        _LOGGER.warning("check_all did not finish within %s seconds", deadline)
+        for zone in zones:
+            # Zones whose result already arrived keep it
+            if zone.state.last_checked != now:
+                zone._check_timeouts += 1
+                zone._apply_error(f"Check did not finish within {deadline} seconds", now)
+    finally:
+        for zone in zones:
+            zone._end_check(sent=zone.entry_id in sent)
+
+
+async def _async_check_zones_batched(
+    hass: HomeAssistant,
+    zones: List[CleanMeZone],
+    batch_size: int,
+    now: datetime,
+    sent: set[str],
+) -> None:
+    images = await asyncio.gather(*(zone._async_capture_image(now) for zone in zones))
+
+    # A batch is a single Gemini request, so it can only contain zones sharing an API key
+    groups: Dict[str, List[tuple[CleanMeZone, bytes]]] = {}
+    for zone, image_bytes in zip(zones, images):
+        if image_bytes is None:
+            continue
+        if not isinstance(zone._backend, GeminiClient):
+            with track_check() as timer:
+                await zone._async_analyze(image_bytes, now)
+            if timer.requests:
+                sent.add(zone.entry_id)
+            continue
+        groups.setdefault(zone._backend.api_key, []).append((zone, image_bytes))
+
+    session_manager = async_get_session_manager(hass)
+
+    for members in groups.values():
+        for offset in range(0, len(members), batch_size):
+            chunk = members[offset:offset + batch_size]
+            client: GeminiClient = chunk[0][0]._backend
+            _LOGGER.debug("Checking %d zones in one batched request", len(chunk))
+
+            results: Dict[str, Dict[str, Any] | GeminiClientError] = {}
+            with track_check() as timer:
+                try:
+                    results = await client.analyze_images(
+                        session=session_manager.get_session(),
+                        images=[
+                            BatchImage(
+                                key=zone.entry_id,
+                                room_name=zone.name,
+                                image_bytes=image_bytes,
+                                personality=zone.personality,
+                                pickiness=zone.pickiness,
+                            )
+                            for zone, image_bytes in chunk
+                        ],
+                        timeout=session_manager.timeout,
+                    )
+                except GeminiClientError as err:
+                    _LOGGER.error("Batched Gemini API error: %s", err)
+                    for zone, _ in chunk:
+                        zone._apply_error(str(err), now)
+                    continue
+                except Exception as err:
+                    _LOGGER.exception("Unexpected error in batched analysis: %s", err)
+                    for zone, _ in chunk:
+                        zone._apply_error(f"Unexpected error: {err}", now)
+                    continue
+                finally:
+                    if timer.requests:
+                        # The chunk's requests keep one admission, held by a zone whose
+                        # image went out; _end_check hands back the others
+                        requested = [
+                            zone
+                            for zone, _ in chunk
+                            if not _is_cached(results.get(zone.entry_id))
+                        ]
+                        sent.add((requested or [chunk[0][0]])[0].entry_id)
+
+            for zone, _ in chunk:
+                result = results.get(zone.entry_id)
+                if isinstance(result, dict):
+                    zone._apply_result(result, now)
+                else:
+                    _LOGGER.error("Gemini API error for %s: %s", zone.name, result)
+                    zone._apply_error(str(result), now)
+
+
+def _is_cached(result: Dict[str, Any] | GeminiClientError | None) -> bool:
+    """Return True if a batch result came from the result cache without a request."""
+    return isinstance(result, dict) and bool(result.get("cached"))
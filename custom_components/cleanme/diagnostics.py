@@ -0,0 +1,158 @@
+"""Diagnostics support for CleanMe.
+
+One download holds everything needed to debug a slow or failing zone:
+scheduling state, in-flight checks, backend counters, cache hit ratios,
+latency percentiles, Store writes and dashboard regeneration timings.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntry
+
+from .const import (
+    DOMAIN,
+    CONF_API_KEY,
+    DATA_DASHBOARD_LATENCY,
+    ATTR_DASHBOARD_LAST_ERROR,
+    ATTR_DASHBOARD_LAST_GENERATED,
+    ATTR_DASHBOARD_STATUS,
+)
+from .budget import DATA_REQUEST_BUDGET
+from .burst import DATA_BURST_CAPTURE
+from .check_queue import DATA_CHECK_QUEUE
+from .executor import DATA_CPU_EXECUTOR
+from .coordinator import CleanMeZone
+from .file_upload import DATA_FILE_STORE
+from .result_cache import DATA_RESULT_CACHE
+from .session import DATA_SESSION_MANAGER
+from .settings import get_settings
+from .snapshots import DATA_SNAPSHOT_BROKER
+from .timing import SPAN_PERSIST
+from .watchdog import DATA_LOOP_WATCHDOG
+
+TO_REDACT = {CONF_API_KEY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a zone config entry."""
+    diagnostics: Dict[str, Any] = {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "integration": _integration_diagnostics(hass),
+    }
+
+    zone = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if isinstance(zone, CleanMeZone):
+        diagnostics["zone"] = _zone_diagnostics(zone)
+    return diagnostics
+
+
+async def async_get_device_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry, device: DeviceEntry
+) -> Dict[str, Any]:
+    """Return diagnostics for a zone device (one device per config entry)."""
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+    diagnostics["device"] = {
+        "name": device.name,
+        "identifiers": sorted(list(identifier) for identifier in device.identifiers),
+    }
+    return diagnostics
+
+
+def _zone_diagnostics(zone: CleanMeZone) -> Dict[str, Any]:
+    state = zone.state
+    return {
+        "name": zone.name,
+        "backend": zone.backend_name,
+        "schedule": {
+            "runs_per_day": zone.runs_per_day,
+            "check_interval_hours": zone.check_interval_hours,
+            "next_scheduled_check": _isoformat(zone.next_scheduled_check),
+            "snoozed_until": _isoformat(zone.snooze_until),
+            "activity_entities": list(zone.activity_entities),
+            "activity_since_capture": zone.activity_since_capture,
+            "quiet_check_pending": zone.quiet_check_pending,
+            "idle_skips": zone.idle_skips,
+            "messiness_rate_per_hour": _round(zone.adaptive.rate),
+            "messiness_rate_samples": zone.adaptive.samples,
+            "budget_weight": _round(zone.budget_weight),
+            "deferred_checks": zone.deferred_checks,
+            "deferred_check_pending": zone.deferred_check_pending,
+        },
+        "checks_in_flight": zone.checks_in_flight,
+        "check_timeouts": zone.check_timeouts,
+        "checks_superseded": zone.checks_superseded,
+        "state": {
+            "tidy": state.tidy,
+            "severity": state.severity,
+            "task_count": len(state.tasks),
+            "partial": state.partial,
+            "last_checked": _isoformat(state.last_checked),
+            "last_error": state.last_error,
+            "image_size": state.image_size,
+            "api_response_time": state.api_response_time,
+        },
+        "analysis": zone.analysis_metrics,
+        "store_writes": zone.latency.histogram(SPAN_PERSIST).count,
+        "latency": {
+            "last_check_ms": {
+                name: round(seconds * 1000, 1) for name, seconds in zone.latency.last.items()
+            },
+            "percentiles": zone.latency.summary(),
+        },
+    }
+
+
+def _integration_diagnostics(hass: HomeAssistant) -> Dict[str, Any]:
+    """Return state shared by every zone."""
+    domain_data = hass.data.get(DOMAIN, {})
+
+    session_manager = domain_data.get(DATA_SESSION_MANAGER)
+    file_store = domain_data.get(DATA_FILE_STORE)
+    result_cache = domain_data.get(DATA_RESULT_CACHE)
+    snapshot_broker = domain_data.get(DATA_SNAPSHOT_BROKER)
+    burst_capture = domain_data.get(DATA_BURST_CAPTURE)
+    request_budget = domain_data.get(DATA_REQUEST_BUDGET)
+    check_queue = domain_data.get(DATA_CHECK_QUEUE)
+    cpu_executor = domain_data.get(DATA_CPU_EXECUTOR)
+    dashboard_latency = domain_data.get(DATA_DASHBOARD_LATENCY)
+    loop_watchdog = domain_data.get(DATA_LOOP_WATCHDOG)
+    dashboard_state = domain_data.get("dashboard_state") or {}
+
+    return {
+        "settings": dict(get_settings(hass)),
+        "zone_count": sum(isinstance(zone, CleanMeZone) for zone in domain_data.values()),
+        "connection_pool": session_manager.metrics if session_manager else None,
+        "file_uploads": file_store.metrics if file_store else None,
+        "result_cache": result_cache.metrics if result_cache else None,
+        "snapshots": snapshot_broker.metrics if snapshot_broker else None,
+        "burst_capture": burst_capture.metrics if burst_capture else None,
+        "request_budget": request_budget.metrics if request_budget else None,
+        "check_queue": check_queue.metrics if check_queue else None,
+        "cpu_executor": cpu_executor.metrics if cpu_executor else None,
+        "loop_watchdog": loop_watchdog.metrics if loop_watchdog else None,
+        "dashboard": {
+            "status": dashboard_state.get(ATTR_DASHBOARD_STATUS),
+            "last_generated": _isoformat(dashboard_state.get(ATTR_DASHBOARD_LAST_GENERATED)),
+            "last_error": dashboard_state.get(ATTR_DASHBOARD_LAST_ERROR),
+            "regeneration_ms": dashboard_latency.summary() if dashboard_latency else None,
+        },
+    }
+
+
+def _isoformat(value: datetime | None) -> str | None:
+    return value.isoformat() if value else None
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 2) if value is not None else None
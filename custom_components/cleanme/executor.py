@@ -0,0 +1,135 @@
+"""Dedicated thread pool for CleanMe's CPU-bound work.
+
+Hashing, base64-encoding and decoding multi-megabyte snapshots, cropping,
+scoring and fingerprinting them all take milliseconds of CPU each. On the
+event loop that stalls every other integration; on Home Assistant's shared
+executor it competes with file and network I/O from everything else. CleanMe
+runs this work on its own small pool instead, so a burst of checks can
+neither block the loop nor starve the shared executor.
+
+Threads rather than processes: hashlib, Pillow and NumPy release the GIL
+for large buffers, and a process pool would have to copy every snapshot
+into the worker.
+"""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import time
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DOMAIN, CONF_CPU_WORKERS
+from .settings import get_settings
+from .timing import LatencyHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_CPU_EXECUTOR = "cpu_executor"
+# Unsubscribes the executor's shutdown-on-close listener
+DATA_CPU_EXECUTOR_CLOSE_UNSUB = "cpu_executor_close_unsub"
+
+_T = TypeVar("_T")
+
+
+def _timed(func: Callable[..., _T], args: Tuple[Any, ...], queued_at: float) -> Tuple[_T, float, float]:
+    """Run func(*args) in a worker; return its result, queue wait and run time."""
+    started = time.perf_counter()
+    result = func(*args)
+    return result, started - queued_at, time.perf_counter() - started
+
+
+class CpuExecutor:
+    """Bounded thread pool with queue metrics."""
+
+    def __init__(self, workers: int) -> None:
+        """Initialize the pool; threads start on first use."""
+        self._workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="cleanme_cpu")
+        # Submitted and not yet finished; anything beyond the workers is queued
+        self._pending = 0
+        self._max_queued = 0
+        self._jobs = 0
+        self._failures = 0
+        self._wait = LatencyHistogram()
+        self._run = LatencyHistogram()
+
+    @property
+    def queued(self) -> int:
+        """Return the number of jobs waiting for a free worker."""
+        return max(self._pending - self._workers, 0)
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return pool size, queue depth and wait/run time percentiles."""
+        return {
+            "workers": self._workers,
+            "running": min(self._pending, self._workers),
+            "queued": self.queued,
+            "max_queued": self._max_queued,
+            "jobs": self._jobs,
+            "failures": self._failures,
+            "wait": self._wait.summary(),
+            "run": self._run.summary(),
+        }
+
+    async def async_run(self, func: Callable[..., _T], *args: Any) -> _T:
+        """Run func(*args) on the pool and return its result."""
+        self._jobs += 1
+        self._pending += 1
+        self._max_queued = max(self._max_queued, self.queued)
+        try:
+            result, waited, ran = await asyncio.get_running_loop().run_in_executor(
+                self._pool, _timed, func, args, time.perf_counter()
+            )
+        except Exception:
+            self._failures += 1
+            raise
+        finally:
+            self._pending -= 1
+        self._wait.add(waited)
+        self._run.add(ran)
+        return result
+
+    @callback
+    def shutdown(self) -> None:
+        """Stop the workers once their current jobs finish; queued jobs are dropped."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+@callback
+def async_get_cpu_executor(hass: HomeAssistant) -> CpuExecutor:
+    """Return the shared CPU executor, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    executor: CpuExecutor | None = domain_data.get(DATA_CPU_EXECUTOR)
+    if executor is not None:
+        return executor
+
+    executor = CpuExecutor(get_settings(hass)[CONF_CPU_WORKERS])
+    domain_data[DATA_CPU_EXECUTOR] = executor
+
+    @callback
+    def _shutdown(event: Event) -> None:
+        # Fired listeners are already removed
+        domain_data.pop(DATA_CPU_EXECUTOR_CLOSE_UNSUB, None)
+        executor.shutdown()
+
+    domain_data[DATA_CPU_EXECUTOR_CLOSE_UNSUB] = hass.bus.async_listen_once(
+        EVENT_HOMEASSISTANT_CLOSE, _shutdown
+    )
+    return executor
+
+
+@callback
+def async_shutdown_cpu_executor(hass: HomeAssistant) -> None:
+    """Shut down and forget the shared CPU executor."""
+    domain_data = hass.data.get(DOMAIN, {})
+    unsub = domain_data.pop(DATA_CPU_EXECUTOR_CLOSE_UNSUB, None)
+    if unsub is not None:
+        unsub()
+    executor: CpuExecutor | None = domain_data.pop(DATA_CPU_EXECUTOR, None)
+    if executor is not None:
+        executor.shutdown()
@@ -0,0 +1,169 @@
+"""Gemini File API uploads for large snapshots.
+
+High-resolution cameras produce multi-megabyte JPEGs, and sending them as
+inline base64 grows every generateContent request by a third. With
+file_upload enabled, snapshots above a size threshold are uploaded once
+through the resumable media endpoint and referenced by URI instead.
+
+Uploads are keyed by API key and image digest, so parse retries, batched
+check_all requests and unchanged frames all reuse the same file. Entries
+live for a TTL; expired files are deleted from Gemini by the next client
+call, and files Gemini rejects are deleted in the background (Gemini
+itself removes files after 48 hours).
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import (
+    DOMAIN,
+    CONF_FILE_UPLOAD_MIN_SIZE,
+    CONF_FILE_UPLOAD_TTL,
+    DEFAULT_FILE_UPLOAD_MIN_SIZE,
+    DEFAULT_FILE_UPLOAD_TTL,
+)
+from .settings import get_settings
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_FILE_STORE = "file_store"
+
+# Bytes per resumable upload request; must be a multiple of 256 KiB
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# (API key, image digest)
+FileKey = Tuple[str, str]
+
+
+@dataclass
+class UploadedFile:
+    """A file uploaded through the File API and its local expiry tracking."""
+
+    name: str  # files/abc123
+    uri: str
+    mime_type: str
+    api_key: str  # needed to delete it again
+    expires_at: float = 0.0  # time.monotonic() deadline
+
+
+class FileUploadError(Exception):
+    """Raised when a File API request fails."""
+
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class FileStore:
+    """Tracks uploaded snapshots so identical frames are uploaded once."""
+
+    def __init__(
+        self,
+        ttl_seconds: int = DEFAULT_FILE_UPLOAD_TTL,
+        min_size: int = DEFAULT_FILE_UPLOAD_MIN_SIZE,
+    ) -> None:
+        """Initialize the file store."""
+        self._ttl = ttl_seconds
+        self._min_size = min_size
+        self._entries: Dict[FileKey, UploadedFile] = {}
+        self._locks: Dict[FileKey, asyncio.Lock] = {}
+
+        self._uploads = 0
+        self._reuses = 0
+        self._failures = 0
+        self._deletes = 0
+        self._bytes_uploaded = 0
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return upload counters."""
+        lookups = self._uploads + self._reuses
+        return {
+            "entries": len(self._entries),
+            "uploads": self._uploads,
+            "reuses": self._reuses,
+            "failures": self._failures,
+            "deletes": self._deletes,
+            "bytes_uploaded": self._bytes_uploaded,
+            "reuse_ratio": round(self._reuses / lookups, 3) if lookups else 0.0,
+        }
+
+    def wants(self, image_bytes: bytes) -> bool:
+        """Return True if an image is large enough to upload instead of inlining."""
+        return len(image_bytes) >= self._min_size
+
+    async def async_get_file(
+        self,
+        key: FileKey,
+        size: int,
+        upload: Callable[[], Awaitable[UploadedFile]],
+    ) -> UploadedFile | None:
+        """Return a live upload for key, uploading it if needed.
+
+        ``upload()`` must upload the image and return the new file. Returns
+        None when the upload fails, in which case the caller should send
+        the image inline.
+        """
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() < entry.expires_at:
+                self._reuses += 1
+                return entry
+
+            try:
+                entry = await upload()
+            except FileUploadError as err:
+                self._failures += 1
+                _LOGGER.debug("File upload failed, sending image inline: %s", err)
+                return None
+
+            self._uploads += 1
+            self._bytes_uploaded += size
+            entry.expires_at = time.monotonic() + self._ttl
+            self._entries[key] = entry
+            _LOGGER.debug("Uploaded %d byte image as %s", size, entry.name)
+            return entry
+
+    @callback
+    def invalidate(self, key: FileKey) -> UploadedFile | None:
+        """Forget an upload, e.g. after Gemini rejects it, and return it for deletion."""
+        return self._entries.pop(key, None)
+
+    @callback
+    def pop_expired(self) -> List[UploadedFile]:
+        """Remove and return uploads past their TTL, ready to be deleted."""
+        now = time.monotonic()
+        expired = []
+        for key, entry in list(self._entries.items()):
+            if now >= entry.expires_at:
+                del self._entries[key]
+                expired.append(entry)
+        # Every frame gets its own key, so drop idle locks along with entries
+        for key, lock in list(self._locks.items()):
+            if key not in self._entries and not lock.locked():
+                del self._locks[key]
+        return expired
+
+    @callback
+    def record_delete(self) -> None:
+        """Count a file deleted from Gemini."""
+        self._deletes += 1
+
+
+@callback
+def async_get_file_store(hass: HomeAssistant) -> FileStore:
+    """Return the shared file store, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    store: FileStore | None = domain_data.get(DATA_FILE_STORE)
+    if store is None:
+        settings = get_settings(hass)
+        store = FileStore(settings[CONF_FILE_UPLOAD_TTL], settings[CONF_FILE_UPLOAD_MIN_SIZE])
+        domain_data[DATA_FILE_STORE] = store
+    return store
@@ -6,29 +6,156 @@ pickiness levels for customized tidiness assessments.
 """
 from __future__ import annotations
 
-import base64
+import asyncio
 import json
 import logging
 import time
-from typing import Any, Dict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Tuple
+from urllib.parse import urlsplit
 
 import aiohttp
 
 from .const import GEMINI_MODEL, GEMINI_API_BASE, AI_PERSONALITIES
+from .budget import RequestBudget
+from .executor import CpuExecutor
+from .file_upload import (
+    UPLOAD_CHUNK_SIZE,
+    FileKey,
+    FileStore,
+    FileUploadError,
+    UploadedFile,
+)
+from .imaging import digest
+from .json_extract import IncrementalJSONExtractor, extract_json
+from .result_cache import ResultCache, ResultKey
+from .request_body import InlineImage, JsonImagePayload
+from .timing import (
+    SPAN_ENCODE,
+    SPAN_PARSE,
+    SPAN_RECEIVE,
+    SPAN_UPLOAD,
+    SPAN_VALIDATE,
+    record_request,
+    request_started,
+    span,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# Used when the caller does not supply a pool-specific timeout
+DEFAULT_REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=90)
+
+# A full answer (a few tasks + a 200 char comment) is well under 300 tokens
+MAX_OUTPUT_TOKENS = 512
+
+# Receives {"tidy": bool, "severity": str} while a streamed reply is still arriving
+PartialCallback = Callable[[Dict[str, Any]], None]
+
+# Extra requests made when a reply cannot be parsed or validated
+PARSE_RETRIES = 1
+
+# Response bodies at least this long (chars) are decoded on the CPU executor;
+# shorter ones decode faster than the hop to a worker thread
+JSON_OFFLOAD_MIN_SIZE = 64 * 1024
+
+# Structured output schema matching the _validate_response contract.
+# tidy and severity come first so they are available early when streaming.
+RESPONSE_SCHEMA: Dict[str, Any] = {
+    "type": "OBJECT",
+    "properties": {
+        "tidy": {"type": "BOOLEAN"},
+        "severity": {"type": "STRING", "enum": ["low", "medium", "high"]},
+        "tasks": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "comment": {"type": "STRING"},
+    },
+    "required": ["tidy", "severity", "tasks", "comment"],
+    "propertyOrdering": ["tidy", "severity", "tasks", "comment"],
+}
+
+BATCH_ITEM_SCHEMA: Dict[str, Any] = {
+    **RESPONSE_SCHEMA,
+    "properties": {"zone": {"type": "STRING"}, **RESPONSE_SCHEMA["properties"]},
+    "required": ["zone", *RESPONSE_SCHEMA["required"]],
+    "propertyOrdering": ["zone", *RESPONSE_SCHEMA["propertyOrdering"]],
+}
+
 
 class GeminiClientError(Exception):
     """Raised when the Gemini API client fails."""
 
+    def __init__(self, message: str, status: int | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+@dataclass
+class BatchImage:
+    """One zone's image and prompt settings for a batched request."""
+
+    key: str
+    room_name: str
+    image_bytes: bytes
+    personality: str
+    pickiness: int
+
+
+def _inline_part(image_bytes: bytes) -> Dict[str, Any]:
+    """Return a content part carrying the image inline."""
+    # Encoded while the request body is written, see request_body
+    return {
+        "inline_data": {
+            "mime_type": "image/jpeg",
+            "data": InlineImage(image_bytes),
+        }
+    }
+
+
+def _upload_base(api_base: str) -> str:
+    """Return the media upload base for an API base (/v1beta -> /upload/v1beta)."""
+    parts = urlsplit(api_base)
+    return f"{parts.scheme}://{parts.netloc}/upload{parts.path}"
+
 
 class GeminiClient:
     """Client for Gemini API with vision capabilities."""
 
-    def __init__(self, api_key: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        api_base: str = GEMINI_API_BASE,
+        file_store: FileStore | None = None,
+        result_cache: ResultCache | None = None,
+        budget: RequestBudget | None = None,
+        executor: CpuExecutor | None = None,
+    ) -> None:
         """Initialize Gemini client."""
         self._api_key = api_key
+        self._api_base = api_base
+        self._upload_base = _upload_base(api_base)
+        self._file_store = file_store
+        self._result_cache = result_cache
+        self._budget = budget
+        self._executor = executor
+
+        # Background deletes of rejected uploads, referenced until they finish
+        self._delete_tasks: set[asyncio.Task] = set()
+
+        self._parse_failures = 0
+        self._parse_retries = 0
+
+    @property
+    def api_key(self) -> str:
+        """Return the API key this client authenticates with."""
+        return self._api_key
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return response parsing counters."""
+        return {
+            "parse_failures": self._parse_failures,
+            "parse_retries": self._parse_retries,
+        }
 
     async def analyze_image(
         self,
@@ -37,40 +164,99 @@ class GeminiClient:
         room_name: str,
         personality: str,
         pickiness: int,
+        timeout: aiohttp.ClientTimeout | None = None,
+        on_partial: PartialCallback | None = None,
     ) -> Dict[str, Any]:
         """
         Analyze room image using Gemini vision model.
 
+        If on_partial is given the reply is streamed, and on_partial is
+        called with {"tidy", "severity"} as soon as both fields arrive.
+
         Returns dict with:
         - tidy: bool
         - tasks: list of task strings
         - comment: str
         - severity: str (low/medium/high)
         """
-        start_time = time.time()
-
-        image_b64 = base64.b64encode(image_bytes).decode("utf-8")
+        start_time = time.perf_counter()
+
+        image_digest = await self._async_digest(image_bytes)
+        result_key = None
+        if self._result_cache is not None:
+            result_key = (image_digest, room_name, personality, pickiness, GEMINI_MODEL)
+            cached = await self._async_get_cached_result(result_key, image_bytes, start_time)
+            if cached is not None:
+                return cached
+
+        # Uploaded once and reused by parse retries
+        image_part, uploaded_key = await self._async_image_part(
+            session, image_bytes, timeout, image_digest
+        )
+
+        for attempt in range(PARSE_RETRIES + 1):
+            try:
+                data = await self._async_request_analysis(
+                    session, image_part, room_name, personality, pickiness, timeout, on_partial
+                )
+            except GeminiClientError as err:
+                if uploaded_key is None or err.status not in (403, 404):
+                    raise
+                # Uploaded file expired or was deleted server-side - send the image inline
+                _LOGGER.debug("Uploaded image for %s unavailable: %s", room_name, err)
+                self._forget_upload(session, uploaded_key, timeout)
+                image_part, uploaded_key = _inline_part(image_bytes), None
+                data = await self._async_request_analysis(
+                    session, image_part, room_name, personality, pickiness, timeout, on_partial
+                )
+            try:
+                with span(SPAN_PARSE):
+                    parsed = self._parse_response_json(data)
+                # Validate and normalize response
+                with span(SPAN_VALIDATE):
+                    result = self._validate_response(parsed)
+                break
+            except GeminiClientError as err:
+                self._parse_failures += 1
+                if attempt == PARSE_RETRIES:
+                    raise
+                self._parse_retries += 1
+                _LOGGER.warning(
+                    "Unusable Gemini response for %s, retrying (%d/%d): %s",
+                    room_name,
+                    attempt + 1,
+                    PARSE_RETRIES,
+                    err,
+                )
+
+        if result_key is not None:
+            self._result_cache.put(result_key, result)
+
+        response_time = time.perf_counter() - start_time
 
-        prompt = self._build_prompt(room_name, personality, pickiness)
-
-        url = f"{GEMINI_API_BASE}/models/{GEMINI_MODEL}:generateContent"
+        result["api_response_time"] = response_time
+        result["image_size"] = len(image_bytes)
 
-        headers = {
-            "Content-Type": "application/json",
-            "x-goog-api-key": self._api_key,
-        }
+        await self._async_delete_expired_files(session, timeout)
+        return result
 
+    async def _async_request_analysis(
+        self,
+        session: aiohttp.ClientSession,
+        image_part: Dict[str, Any],
+        room_name: str,
+        personality: str,
+        pickiness: int,
+        timeout: aiohttp.ClientTimeout | None,
+        on_partial: PartialCallback | None = None,
+    ) -> Dict[str, Any]:
+        """Send one single-image analysis request."""
         payload = {
             "contents": [
                 {
                     "parts": [
-                        {"text": prompt},
-                        {
-                            "inline_data": {
-                                "mime_type": "image/jpeg",
-                                "data": image_b64,
-                            }
-                        },
+                        {"text": self._build_prompt(room_name, personality, pickiness)},
+                        image_part,
                     ]
                 }
             ],
@@ -78,37 +264,527 @@ class GeminiClient:
                 "temperature": 0.4,
                 "topK": 32,
                 "topP": 1,
-                "maxOutputTokens": 2048,
+                "maxOutputTokens": MAX_OUTPUT_TOKENS,
+                "responseMimeType": "application/json",
+                "responseSchema": RESPONSE_SCHEMA,
             },
         }
+        return await self._async_send(session, payload, timeout, on_partial)
 
-        try:
-            async with session.post(url, headers=headers, json=payload, timeout=90) as resp:
-                if resp.status == 429:
-                    text = await resp.text()
-                    _LOGGER.warning(
-                        "Gemini API quota exceeded (429). This usually means your free-tier "
-                        "quota is exhausted. Model: %s. Response: %s",
-                        GEMINI_MODEL,
-                        text[:500],
+    async def _async_send(
+        self,
+        session: aiohttp.ClientSession,
+        payload: Dict[str, Any],
+        timeout: aiohttp.ClientTimeout | None,
+        on_partial: PartialCallback | None,
+    ) -> Dict[str, Any]:
+        """Send a request, streaming it when a partial-result callback is set."""
+        if on_partial is None:
+            return await self._async_generate_content(session, payload, timeout)
+        return await self._async_stream_generate_content(session, payload, timeout, on_partial)
+
+    async def analyze_images(
+        self,
+        session: aiohttp.ClientSession,
+        images: List[BatchImage],
+        timeout: aiohttp.ClientTimeout | None = None,
+    ) -> Dict[str, Dict[str, Any] | GeminiClientError]:
+        """
+        Analyze several room images in a single Gemini request.
+
+        Each image gets its own personality and pickiness section in the
+        prompt. Gemini answers with a JSON array keyed by zone id, and each
+        element is validated like a single-image response. Zones whose
+        answers are missing or unusable are sent again in one smaller batch.
+
+        Returns a dict mapping each BatchImage.key to either a result dict
+        (same shape as analyze_image) or the GeminiClientError for that zone.
+        Errors affecting the whole request are raised instead.
+        """
+        start_time = time.perf_counter()
+        results: Dict[str, Dict[str, Any] | GeminiClientError] = {}
+
+        digests = {image.key: await self._async_digest(image.image_bytes) for image in images}
+        result_keys: Dict[str, ResultKey] = {}
+        if self._result_cache is not None:
+            pending = []
+            for image in images:
+                result_keys[image.key] = (
+                    digests[image.key],
+                    image.room_name,
+                    image.personality,
+                    image.pickiness,
+                    GEMINI_MODEL,
+                )
+                cached = await self._async_get_cached_result(
+                    result_keys[image.key], image.image_bytes, start_time
+                )
+                if cached is None:
+                    pending.append(image)
+                else:
+                    results[image.key] = cached
+            images = pending
+
+        if not images:
+            return results
+
+        image_parts = await asyncio.gather(
+            *(
+                self._async_image_part(session, image.image_bytes, timeout, digests[image.key])
+                for image in images
+            )
+        )
+        uploaded_keys = [key for _, key in image_parts if key is not None]
+
+        # Uploaded once and reused by parse retries, which resend only the
+        # zones whose answers were unusable
+        pending = [(image, image_part) for image, (image_part, _) in zip(images, image_parts)]
+        for attempt in range(PARSE_RETRIES + 1):
+            zone_ids = {f"Z{index + 1}": entry for index, entry in enumerate(pending)}
+            payload = self._build_batch_payload(zone_ids)
+            try:
+                data = await self._async_generate_content(session, payload, timeout)
+            except GeminiClientError as err:
+                if err.status in (403, 404):
+                    # One of the uploads is gone; the next check uploads again
+                    for key in uploaded_keys:
+                        self._forget_upload(session, key, timeout)
+                raise
+
+            response_time = time.perf_counter() - start_time
+
+            failed: Dict[str, GeminiClientError] = {}
+            try:
+                by_zone_id = self._parse_batch_response(data)
+            except GeminiClientError as err:
+                if attempt == PARSE_RETRIES and len(pending) == len(images):
+                    self._parse_failures += len(pending)
+                    raise
+                failed = {zone_id: err for zone_id in zone_ids}
+                by_zone_id = {}
+
+            for zone_id, (image, _) in zone_ids.items():
+                if zone_id in failed:
+                    continue
+                element = by_zone_id.get(zone_id)
+                if element is None:
+                    failed[zone_id] = GeminiClientError(
+                        f"Batched response did not include zone {image.room_name}"
                     )
-                    raise GeminiClientError(
-                        f"Gemini API quota exceeded. Free-tier limit reached for model {GEMINI_MODEL}. "
-                        "Try again later or upgrade your API key."
+                    continue
+                try:
+                    result = self._validate_response(element)
+                except GeminiClientError as err:
+                    failed[zone_id] = err
+                    continue
+                if image.key in result_keys:
+                    self._result_cache.put(result_keys[image.key], result)
+                result["api_response_time"] = response_time
+                result["image_size"] = len(image.image_bytes)
+                results[image.key] = result
+
+            if not failed:
+                break
+            self._parse_failures += len(failed)
+            if attempt == PARSE_RETRIES:
+                for zone_id, err in failed.items():
+                    results[zone_ids[zone_id][0].key] = err
+                break
+            self._parse_retries += 1
+            pending = [zone_ids[zone_id] for zone_id in failed]
+            _LOGGER.warning(
+                "Unusable Gemini response for %s, retrying (%d/%d): %s",
+                ", ".join(image.room_name for image, _ in pending),
+                attempt + 1,
+                PARSE_RETRIES,
+                next(iter(failed.values())),
+            )
+
+        await self._async_delete_expired_files(session, timeout)
+        return results
+
+    def _build_batch_payload(
+        self, zone_ids: Dict[str, Tuple[BatchImage, Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """Build a batched request for the given zone ids, images and image parts."""
+        parts: List[Dict[str, Any]] = [{"text": self._build_batch_header(len(zone_ids))}]
+        for zone_id, (image, image_part) in zone_ids.items():
+            parts.append(
+                {
+                    "text": self._build_batch_section(
+                        zone_id, image.room_name, image.personality, image.pickiness
                     )
+                }
+            )
+            parts.append(image_part)
+        parts.append({"text": self._build_batch_footer(list(zone_ids))})
+
+        return {
+            "contents": [{"parts": parts}],
+            "generationConfig": {
+                "temperature": 0.4,
+                "topK": 32,
+                "topP": 1,
+                # Each zone needs roughly as much room as a single response
+                "maxOutputTokens": MAX_OUTPUT_TOKENS * len(zone_ids),
+                "responseMimeType": "application/json",
+                "responseSchema": {"type": "ARRAY", "items": BATCH_ITEM_SCHEMA},
+            },
+        }
+
+    def _parse_batch_response(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Decode a batched response into its elements keyed by zone id."""
+        parsed = self._parse_response_json(data)
+        if isinstance(parsed, dict):
+            # Tolerate a wrapper object such as {"zones": [...]}
+            parsed = next((value for value in parsed.values() if isinstance(value, list)), None)
+        if not isinstance(parsed, list):
+            raise GeminiClientError("Batched response must be a JSON array")
+
+        by_zone_id: Dict[str, Any] = {}
+        for element in parsed:
+            if isinstance(element, dict) and isinstance(element.get("zone"), str):
+                by_zone_id[element["zone"].strip()] = element
+        return by_zone_id
+
+    async def _async_digest(self, image_bytes: bytes) -> str | None:
+        """Return the image digest if a result cache or file store needs it."""
+        if self._result_cache is None and self._file_store is None:
+            return None
+        return await self._async_cpu(digest, image_bytes)
+
+    async def _async_cpu(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run CPU-bound func(*args) on the CPU executor (inline without one)."""
+        if self._executor is None:
+            return func(*args)
+        return await self._executor.async_run(func, *args)
+
+    async def _async_read_json(self, resp: aiohttp.ClientResponse) -> Any:
+        """Decode a JSON response body, off the event loop when it is large."""
+        text = await resp.text()
+        if len(text) < JSON_OFFLOAD_MIN_SIZE:
+            return json.loads(text)
+        return await self._async_cpu(json.loads, text)
+
+    def _json_payload(self, payload: Dict[str, Any]) -> JsonImagePayload:
+        """Return a request body whose images are encoded on the CPU executor."""
+        return JsonImagePayload(
+            payload, offload=self._executor.async_run if self._executor else None
+        )
+
+    async def _async_get_cached_result(
+        self, key: ResultKey, image_bytes: bytes, start_time: float
+    ) -> Dict[str, Any] | None:
+        """Return a cached analysis shaped like a fresh one, or None on a miss."""
+        result = await self._result_cache.async_get(key)
+        if result is None:
+            return None
+        result["cached"] = True
+        result["api_response_time"] = time.perf_counter() - start_time
+        result["image_size"] = len(image_bytes)
+        return result
+
+    async def _async_image_part(
+        self,
+        session: aiohttp.ClientSession,
+        image_bytes: bytes,
+        timeout: aiohttp.ClientTimeout | None,
+        image_digest: str | None = None,
+    ) -> Tuple[Dict[str, Any], FileKey | None]:
+        """Return the content part for an image and its file store key if uploaded."""
+        if self._file_store is None or not self._file_store.wants(image_bytes):
+            return _inline_part(image_bytes), None
+
+        key = (self._api_key, image_digest or await self._async_cpu(digest, image_bytes))
+        with span(SPAN_UPLOAD):
+            uploaded = await self._file_store.async_get_file(
+                key,
+                len(image_bytes),
+                lambda: self._async_upload_file(session, image_bytes, timeout),
+            )
+        if uploaded is None:
+            return _inline_part(image_bytes), None
+        return {"file_data": {"mime_type": uploaded.mime_type, "file_uri": uploaded.uri}}, key
+
+    async def _async_upload_file(
+        self,
+        session: aiohttp.ClientSession,
+        image_bytes: bytes,
+        timeout: aiohttp.ClientTimeout | None,
+    ) -> UploadedFile:
+        """Upload an image with the resumable media protocol, in chunks."""
+        size = len(image_bytes)
+        headers, _ = await self._async_file_request(
+            session,
+            "POST",
+            f"{self._upload_base}/files",
+            timeout,
+            headers={
+                "X-Goog-Upload-Protocol": "resumable",
+                "X-Goog-Upload-Command": "start",
+                "X-Goog-Upload-Header-Content-Length": str(size),
+                "X-Goog-Upload-Header-Content-Type": "image/jpeg",
+            },
+            json={"file": {"display_name": "cleanme-snapshot"}},
+        )
+        upload_url = headers.get("X-Goog-Upload-URL")
+        if not upload_url:
+            raise FileUploadError("File API did not return an upload URL")
+
+        view = memoryview(image_bytes)
+        offset = 0
+        resumed = False
+        while True:
+            chunk = view[offset:offset + UPLOAD_CHUNK_SIZE]
+            last = offset + len(chunk) >= size
+            try:
+                _, data = await self._async_file_request(
+                    session,
+                    "POST",
+                    upload_url,
+                    timeout,
+                    headers={
+                        "X-Goog-Upload-Offset": str(offset),
+                        "X-Goog-Upload-Command": "upload, finalize" if last else "upload",
+                    },
+                    data=chunk,
+                )
+            except FileUploadError as err:
+                # Resume once after a dropped connection from what the server received
+                if err.status is not None or resumed:
+                    raise
+                resumed = True
+                headers, _ = await self._async_file_request(
+                    session, "POST", upload_url, timeout, headers={"X-Goog-Upload-Command": "query"}
+                )
+                offset = int(headers.get("X-Goog-Upload-Size-Received", offset))
+                continue
+            if last:
+                break
+            offset += len(chunk)
+
+        file = data.get("file") or {}
+        if not file.get("name") or not file.get("uri"):
+            raise FileUploadError("File API response has no file name or URI")
+        return UploadedFile(
+            name=file["name"],
+            uri=file["uri"],
+            mime_type=file.get("mimeType", "image/jpeg"),
+            api_key=self._api_key,
+        )
+
+    async def _async_delete_expired_files(
+        self, session: aiohttp.ClientSession, timeout: aiohttp.ClientTimeout | None
+    ) -> None:
+        """Delete uploads past their TTL from Gemini."""
+        if self._file_store is None:
+            return
+        for uploaded in self._file_store.pop_expired():
+            await self._async_delete_file(session, uploaded, timeout)
+
+    def _forget_upload(
+        self,
+        session: aiohttp.ClientSession,
+        key: FileKey,
+        timeout: aiohttp.ClientTimeout | None,
+    ) -> None:
+        """Stop reusing an upload Gemini rejected, and delete it without waiting."""
+        uploaded = self._file_store.invalidate(key)
+        if uploaded is None:
+            return
+        # Best effort: Gemini may have dropped the file already
+        task = asyncio.get_running_loop().create_task(
+            self._async_delete_file(session, uploaded, timeout)
+        )
+        self._delete_tasks.add(task)
+        task.add_done_callback(self._delete_tasks.discard)
+
+    async def _async_delete_file(
+        self,
+        session: aiohttp.ClientSession,
+        uploaded: UploadedFile,
+        timeout: aiohttp.ClientTimeout | None,
+    ) -> None:
+        """Delete an uploaded file from Gemini, logging rather than raising failures."""
+        try:
+            await self._async_file_request(
+                session,
+                "DELETE",
+                f"{self._api_base}/{uploaded.name}",
+                timeout,
+                api_key=uploaded.api_key,
+            )
+        except FileUploadError as err:
+            _LOGGER.debug("Failed to delete uploaded file %s: %s", uploaded.name, err)
+        else:
+            self._file_store.record_delete()
+
+    async def _async_file_request(
+        self,
+        session: aiohttp.ClientSession,
+        method: str,
+        url: str,
+        timeout: aiohttp.ClientTimeout | None,
+        headers: Dict[str, str] | None = None,
+        api_key: str | None = None,
+        **kwargs: Any,
+    ) -> Tuple[Mapping[str, str], Dict[str, Any]]:
+        """Send a File API request and return its response headers and JSON body."""
+        try:
+            async with session.request(
+                method,
+                url,
+                headers={"x-goog-api-key": api_key or self._api_key, **(headers or {})},
+                timeout=timeout or DEFAULT_REQUEST_TIMEOUT,
+                **kwargs,
+            ) as resp:
                 if resp.status != 200:
                     text = await resp.text()
-                    raise GeminiClientError(f"Gemini API HTTP {resp.status}: {text}")
+                    raise FileUploadError(f"File API HTTP {resp.status}: {text[:500]}", resp.status)
+                text = await resp.text()
+                # Headers stay case-insensitive; Google varies X-Goog-* casing
+                return resp.headers, json.loads(text) if text.strip() else {}
+        except FileUploadError:
+            raise
+        except Exception as err:
+            raise FileUploadError(f"File API request failed: {err}") from err
+
+    async def _async_generate_content(
+        self,
+        session: aiohttp.ClientSession,
+        payload: Dict[str, Any],
+        timeout: aiohttp.ClientTimeout | None,
+    ) -> Dict[str, Any]:
+        """POST a generateContent request and return the decoded JSON body."""
+        url = f"{self._api_base}/models/{GEMINI_MODEL}:generateContent"
+        with span(SPAN_ENCODE):
+            body = self._json_payload(payload)
+
+        request_started()
+        try:
+            start = time.perf_counter()
+            async with session.post(
+                url,
+                headers=self._json_headers(),
+                data=body,
+                timeout=timeout or DEFAULT_REQUEST_TIMEOUT,
+            ) as resp:
+                record_request(start)
+                if self._budget is not None:
+                    self._budget.count_request(resp.status)
+                await self._async_raise_for_status(resp)
+                with span(SPAN_RECEIVE):
+                    return await self._async_read_json(resp)
+        except GeminiClientError:
+            raise
+        except aiohttp.ClientError as err:
+            raise GeminiClientError(f"Network error calling Gemini API: {err}") from err
+        except Exception as err:
+            raise GeminiClientError(f"Unexpected error calling Gemini API: {err}") from err
+
+    async def _async_stream_generate_content(
+        self,
+        session: aiohttp.ClientSession,
+        payload: Dict[str, Any],
+        timeout: aiohttp.ClientTimeout | None,
+        on_partial: PartialCallback,
+    ) -> Dict[str, Any]:
+        """Stream a streamGenerateContent (SSE) request.
+
+        The reply text is scanned as it arrives and on_partial is called once
+        with tidy and severity as soon as both are complete. Returns a body
+        shaped like a generateContent response holding the full text.
+        """
+        url = f"{self._api_base}/models/{GEMINI_MODEL}:streamGenerateContent"
+
+        extractor = IncrementalJSONExtractor()
+        text_chunks: List[str] = []
+        published = False
+        with span(SPAN_ENCODE):
+            body = self._json_payload(payload)
 
-                data = await resp.json()
+        request_started()
+        try:
+            start = time.perf_counter()
+            async with session.post(
+                url,
+                params={"alt": "sse"},
+                headers=self._json_headers(),
+                data=body,
+                timeout=timeout or DEFAULT_REQUEST_TIMEOUT,
+            ) as resp:
+                record_request(start)
+                if self._budget is not None:
+                    self._budget.count_request(resp.status)
+                await self._async_raise_for_status(resp)
+
+                with span(SPAN_RECEIVE):
+                    async for raw_line in resp.content:
+                        line = raw_line.decode("utf-8").strip()
+                        if not line.startswith("data:"):
+                            continue
+
+                        chunk = json.loads(line[5:])
+                        candidates = chunk.get("candidates") or [{}]
+                        for part in candidates[0].get("content", {}).get("parts", []):
+                            if "text" in part:
+                                text_chunks.append(part["text"])
+                                extractor.feed(part["text"])
+
+                        if not published:
+                            published = self._publish_partial(extractor.fields, on_partial)
+        except GeminiClientError:
+            raise
         except aiohttp.ClientError as err:
             raise GeminiClientError(f"Network error calling Gemini API: {err}") from err
         except Exception as err:
             raise GeminiClientError(f"Unexpected error calling Gemini API: {err}") from err
 
-        response_time = time.time() - start_time
+        return {"candidates": [{"content": {"parts": [{"text": "".join(text_chunks)}]}}]}
+
+    @staticmethod
+    def _publish_partial(fields: Dict[str, Any], on_partial: PartialCallback) -> bool:
+        """Call on_partial once tidy and severity are valid. Returns True if called."""
+        tidy = fields.get("tidy")
+        severity = fields.get("severity")
+        if not isinstance(tidy, bool) or severity not in ("low", "medium", "high"):
+            return False
+        try:
+            on_partial({"tidy": tidy, "severity": severity})
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error publishing partial Gemini result")
+        return True
+
+    def _json_headers(self) -> Dict[str, str]:
+        """Return headers for JSON requests to the Gemini API."""
+        return {
+            "Content-Type": "application/json",
+            "x-goog-api-key": self._api_key,
+        }
 
-        # Parse Gemini response
+    @staticmethod
+    async def _async_raise_for_status(resp: aiohttp.ClientResponse) -> None:
+        """Raise GeminiClientError for non-200 responses."""
+        if resp.status == 429:
+            text = await resp.text()
+            _LOGGER.warning(
+                "Gemini API quota exceeded (429). This usually means your free-tier "
+                "quota is exhausted. Model: %s. Response: %s",
+                GEMINI_MODEL,
+                text[:500],
+            )
+            raise GeminiClientError(
+                f"Gemini API quota exceeded. Free-tier limit reached for model {GEMINI_MODEL}. "
+                "Try again later or upgrade your API key.",
+                resp.status,
+            )
+        if resp.status != 200:
+            text = await resp.text()
+            raise GeminiClientError(f"Gemini API HTTP {resp.status}: {text}", resp.status)
+
+    @staticmethod
+    def _parse_response_json(data: Dict[str, Any]) -> Any:
+        """Extract and decode the JSON text block from a Gemini response."""
         try:
             candidates = data.get("candidates", [])
             if not candidates:
@@ -126,28 +802,17 @@ class GeminiClient:
             if not text_block:
                 raise ValueError("No text content in response")
 
-            # Extract JSON from response (handle markdown code blocks)
-            text_block = text_block.strip()
-            if text_block.startswith("```json"):
-                text_block = text_block[7:]
-            if text_block.startswith("```"):
-                text_block = text_block[3:]
-            if text_block.endswith("```"):
-                text_block = text_block[:-3]
-
-            parsed = json.loads(text_block.strip())
+            try:
+                return json.loads(text_block)
+            except ValueError:
+                # Fall back to scanning for JSON inside fences, prose or a truncated reply
+                _LOGGER.debug("Gemini response is not plain JSON, extracting: %s", text_block[:200])
+                return extract_json(text_block)
 
         except Exception as err:
             _LOGGER.error("Failed to parse Gemini response: %s", data)
             raise GeminiClientError(f"Malformed Gemini response: {err}") from err
 
-        # Validate and normalize response
-        result = self._validate_response(parsed)
-        result["api_response_time"] = response_time
-        result["image_size"] = len(image_bytes)
-
-        return result
-
     def _build_prompt(self, room_name: str, personality: str, pickiness: int) -> str:
         """Build the analysis prompt with personality and pickiness instructions."""
         # Use friendly as default fallback - guaranteed to exist in AI_PERSONALITIES
@@ -176,6 +841,51 @@ IMPORTANT:
 - If you see specific items (red shirt on floor, pizza box, dirty dishes), mention them BY NAME.
 - The "comment" MUST be 2 sentences MAX and under 200 characters total. Be punchy, not verbose!
 - Stay fully in character - this is the main thing the user sees!
+Do not include any markdown formatting, just raw JSON."""
+
+    @staticmethod
+    def _build_batch_header(count: int) -> str:
+        """Build the introduction for a multi-image batched prompt."""
+        return f"""You will analyze {count} photos of different rooms in someone's home.
+Each photo is preceded by its own section with a zone id, the room name, the
+character you must play and the pickiness level for that room. Judge each
+photo ONLY by its own section's instructions and stay in that section's
+character for its comment."""
+
+    def _build_batch_section(
+        self, zone_id: str, room_name: str, personality: str, pickiness: int
+    ) -> str:
+        """Build the per-zone section of a batched prompt."""
+        default_personality = AI_PERSONALITIES.get("friendly", list(AI_PERSONALITIES.values())[0])
+        personality_config = AI_PERSONALITIES.get(personality, default_personality)
+        pickiness_instructions = self._get_pickiness_instructions(pickiness)
+
+        return f"""=== Zone {zone_id}: "{room_name}" ===
+Character for this zone:
+{personality_config["system_prompt"]}
+
+Pickiness level: {pickiness}/5
+{pickiness_instructions}
+
+The next image is the "{room_name}" (zone {zone_id})."""
+
+    @staticmethod
+    def _build_batch_footer(zone_ids: List[str]) -> str:
+        """Build the response format instructions for a batched prompt."""
+        return f"""Respond with a JSON array containing exactly one object per zone ({", ".join(zone_ids)}):
+[
+    {{
+        "zone": "{zone_ids[0]}",
+        "tidy": true/false,
+        "tasks": ["specific task 1", "specific task 2"],
+        "comment": "in-character comment for this zone (2 sentences MAX, under 200 chars)",
+        "severity": "low/medium/high"
+    }}
+]
+
+IMPORTANT:
+- Be specific about what you see in each photo. Don't mix up rooms.
+- Each "comment" MUST be 2 sentences MAX and under 200 characters total. Be punchy, not verbose!
 Do not include any markdown formatting, just raw JSON."""
 
     def _get_pickiness_instructions(self, pickiness: int) -> str:
@@ -230,7 +940,7 @@ Do not include any markdown formatting, just raw JSON."""
 
     async def validate_api_key(self, session: aiohttp.ClientSession) -> bool:
         """Validate that the API key works."""
-        url = f"{GEMINI_API_BASE}/models/{GEMINI_MODEL}"
+        url = f"{self._api_base}/models/{GEMINI_MODEL}"
 
         headers = {
             "x-goog-api-key": self._api_key,
@@ -0,0 +1,216 @@
+"""Cheap image heuristics used to skip unnecessary analysis calls.
+
+A fingerprint is a small grayscale thumbnail of a snapshot plus its edge
+density (clutter shows up as many small edges). Comparing a new snapshot
+against the last frame that was judged tidy tells us whether anything in
+the room has visibly changed, in a few milliseconds on the CPU.
+
+Regions of interest let one camera frame feed several zones: each zone
+names the part of the frame it covers, and crop_regions() decodes the
+frame once and cuts out every region.
+
+Burst captures are ranked by score_frames(): sharpness (variance of the
+Laplacian), exposure (not too dark or bright, few clipped pixels) and motion
+(difference from the per-pixel median of the burst, which is what a person
+walking through or an IR switchover looks like).
+
+Pillow and NumPy are optional; callers check PIL_AVAILABLE before
+fingerprinting or cropping and SCORING_AVAILABLE before scoring. This
+module has no Home Assistant dependencies.
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import math
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+try:
+    from PIL import Image, ImageChops, ImageDraw, ImageFilter, ImageStat
+
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+try:
+    import numpy as np
+
+    SCORING_AVAILABLE = PIL_AVAILABLE
+except ImportError:
+    SCORING_AVAILABLE = False
+
+THUMBNAIL_SIZE = (96, 72)
+
+# Frames are scored at this size; big enough to see blur, cheap to decode
+SCORING_SIZE = (320, 240)
+# Pixels this close to black or white count as clipped
+CLIPPED_MARGIN = 8
+# Mean brightness (0..1) this close to black or white lowers the exposure score
+EXPOSURE_MARGIN = 0.2
+# Mean difference from the burst median (0..1) that zeroes a frame's score
+MOTION_LIMIT = 0.25
+
+# Crops are analyzed, not viewed, so a little compression is free
+CROP_JPEG_QUALITY = 90
+
+# Fill for the parts of a polygon's bounding box outside the polygon
+CROP_BACKGROUND = (128, 128, 128)
+
+# Points as fractions of the frame width/height; two points are opposite
+# corners of a rectangle, three or more outline a polygon
+Roi = Tuple[Tuple[float, float], ...]
+
+
+@dataclass(frozen=True)
+class FrameScore:
+    """Quality of one frame of a burst; higher score is better."""
+
+    sharpness: float  # relative to the sharpest frame of the burst (0..1)
+    exposure: float  # 0..1
+    motion: float  # mean difference from the burst median (0..1)
+    score: float
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """Downscaled grayscale view of a snapshot."""
+
+    size: tuple[int, int]
+    pixels: bytes
+    edge_density: float
+
+
+def digest(image_bytes: bytes) -> str:
+    """Return a digest identifying an exact snapshot (not a similar one)."""
+    return hashlib.sha1(image_bytes, usedforsecurity=False).hexdigest()
+
+
+def fingerprint(image_bytes: bytes) -> Fingerprint:
+    """Return the fingerprint of a JPEG/PNG snapshot. CPU-bound."""
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        # draft() lets the JPEG decoder skip most of the work for small targets
+        image.draft("L", (THUMBNAIL_SIZE[0] * 2, THUMBNAIL_SIZE[1] * 2))
+        gray = image.convert("L").resize(THUMBNAIL_SIZE, Image.BILINEAR)
+
+    edges = gray.filter(ImageFilter.FIND_EDGES).point(lambda value: 255 if value > 48 else 0)
+    edge_density = ImageStat.Stat(edges).mean[0] / 255.0
+    return Fingerprint(size=gray.size, pixels=gray.tobytes(), edge_density=edge_density)
+
+
+def difference(first: Fingerprint, second: Fingerprint) -> float:
+    """Return the mean absolute pixel difference between two fingerprints (0..1)."""
+    if first.size != second.size:
+        return 1.0
+    diff = ImageChops.difference(
+        Image.frombytes("L", first.size, first.pixels),
+        Image.frombytes("L", second.size, second.pixels),
+    )
+    return ImageStat.Stat(diff).mean[0] / 255.0
+
+
+def parse_roi(text: str | None) -> Roi | None:
+    """Parse "x,y; x,y; ..." in percent of the frame. Empty means the whole frame.
+
+    Raises ValueError if the points are malformed, out of range or enclose
+    no area.
+    """
+    if not text or not text.strip():
+        return None
+
+    points = []
+    for point in text.replace("\n", ";").split(";"):
+        if not point.strip():
+            continue
+        coords = point.split(",")
+        if len(coords) != 2:
+            raise ValueError(f"Expected 'x,y' but got '{point.strip()}'")
+        x, y = (float(coord) for coord in coords)
+        if not (0 <= x <= 100 and 0 <= y <= 100):
+            raise ValueError(f"Point '{point.strip()}' is outside 0-100%")
+        points.append((x / 100, y / 100))
+
+    if len(points) < 2:
+        raise ValueError("A region needs two corners or at least three polygon points")
+    xs, ys = [x for x, _ in points], [y for _, y in points]
+    if min(xs) == max(xs) or min(ys) == max(ys):
+        raise ValueError("The region encloses no area")
+    return tuple(points)
+
+
+def _bounding_box(roi: Roi, width: int, height: int) -> Tuple[int, int, int, int]:
+    xs, ys = [x for x, _ in roi], [y for _, y in roi]
+    left, top = math.floor(min(xs) * width), math.floor(min(ys) * height)
+    right, bottom = math.ceil(max(xs) * width), math.ceil(max(ys) * height)
+    # At least one pixel, even for a sliver on a tiny frame
+    return left, top, max(right, left + 1), max(bottom, top + 1)
+
+
+def crop_regions(image_bytes: bytes, rois: Sequence[Roi]) -> List[bytes]:
+    """Decode a snapshot once and return a JPEG per region, in order. CPU-bound."""
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        frame = image.convert("RGB")
+
+    width, height = frame.size
+    crops = []
+    for roi in rois:
+        box = _bounding_box(roi, width, height)
+        region = frame.crop(box)
+        if len(roi) > 2:
+            # Blank everything outside the polygon so only the zone is judged
+            mask = Image.new("L", region.size, 0)
+            ImageDraw.Draw(mask).polygon(
+                [(x * width - box[0], y * height - box[1]) for x, y in roi], fill=255
+            )
+            region = Image.composite(region, Image.new("RGB", region.size, CROP_BACKGROUND), mask)
+        buffer = io.BytesIO()
+        region.save(buffer, format="JPEG", quality=CROP_JPEG_QUALITY)
+        crops.append(buffer.getvalue())
+    return crops
+
+
+def score_frames(frames: Sequence[bytes]) -> List[FrameScore]:
+    """Score each frame of a burst, in order. CPU-bound."""
+    gray = []
+    for image_bytes in frames:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            image.draft("L", SCORING_SIZE)
+            gray.append(
+                np.asarray(image.convert("L").resize(SCORING_SIZE, Image.BILINEAR), dtype=np.float32)
+            )
+    stack = np.stack(gray)
+
+    # 4-neighbour Laplacian of every frame at once
+    centre = stack[:, 1:-1, 1:-1]
+    laplacian = (
+        4 * centre
+        - stack[:, :-2, 1:-1]
+        - stack[:, 2:, 1:-1]
+        - stack[:, 1:-1, :-2]
+        - stack[:, 1:-1, 2:]
+    )
+    sharpness = laplacian.reshape(len(frames), -1).var(axis=1)
+    sharpness = sharpness / sharpness.max() if sharpness.max() > 0 else np.ones_like(sharpness)
+
+    pixels = stack.reshape(len(frames), -1)
+    brightness = pixels.mean(axis=1) / 255
+    clipped = ((pixels < CLIPPED_MARGIN) | (pixels > 255 - CLIPPED_MARGIN)).mean(axis=1)
+    exposure = (
+        np.clip(brightness / EXPOSURE_MARGIN, 0, 1)
+        * np.clip((1 - brightness) / EXPOSURE_MARGIN, 0, 1)
+        * (1 - clipped)
+    )
+
+    motion = np.abs(stack - np.median(stack, axis=0)).reshape(len(frames), -1).mean(axis=1) / 255
+    steadiness = np.clip(1 - motion / MOTION_LIMIT, 0, 1)
+
+    score = sharpness * exposure * steadiness
+    return [
+        FrameScore(
+            sharpness=float(sharpness[index]),
+            exposure=float(exposure[index]),
+            motion=float(motion[index]),
+            score=float(score[index]),
+        )
+        for index in range(len(frames))
+    ]
@@ -0,0 +1,214 @@
+"""Tolerant, incremental JSON extraction for model output.
+
+Gemini normally returns clean JSON when structured output is requested,
+but replies can still arrive wrapped in markdown fences, preceded by
+prose, or cut off by the output token limit. IncrementalJSONExtractor
+scans text as it arrives (whole or in streamed chunks) and:
+
+- finds the first top-level JSON object or array, ignoring anything around it,
+- records each top-level object member as soon as its value is complete,
+  so callers can act on early fields before the reply finishes,
+- salvages truncated replies by closing open strings and brackets.
+
+This module has no Home Assistant dependencies.
+"""
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, List
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+_MISSING = object()
+
+
+class IncrementalJSONExtractor:
+    """Scan model output for the first top-level JSON value."""
+
+    def __init__(self) -> None:
+        """Initialize an empty extractor."""
+        self._buf = ""
+        self._pos = 0
+        self._start: int | None = None
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+
+        # Top-level object member tracking
+        self._key_start: int | None = None
+        self._key: str | None = None
+        self._value_start: int | None = None
+
+        self._fields: Dict[str, Any] = {}
+        self._result: Any = _MISSING
+
+    @property
+    def complete(self) -> bool:
+        """Return True once a full top-level value has been parsed."""
+        return self._result is not _MISSING
+
+    @property
+    def fields(self) -> Dict[str, Any]:
+        """Return top-level object members whose values are complete so far."""
+        return dict(self._fields)
+
+    def feed(self, text: str) -> None:
+        """Append text and advance the scanner."""
+        if self.complete or not text:
+            return
+        self._buf += text
+        self._scan()
+
+    def result(self) -> Any:
+        """Return the complete value, salvaging a truncated one if needed.
+
+        Raises ValueError if no JSON value can be recovered.
+        """
+        if self.complete:
+            return self._result
+        if self._start is None:
+            raise ValueError("No JSON object found in response")
+
+        repaired = self._repair()
+        if repaired is not _MISSING:
+            return repaired
+        if self._stack[:1] == ["}"] and self._fields:
+            return self.fields
+        raise ValueError("Incomplete JSON in response")
+
+    def _scan(self) -> None:
+        buf = self._buf
+        while self._pos < len(buf) and not self.complete:
+            char = buf[self._pos]
+
+            if self._start is None:
+                if char in "{[":
+                    self._begin(self._pos, char)
+                self._pos += 1
+                continue
+
+            depth = len(self._stack)
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if depth == 1 and self._key_start is not None:
+                        self._key = self._loads(buf[self._key_start:self._pos + 1], None)
+                        self._key_start = None
+                self._pos += 1
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if depth == 1 and self._stack[0] == "}":
+                    if self._key is None and self._value_start is None:
+                        self._key_start = self._pos
+                    elif self._value_start is None:
+                        self._value_start = self._pos
+            elif char in "{[":
+                if depth == 1 and self._key is not None and self._value_start is None:
+                    self._value_start = self._pos
+                self._stack.append("}" if char == "{" else "]")
+            elif char in "}]":
+                if not self._stack or char != self._stack[-1]:
+                    # Mismatched bracket - give up on this candidate
+                    self._restart()
+                    continue
+                if depth == 1:
+                    self._end_member(self._pos)
+                self._stack.pop()
+                if not self._stack:
+                    # Either completes the scan or restarts at the next candidate
+                    self._finish(self._pos + 1)
+                    continue
+            elif char == "," and depth == 1:
+                self._end_member(self._pos)
+            elif (
+                depth == 1
+                and self._key is not None
+                and self._value_start is None
+                and not char.isspace()
+                and char != ":"
+            ):
+                # Start of a bare literal (number, true, false, null)
+                self._value_start = self._pos
+
+            self._pos += 1
+
+    def _begin(self, index: int, char: str) -> None:
+        self._start = index
+        self._stack = ["}" if char == "{" else "]"]
+        self._in_string = False
+        self._escape = False
+        self._key_start = None
+        self._key = None
+        self._value_start = None
+        self._fields = {}
+
+    def _restart(self) -> None:
+        """Discard the current candidate and look for the next one."""
+        restart_at = (self._start or 0) + 1
+        self._start = None
+        self._stack = []
+        self._fields = {}
+        self._key = None
+        self._key_start = None
+        self._value_start = None
+        self._in_string = False
+        self._escape = False
+        self._pos = restart_at
+
+    def _end_member(self, end: int) -> None:
+        """Record a completed top-level object member ending before end."""
+        if self._stack[:1] == ["}"] and self._key is not None and self._value_start is not None:
+            value = self._loads(self._buf[self._value_start:end], _MISSING)
+            if value is not _MISSING:
+                self._fields[self._key] = value
+        self._key = None
+        self._value_start = None
+
+    def _finish(self, end: int) -> None:
+        text = self._buf[self._start:end]
+        value = self._loads(text, _MISSING)
+        if value is _MISSING:
+            value = self._loads(_TRAILING_COMMA.sub(r"\1", text), _MISSING)
+        if value is _MISSING:
+            self._restart()
+            return
+        self._result = value
+        if isinstance(value, dict):
+            self._fields = dict(value)
+
+    def _repair(self) -> Any:
+        """Try to close a truncated value."""
+        text = self._buf[self._start:].rstrip()
+        if self._in_string:
+            if self._escape:
+                text = text[:-1]
+            text += '"'
+        text = text.rstrip().rstrip(",:").rstrip()
+        candidate = text + "".join(reversed(self._stack))
+        value = self._loads(_TRAILING_COMMA.sub(r"\1", candidate), _MISSING)
+        return value
+
+    @staticmethod
+    def _loads(text: str, default: Any) -> Any:
+        try:
+            return json.loads(text)
+        except ValueError:
+            return default
+
+
+def extract_json(text: str) -> Any:
+    """Return the first JSON value in text, tolerating fences and truncation.
+
+    Raises ValueError if nothing can be recovered.
+    """
+    extractor = IncrementalJSONExtractor()
+    extractor.feed(text)
+    return extractor.result()
@@ -0,0 +1,164 @@
+"""Offline vision backend running a small ONNX classifier on the CPU.
+
+The model only answers "how messy is this room?" - it produces tidy and
+severity but no itemised task list, which keeps it small enough to run
+on a Raspberry Pi in well under a second with no network access. Messy
+rooms get one generic task and a messiness score derived from the class.
+
+Model contract:
+- input: float32 tensor shaped (1, 3, H, W), RGB, ImageNet-normalized
+- output: logits or probabilities for the classes in MODEL_CLASSES
+
+numpy, Pillow and onnxruntime are optional dependencies; the backend
+reports a clear error when they are missing.
+"""
+from __future__ import annotations
+
+import io
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+
+from .executor import async_get_cpu_executor
+from .gemini_client import GeminiClientError, PartialCallback
+from .timing import SPAN_INFERENCE, span
+
+_LOGGER = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+    import onnxruntime
+    from PIL import Image
+
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
+MODEL_CLASSES = ("tidy", "low", "medium", "high")
+# Messiness score per class, on the 0-100 scale task-based scores use
+CLASS_MESSINESS = {"tidy": 0, "low": 30, "medium": 60, "high": 90}
+
+DEFAULT_INPUT_SIZE = 224
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+
+
+class LocalModelError(GeminiClientError):
+    """Raised when the local model cannot run."""
+
+
+class LocalOnnxBackend:
+    """Classify room tidiness locally with an ONNX model."""
+
+    def __init__(self, hass: HomeAssistant, model_path: str) -> None:
+        """Initialize the backend; the model is loaded on first use."""
+        self.hass = hass
+        self._model_path = model_path
+        self._session: Any = None
+        self._load_lock = threading.Lock()
+
+        self._inferences = 0
+        self._inference_time = 0.0
+
+    @property
+    def model_path(self) -> str:
+        return self._model_path
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return inference counters."""
+        return {
+            "inferences": self._inferences,
+            "avg_inference_ms": round(1000 * self._inference_time / self._inferences, 1)
+            if self._inferences
+            else 0.0,
+        }
+
+    async def analyze_image(
+        self,
+        session: aiohttp.ClientSession,
+        image_bytes: bytes,
+        room_name: str,
+        personality: str,
+        pickiness: int,
+        timeout: aiohttp.ClientTimeout | None = None,
+        on_partial: PartialCallback | None = None,
+    ) -> Dict[str, Any]:
+        """Classify the image; session, personality and timeout are unused."""
+        if not ONNX_AVAILABLE:
+            raise LocalModelError(
+                "Local backend requires numpy, Pillow and onnxruntime to be installed"
+            )
+
+        start_time = time.perf_counter()
+        with span(SPAN_INFERENCE):
+            executor = async_get_cpu_executor(self.hass)
+            label, confidence = await executor.async_run(self.classify, image_bytes)
+        response_time = time.perf_counter() - start_time
+
+        self._inferences += 1
+        self._inference_time += response_time
+
+        tidy = label == "tidy"
+        return {
+            "tidy": tidy,
+            "tasks": [] if tidy else [f"Tidy up the {room_name}"],
+            "comment": f"Local check: {'tidy' if tidy else f'{label} mess'} ({confidence:.0%} confident).",
+            "severity": "low" if tidy else label,
+            "confidence": confidence,
+            "messiness_score": CLASS_MESSINESS[label],
+            "api_response_time": response_time,
+            "image_size": len(image_bytes),
+        }
+
+    def classify(self, image_bytes: bytes) -> tuple[str, float]:
+        """Return (class label, confidence) for an image. Runs on the CPU executor."""
+        session = self._get_session()
+        model_input = session.get_inputs()[0]
+
+        height, width = DEFAULT_INPUT_SIZE, DEFAULT_INPUT_SIZE
+        shape = model_input.shape
+        if len(shape) == 4 and isinstance(shape[2], int) and isinstance(shape[3], int):
+            height, width = shape[2], shape[3]
+
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            rgb = image.convert("RGB").resize((width, height), Image.BILINEAR)
+        pixels = np.asarray(rgb, dtype=np.float32) / 255.0
+        pixels = (pixels - np.array(IMAGENET_MEAN, dtype=np.float32)) / np.array(
+            IMAGENET_STD, dtype=np.float32
+        )
+        tensor = np.ascontiguousarray(pixels.transpose(2, 0, 1)[np.newaxis, ...])
+
+        outputs = session.run(None, {model_input.name: tensor})
+        scores = np.asarray(outputs[0], dtype=np.float32).reshape(-1)[: len(MODEL_CLASSES)]
+        if scores.min() < 0 or not np.isclose(scores.sum(), 1.0, atol=1e-3):
+            # Logits - convert to probabilities
+            exp = np.exp(scores - scores.max())
+            scores = exp / exp.sum()
+
+        index = int(scores.argmax())
+        return MODEL_CLASSES[index], float(scores[index])
+
+    def _get_session(self) -> Any:
+        """Load the ONNX session once, in a thread-safe way."""
+        if self._session is not None:
+            return self._session
+        with self._load_lock:
+            if self._session is None:
+                if not os.path.isfile(self._model_path):
+                    raise LocalModelError(f"Local model not found at {self._model_path}")
+                options = onnxruntime.SessionOptions()
+                options.intra_op_num_threads = 2
+                self._session = onnxruntime.InferenceSession(
+                    self._model_path,
+                    sess_options=options,
+                    providers=["CPUExecutionProvider"],
+                )
+                _LOGGER.info("Loaded local CleanMe model from %s", self._model_path)
+        return self._session
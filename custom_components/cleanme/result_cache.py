@@ -0,0 +1,163 @@
+"""Reuse analysis results for byte-identical snapshots.
+
+Offline cameras keep returning the same placeholder image, and a camera
+shared by several zones or automations is often snapshotted again before
+anything has changed. The result cache maps (image digest, room name,
+personality, pickiness, model) to the last validated analysis, so those
+checks return immediately without a Gemini request.
+
+Entries are evicted least-recently-used beyond a size bound and expire
+after a TTL. With persistence enabled the cache is also kept in a Home
+Assistant Store, so hits survive restarts; writes are batched.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import logging
+import time
+from typing import Any, Dict, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    CONF_RESULT_CACHE_SIZE,
+    CONF_RESULT_CACHE_TTL,
+    CONF_RESULT_CACHE_PERSIST,
+    DEFAULT_RESULT_CACHE_SIZE,
+    DEFAULT_RESULT_CACHE_TTL,
+    RESULT_CACHE_SAVE_DELAY,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from .settings import get_settings
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_RESULT_CACHE = "result_cache"
+
+# (image digest, room name, personality, pickiness, model)
+ResultKey = Tuple[str, str, str, int, str]
+
+# Only the analysis itself is cached; timings belong to the original request
+_CACHED_FIELDS = ("tidy", "tasks", "comment", "severity")
+
+
+class ResultCache:
+    """LRU/TTL cache of validated analyses, optionally persisted."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_RESULT_CACHE_SIZE,
+        ttl_seconds: int = DEFAULT_RESULT_CACHE_TTL,
+        store: Store | None = None,
+    ) -> None:
+        """Initialize the result cache."""
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._store = store
+        self._load_lock = asyncio.Lock()
+        self._loaded = store is None
+        # key -> (expiry as wall-clock time so it survives restarts, result)
+        self._entries: OrderedDict[ResultKey, Tuple[float, Dict[str, Any]]] = OrderedDict()
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return cache counters."""
+        lookups = self._hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self._max_entries,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_ratio": round(self._hits / lookups, 3) if lookups else 0.0,
+            "persistent": self._store is not None,
+        }
+
+    async def async_get(self, key: ResultKey) -> Dict[str, Any] | None:
+        """Return a copy of the cached result for key, or None."""
+        await self._async_ensure_loaded()
+
+        cached = self._entries.get(key)
+        if cached is None or time.time() >= cached[0]:
+            if cached is not None:
+                del self._entries[key]
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._hits += 1
+        result = cached[1]
+        return {**result, "tasks": list(result["tasks"])}
+
+    @callback
+    def put(self, key: ResultKey, result: Dict[str, Any]) -> None:
+        """Cache the analysis fields of a validated result."""
+        self._entries[key] = (
+            time.time() + self._ttl,
+            {field: result[field] for field in _CACHED_FIELDS if field in result},
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+        self._schedule_save()
+
+    async def _async_ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        async with self._load_lock:
+            if self._loaded:
+                return
+            data = await self._store.async_load() or {}
+            now = time.time()
+            for key, expires_at, result in data.get("entries", []):
+                if expires_at > now:
+                    self._entries[tuple(key)] = (expires_at, result)
+            # The size bound may have been lowered since the last save
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+            self._loaded = True
+            _LOGGER.debug("Loaded %d cached results", len(self._entries))
+
+    @callback
+    def _schedule_save(self) -> None:
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, RESULT_CACHE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> Dict[str, Any]:
+        now = time.time()
+        return {
+            "entries": [
+                [list(key), expires_at, result]
+                for key, (expires_at, result) in self._entries.items()
+                if expires_at > now
+            ]
+        }
+
+
+@callback
+def async_get_result_cache(hass: HomeAssistant) -> ResultCache:
+    """Return the shared result cache, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    cache: ResultCache | None = domain_data.get(DATA_RESULT_CACHE)
+    if cache is None:
+        settings = get_settings(hass)
+        store = (
+            Store(hass, STORAGE_VERSION, f"{STORAGE_KEY}.result_cache")
+            if settings[CONF_RESULT_CACHE_PERSIST]
+            else None
+        )
+        cache = ResultCache(
+            settings[CONF_RESULT_CACHE_SIZE], settings[CONF_RESULT_CACHE_TTL], store
+        )
+        domain_data[DATA_RESULT_CACHE] = cache
+    return cache
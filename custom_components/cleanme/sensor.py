@@ -3,7 +3,7 @@ from __future__ import annotations
 import logging
 from typing import Any, Dict, Callable
 
-from homeassistant.components.sensor import SensorEntity, SensorDeviceClass
+from homeassistant.components.sensor import SensorEntity, SensorDeviceClass, SensorStateClass
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.device_registry import DeviceInfo
@@ -19,6 +19,10 @@ from .const import (
     ATTR_ERROR_MESSAGE,
     ATTR_IMAGE_SIZE,
     ATTR_API_RESPONSE_TIME,
+    ATTR_PARSE_FAILURES,
+    ATTR_PARSE_RETRIES,
+    ATTR_GATE_SAVED,
+    ATTR_GATE_PASSED,
     ATTR_ZONE_COUNT,
     ATTR_DASHBOARD_PATH,
     ATTR_DASHBOARD_LAST_GENERATED,
@@ -35,10 +39,19 @@ from .const import (
     ATTR_ZONES_NEEDING_ATTENTION,
     ATTR_NEXT_SCHEDULED_CHECK,
     ATTR_ALL_TIDY,
+    ATTR_CONNECTIONS_OPENED,
+    ATTR_CONNECTIONS_REUSED,
+    ATTR_CONNECTION_REUSE_RATIO,
     SIGNAL_SYSTEM_STATE_UPDATED,
     SIGNAL_ZONE_STATE_UPDATED,
+    SIGNAL_ZONE_LATENCY_UPDATED,
+    ATTR_LATENCY,
+    ATTR_LAST_CHECK_SPANS,
 )
+from .budget import async_get_request_budget
 from .coordinator import CleanMeZone
+from .session import DATA_SESSION_MANAGER
+from .timing import SPAN_TOTAL
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -65,6 +78,7 @@ async def async_setup_entry(
         CleanMeTotalCleansSensor(zone, entry),
         CleanMeAICommentSensor(zone, entry),
         CleanMeMessinessScoreSensor(zone, entry),
+        CleanMeCheckLatencySensor(zone, entry),
     ]
 
     domain_data = hass.data.setdefault(DOMAIN, {})
@@ -74,6 +88,7 @@ async def async_setup_entry(
         entities.append(CleanMeTotalZonesSensor(hass))
         entities.append(CleanMeZonesNeedingAttentionSensor(hass))
         entities.append(CleanMeNextScheduledCheckSensor(hass))
+        entities.append(CleanMeApiBudgetSensor(hass))
         domain_data["system_status_entity_added"] = True
 
     for entity in entities:
@@ -117,13 +132,13 @@ class CleanMeTasksSensor(CleanMeBaseSensor):
     @property
     def native_value(self) -> int:
         """Return the number of tasks."""
-        return len(self._zone.state.tasks or [])
+        return len(self._zone.state.tasks)
 
     @property
     def extra_state_attributes(self) -> Dict[str, Any]:
         """Return task list and other details."""
         return {
-            ATTR_TASKS: self._zone.state.tasks or [],
+            ATTR_TASKS: list(self._zone.state.tasks),
             ATTR_COMMENT: self._zone.state.comment or "",
             ATTR_FULL_ANALYSIS: self._zone.state.full_analysis or {},
             ATTR_MESSINESS_SCORE: self._zone.state.messiness_score,
@@ -166,6 +181,14 @@ class CleanMeLastCheckSensor(CleanMeBaseSensor):
         if self._zone.state.api_response_time > 0:
             attrs[ATTR_API_RESPONSE_TIME] = round(self._zone.state.api_response_time, 2)
 
+        metrics = self._zone.analysis_metrics
+        if metrics.get("parse_failures"):
+            attrs[ATTR_PARSE_FAILURES] = metrics["parse_failures"]
+            attrs[ATTR_PARSE_RETRIES] = metrics["parse_retries"]
+        if "gate_saved" in metrics:
+            attrs[ATTR_GATE_SAVED] = metrics["gate_saved"]
+            attrs[ATTR_GATE_PASSED] = metrics["gate_passed"]
+
         return attrs
 
 
@@ -267,6 +290,46 @@ class CleanMeMessinessScoreSensor(CleanMeBaseSensor):
         return self._zone.state.messiness_score
 
 
+class CleanMeCheckLatencySensor(CleanMeBaseSensor):
+    """Sensor showing how long the last check took, with rolling percentiles."""
+
+    _attr_name = "Check latency"
+    _attr_icon = "mdi:timer-outline"
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "s"
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self._entry_id}_check_latency"
+
+    async def async_added_to_hass(self) -> None:
+        # Latency is recorded after the check's own state update, so listen for it separately
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_ZONE_LATENCY_UPDATED.format(self._entry_id),
+                self.async_write_ha_state,
+            )
+        )
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the duration of the last check in seconds."""
+        total = self._zone.latency.last.get(SPAN_TOTAL)
+        return round(total, 3) if total is not None else None
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        """Return last check spans and p50/p95/p99 per span (ms)."""
+        return {
+            ATTR_LAST_CHECK_SPANS: {
+                name: round(seconds * 1000, 1) for name, seconds in self._zone.latency.last.items()
+            },
+            ATTR_LATENCY: self._zone.latency.summary(),
+        }
+
+
 class CleanMeGlobalBaseSensor(SensorEntity):
     """Base class for global CleanMe sensors."""
 
@@ -335,7 +398,7 @@ class CleanMeSystemStatusSensor(CleanMeGlobalBaseSensor):
         if last_generated:
             last_generated = as_local(last_generated).isoformat()
 
-        task_total = sum(len(zone.state.tasks or []) for zone in zones)
+        task_total = sum(len(zone.state.tasks) for zone in zones)
         zones_needing_attention = [zone.name for zone in zones if zone.needs_attention]
         all_tidy = all(zone.state.tidy for zone in zones) if zones else False
 
@@ -345,7 +408,7 @@ class CleanMeSystemStatusSensor(CleanMeGlobalBaseSensor):
             and dashboard_state.get(ATTR_DASHBOARD_PATH)
         )
 
-        return {
+        attrs = {
             ATTR_ZONE_COUNT: len(zones),
             ATTR_TASK_TOTAL: task_total,
             ATTR_ZONES_NEEDING_ATTENTION: zones_needing_attention,
@@ -357,6 +420,15 @@ class CleanMeSystemStatusSensor(CleanMeGlobalBaseSensor):
             ATTR_READY: ready,
         }
 
+        session_manager = self._hass.data.get(DOMAIN, {}).get(DATA_SESSION_MANAGER)
+        if session_manager is not None:
+            metrics = session_manager.metrics
+            attrs[ATTR_CONNECTIONS_OPENED] = metrics["connections_opened"]
+            attrs[ATTR_CONNECTIONS_REUSED] = metrics["connections_reused"]
+            attrs[ATTR_CONNECTION_REUSE_RATIO] = metrics["reuse_ratio"]
+
+        return attrs
+
 
 class CleanMeTotalZonesSensor(CleanMeGlobalBaseSensor):
     """Sensor showing total configured zones."""
@@ -417,3 +489,27 @@ class CleanMeNextScheduledCheckSensor(CleanMeGlobalBaseSensor):
             return None
         
         return min(next_checks)
+
+
+class CleanMeApiBudgetSensor(CleanMeGlobalBaseSensor):
+    """Sensor showing Gemini requests left in today's budget."""
+
+    _attr_name = "CleanMe API Budget Remaining"
+    _attr_icon = "mdi:counter"
+    _attr_unique_id = "cleanme_api_budget_remaining"
+    _attr_native_unit_of_measurement = "requests"
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    @property
+    def native_value(self) -> int | None:
+        """Return requests left today, or None without a daily_request_budget."""
+        return async_get_request_budget(self._hass).remaining
+
+    @property
+    def extra_state_attributes(self) -> Dict[str, Any]:
+        metrics = async_get_request_budget(self._hass).metrics
+        metrics.pop("remaining")
+        metrics["zones_deferred"] = [
+            zone.name for zone in self._get_zones() if zone.deferred_check_pending
+        ]
+        return metrics
@@ -0,0 +1,180 @@
+"""Dedicated HTTP connection pool for Gemini API traffic.
+
+The shared Home Assistant client session is tuned for many small requests
+to many hosts. Gemini calls are few, large and slow, so CleanMe keeps its
+own pool for GEMINI_API_BASE with keep-alive enabled and split
+connect/read timeouts. Connection reuse is tracked so we can confirm that
+TLS handshakes are amortized across checks.
+"""
+from __future__ import annotations
+
+import logging
+from types import SimpleNamespace
+from typing import Any, Dict
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util.ssl import get_default_context
+
+from .const import (
+    DOMAIN,
+    CONF_CONNECTION_LIMIT,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_CONNECT_TIMEOUT,
+    CONF_READ_TIMEOUT,
+)
+from .settings import get_settings
+from .timing import MARK_REQUEST_SENT, current_timer
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SESSION_MANAGER = "gemini_session"
+# Unsubscribes the manager's close-on-shutdown listener
+DATA_SESSION_CLOSE_UNSUB = "gemini_session_close_unsub"
+
+
+class GeminiSessionManager:
+    """Owns the aiohttp session used for all Gemini requests."""
+
+    def __init__(
+        self,
+        connection_limit: int,
+        keepalive_timeout: float,
+        connect_timeout: float,
+        read_timeout: float,
+    ) -> None:
+        """Initialize the session manager."""
+        self._connection_limit = connection_limit
+        self._keepalive_timeout = keepalive_timeout
+        self._timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=connect_timeout,
+            sock_connect=connect_timeout,
+            sock_read=read_timeout,
+        )
+        self._session: aiohttp.ClientSession | None = None
+
+        self._requests = 0
+        self._connections_opened = 0
+        self._connections_reused = 0
+
+    @property
+    def timeout(self) -> aiohttp.ClientTimeout:
+        """Return the split connect/read timeout for Gemini requests."""
+        return self._timeout
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return connection reuse counters."""
+        acquired = self._connections_opened + self._connections_reused
+        return {
+            "requests": self._requests,
+            "connections_opened": self._connections_opened,
+            "connections_reused": self._connections_reused,
+            "reuse_ratio": round(self._connections_reused / acquired, 3) if acquired else 0.0,
+            "connection_limit": self._connection_limit,
+            "keepalive_timeout": self._keepalive_timeout,
+        }
+
+    def get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> aiohttp.ClientSession:
+        """Create a session with a connector dedicated to the Gemini host."""
+        connector = aiohttp.TCPConnector(
+            limit=self._connection_limit,
+            limit_per_host=self._connection_limit,
+            keepalive_timeout=self._keepalive_timeout,
+            ttl_dns_cache=300,
+            ssl=get_default_context(),
+        )
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(self._on_request_start)
+        trace_config.on_connection_create_end.append(self._on_connection_create_end)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reuseconn)
+        trace_config.on_request_chunk_sent.append(self._on_request_chunk_sent)
+
+        _LOGGER.debug(
+            "Creating Gemini connection pool (limit=%d, keepalive=%ss)",
+            self._connection_limit,
+            self._keepalive_timeout,
+        )
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=self._timeout,
+            trace_configs=[trace_config],
+        )
+
+    async def _on_request_start(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        self._requests += 1
+
+    async def _on_connection_create_end(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        self._connections_opened += 1
+
+    async def _on_connection_reuseconn(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        self._connections_reused += 1
+
+    async def _on_request_chunk_sent(
+        self, session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+    ) -> None:
+        # Hooks run in the requesting task, so this is the running check's timer
+        timer = current_timer()
+        if timer is not None:
+            timer.mark(MARK_REQUEST_SENT)
+
+    async def async_close(self) -> None:
+        """Close the pooled session and its connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+@callback
+def async_get_session_manager(hass: HomeAssistant) -> GeminiSessionManager:
+    """Return the shared Gemini session manager, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    manager: GeminiSessionManager | None = domain_data.get(DATA_SESSION_MANAGER)
+    if manager is not None:
+        return manager
+
+    settings = get_settings(hass)
+    manager = GeminiSessionManager(
+        connection_limit=settings[CONF_CONNECTION_LIMIT],
+        keepalive_timeout=settings[CONF_KEEPALIVE_TIMEOUT],
+        connect_timeout=settings[CONF_CONNECT_TIMEOUT],
+        read_timeout=settings[CONF_READ_TIMEOUT],
+    )
+    domain_data[DATA_SESSION_MANAGER] = manager
+
+    async def _async_close(event: Event) -> None:
+        # Fired listeners are already removed
+        domain_data.pop(DATA_SESSION_CLOSE_UNSUB, None)
+        await manager.async_close()
+
+    domain_data[DATA_SESSION_CLOSE_UNSUB] = hass.bus.async_listen_once(
+        EVENT_HOMEASSISTANT_CLOSE, _async_close
+    )
+    return manager
+
+
+async def async_close_session_manager(hass: HomeAssistant) -> None:
+    """Close and forget the shared Gemini session manager."""
+    domain_data = hass.data.get(DOMAIN, {})
+    unsub = domain_data.pop(DATA_SESSION_CLOSE_UNSUB, None)
+    if unsub is not None:
+        unsub()
+    manager: GeminiSessionManager | None = domain_data.pop(DATA_SESSION_MANAGER, None)
+    if manager is not None:
+        await manager.async_close()
@@ -0,0 +1,154 @@
+"""Global tuning settings for CleanMe.
+
+Zones are configured through the UI, but a few knobs are shared by every
+zone (the Gemini connection pool, for example). Those live in an optional
+``cleanme:`` block in configuration.yaml and are stored in
+``hass.data[DOMAIN]["settings"]``.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    DOMAIN,
+    CONF_CONNECTION_LIMIT,
+    CONF_KEEPALIVE_TIMEOUT,
+    CONF_CONNECT_TIMEOUT,
+    CONF_READ_TIMEOUT,
+    CONF_BATCH_SIZE,
+    CONF_STREAMING,
+    CONF_PRE_FILTER,
+    CONF_PRE_FILTER_THRESHOLD,
+    CONF_LOOP_WATCHDOG,
+    CONF_LOOP_WATCHDOG_THRESHOLD,
+    CONF_FILE_UPLOAD,
+    CONF_FILE_UPLOAD_MIN_SIZE,
+    CONF_FILE_UPLOAD_TTL,
+    CONF_RESULT_CACHE,
+    CONF_RESULT_CACHE_SIZE,
+    CONF_RESULT_CACHE_TTL,
+    CONF_RESULT_CACHE_PERSIST,
+    CONF_SNAPSHOT_SHARE_WINDOW,
+    CONF_BURST_FRAMES,
+    CONF_BURST_INTERVAL,
+    CONF_DAILY_REQUEST_BUDGET,
+    CONF_BUDGET_MANUAL_RESERVE,
+    CONF_CHECK_WORKERS,
+    CONF_CHECK_TIMEOUT,
+    CONF_CPU_WORKERS,
+    DEFAULT_CONNECTION_LIMIT,
+    DEFAULT_KEEPALIVE_TIMEOUT,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_BATCH_SIZE,
+    MAX_BATCH_SIZE,
+    DEFAULT_STREAMING,
+    DEFAULT_PRE_FILTER,
+    DEFAULT_PRE_FILTER_THRESHOLD,
+    DEFAULT_LOOP_WATCHDOG,
+    DEFAULT_LOOP_WATCHDOG_THRESHOLD,
+    DEFAULT_FILE_UPLOAD,
+    DEFAULT_FILE_UPLOAD_MIN_SIZE,
+    DEFAULT_FILE_UPLOAD_TTL,
+    DEFAULT_RESULT_CACHE,
+    DEFAULT_RESULT_CACHE_SIZE,
+    DEFAULT_RESULT_CACHE_TTL,
+    DEFAULT_RESULT_CACHE_PERSIST,
+    DEFAULT_SNAPSHOT_SHARE_WINDOW,
+    DEFAULT_BURST_FRAMES,
+    MAX_BURST_FRAMES,
+    DEFAULT_BURST_INTERVAL,
+    DEFAULT_DAILY_REQUEST_BUDGET,
+    MAX_DAILY_REQUEST_BUDGET,
+    DEFAULT_BUDGET_MANUAL_RESERVE,
+    MAX_BUDGET_MANUAL_RESERVE,
+    DEFAULT_CHECK_WORKERS,
+    MAX_CHECK_WORKERS,
+    DEFAULT_CHECK_TIMEOUT,
+    MAX_CHECK_TIMEOUT,
+    DEFAULT_CPU_WORKERS,
+    MAX_CPU_WORKERS,
+)
+
+SETTINGS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_CONNECTION_LIMIT, default=DEFAULT_CONNECTION_LIMIT): vol.All(
+            int, vol.Range(min=1, max=100)
+        ),
+        vol.Optional(CONF_KEEPALIVE_TIMEOUT, default=DEFAULT_KEEPALIVE_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=3600)
+        ),
+        vol.Optional(CONF_CONNECT_TIMEOUT, default=DEFAULT_CONNECT_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=120)
+        ),
+        vol.Optional(CONF_READ_TIMEOUT, default=DEFAULT_READ_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=5, max=600)
+        ),
+        vol.Optional(CONF_BATCH_SIZE, default=DEFAULT_BATCH_SIZE): vol.All(
+            int, vol.Range(min=1, max=MAX_BATCH_SIZE)
+        ),
+        vol.Optional(CONF_STREAMING, default=DEFAULT_STREAMING): bool,
+        vol.Optional(CONF_PRE_FILTER, default=DEFAULT_PRE_FILTER): bool,
+        vol.Optional(CONF_PRE_FILTER_THRESHOLD, default=DEFAULT_PRE_FILTER_THRESHOLD): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=0.5)
+        ),
+        vol.Optional(CONF_LOOP_WATCHDOG, default=DEFAULT_LOOP_WATCHDOG): bool,
+        vol.Optional(CONF_LOOP_WATCHDOG_THRESHOLD, default=DEFAULT_LOOP_WATCHDOG_THRESHOLD): vol.All(
+            vol.Coerce(float), vol.Range(min=0.02, max=5)
+        ),
+        vol.Optional(CONF_FILE_UPLOAD, default=DEFAULT_FILE_UPLOAD): bool,
+        vol.Optional(CONF_FILE_UPLOAD_MIN_SIZE, default=DEFAULT_FILE_UPLOAD_MIN_SIZE): vol.All(
+            int, vol.Range(min=0)
+        ),
+        # Gemini deletes uploaded files after 48 hours on its own
+        vol.Optional(CONF_FILE_UPLOAD_TTL, default=DEFAULT_FILE_UPLOAD_TTL): vol.All(
+            int, vol.Range(min=60, max=86400)
+        ),
+        vol.Optional(CONF_RESULT_CACHE, default=DEFAULT_RESULT_CACHE): bool,
+        vol.Optional(CONF_RESULT_CACHE_SIZE, default=DEFAULT_RESULT_CACHE_SIZE): vol.All(
+            int, vol.Range(min=1, max=10000)
+        ),
+        vol.Optional(CONF_RESULT_CACHE_TTL, default=DEFAULT_RESULT_CACHE_TTL): vol.All(
+            int, vol.Range(min=60, max=7 * 86400)
+        ),
+        vol.Optional(CONF_RESULT_CACHE_PERSIST, default=DEFAULT_RESULT_CACHE_PERSIST): bool,
+        vol.Optional(CONF_SNAPSHOT_SHARE_WINDOW, default=DEFAULT_SNAPSHOT_SHARE_WINDOW): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=300)
+        ),
+        vol.Optional(CONF_BURST_FRAMES, default=DEFAULT_BURST_FRAMES): vol.All(
+            int, vol.Range(min=1, max=MAX_BURST_FRAMES)
+        ),
+        vol.Optional(CONF_BURST_INTERVAL, default=DEFAULT_BURST_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=5)
+        ),
+        vol.Optional(CONF_DAILY_REQUEST_BUDGET, default=DEFAULT_DAILY_REQUEST_BUDGET): vol.All(
+            int, vol.Range(min=0, max=MAX_DAILY_REQUEST_BUDGET)
+        ),
+        vol.Optional(CONF_BUDGET_MANUAL_RESERVE, default=DEFAULT_BUDGET_MANUAL_RESERVE): vol.All(
+            int, vol.Range(min=0, max=MAX_BUDGET_MANUAL_RESERVE)
+        ),
+        vol.Optional(CONF_CHECK_WORKERS, default=DEFAULT_CHECK_WORKERS): vol.All(
+            int, vol.Range(min=1, max=MAX_CHECK_WORKERS)
+        ),
+        vol.Optional(CONF_CHECK_TIMEOUT, default=DEFAULT_CHECK_TIMEOUT): vol.All(
+            vol.Coerce(float), vol.Range(min=10, max=MAX_CHECK_TIMEOUT)
+        ),
+        vol.Optional(CONF_CPU_WORKERS, default=DEFAULT_CPU_WORKERS): vol.All(
+            int, vol.Range(min=1, max=MAX_CPU_WORKERS)
+        ),
+    }
+)
+
+
+def get_settings(hass: HomeAssistant) -> Dict[str, Any]:
+    """Return global settings, falling back to defaults if YAML was not loaded."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    settings = domain_data.get("settings")
+    if settings is None:
+        settings = SETTINGS_SCHEMA({})
+        domain_data["settings"] = settings
+    return settings
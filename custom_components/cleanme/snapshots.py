@@ -0,0 +1,233 @@
+"""Share camera snapshots between zones that use the same camera.
+
+One wide-angle camera often covers several zones (kitchen and dining
+area). Without sharing, check_all asks it for a snapshot once per zone,
+which is slow on RTSP snapshot paths and drains battery cameras. The
+broker fetches each camera once: concurrent requests wait for the same
+fetch, and requests within the share window reuse its bytes. The window
+is off by default so a manual check always sees a fresh frame; a
+check_all sweep holds snapshots until it ends, so zones the check queue
+runs one after another still share one fetch per camera.
+
+Zones that cover only part of the frame register their region of interest
+with the broker. The first zone to ask for a region decodes the shared
+frame once on the CPU executor and crops every region registered for that
+camera, so the other zones pick up their crop without decoding again.
+
+Failed fetches and crops are never shared beyond the requests already
+waiting. If the zone that started a fetch is cancelled, the zones waiting
+for it fetch again.
+"""
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Tuple
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import DOMAIN, CONF_SNAPSHOT_SHARE_WINDOW, DEFAULT_SNAPSHOT_SHARE_WINDOW
+from .imaging import Roi
+from .settings import get_settings
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_SNAPSHOT_BROKER = "snapshot_broker"
+
+
+class SnapshotBroker:
+    """Fetch each camera once per share window and fan the bytes out."""
+
+    def __init__(self, window: float = DEFAULT_SNAPSHOT_SHARE_WINDOW) -> None:
+        """Initialize the broker."""
+        self._window = window
+        self._in_flight: Dict[str, asyncio.Future[bytes]] = {}
+        # entity_id -> (time.monotonic() of the fetch, image bytes)
+        self._recent: Dict[str, Tuple[float, bytes]] = {}
+        # entity_id -> region -> number of zones using it
+        self._regions: Dict[str, Dict[Roi, int]] = {}
+        # entity_id -> (frame the crops were cut from, crops by region)
+        self._crops: Dict[str, Tuple[bytes, asyncio.Future[Dict[Roi, bytes]]]] = {}
+        # Open hold() blocks; while any is open, snapshots outlive the window
+        self._holds = 0
+
+        self._fetches = 0
+        self._shared = 0
+        self._failures = 0
+        self._crop_jobs = 0
+        self._crops_shared = 0
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return fetch counters."""
+        requests = self._fetches + self._shared
+        return {
+            "window_s": self._window,
+            "fetches": self._fetches,
+            "shared": self._shared,
+            "failures": self._failures,
+            "share_ratio": round(self._shared / requests, 3) if requests else 0.0,
+            "cameras_held": len(self._recent),
+            "regions": sum(len(regions) for regions in self._regions.values()),
+            "crop_jobs": self._crop_jobs,
+            "crops_shared": self._crops_shared,
+        }
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        """Keep every snapshot fetched until the block ends (a check_all sweep)."""
+        self._holds += 1
+        try:
+            yield
+        finally:
+            self._holds -= 1
+            self._drop_expired(time.monotonic())
+
+    @callback
+    def register_region(self, entity_id: str, roi: Roi) -> CALLBACK_TYPE:
+        """Crop roi along with the camera's other regions; returns an unregister callback."""
+        regions = self._regions.setdefault(entity_id, {})
+        regions[roi] = regions.get(roi, 0) + 1
+
+        @callback
+        def _unregister() -> None:
+            regions[roi] -= 1
+            if not regions[roi]:
+                del regions[roi]
+            if not regions and self._regions.get(entity_id) is regions:
+                del self._regions[entity_id]
+
+        return _unregister
+
+    async def async_get_image(
+        self, entity_id: str, fetch: Callable[[], Awaitable[bytes]]
+    ) -> bytes:
+        """Return a snapshot of entity_id, calling fetch() only if none can be shared."""
+        now = time.monotonic()
+        self._drop_expired(now)
+
+        recent = self._recent.get(entity_id)
+        if recent is not None:
+            self._shared += 1
+            return recent[1]
+
+        future = self._in_flight.get(entity_id)
+        if future is not None:
+            self._shared += 1
+            try:
+                # Shielded so one cancelled zone does not cancel the fetch for the others
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not _owner_cancelled(future):
+                    raise
+            # The zone that started the fetch was cancelled (superseded or unloaded)
+            return await self.async_get_image(entity_id, fetch)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[entity_id] = future
+        self._fetches += 1
+        try:
+            image_bytes = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as err:
+            self._failures += 1
+            future.set_exception(err)
+            # Retrieved here so a fetch nobody else waited for is not logged as unhandled
+            future.exception()
+            raise
+        else:
+            future.set_result(image_bytes)
+            if self._window > 0 or self._holds:
+                self._recent[entity_id] = (time.monotonic(), image_bytes)
+            return image_bytes
+        finally:
+            del self._in_flight[entity_id]
+
+    async def async_get_region(
+        self,
+        entity_id: str,
+        roi: Roi,
+        fetch: Callable[[], Awaitable[bytes]],
+        crop: Callable[[bytes, List[Roi]], Awaitable[List[bytes]]],
+    ) -> bytes:
+        """Return roi cropped from a shared snapshot of entity_id.
+
+        ``crop(image_bytes, rois)`` must return one image per region, in
+        order; it is called once per frame for every registered region.
+        """
+        image_bytes = await self.async_get_image(entity_id, fetch)
+
+        pending = self._crops.get(entity_id)
+        if pending is not None and pending[0] is image_bytes:
+            try:
+                crops = await asyncio.shield(pending[1])
+            except asyncio.CancelledError:
+                if not _owner_cancelled(pending[1]):
+                    raise
+                return await self.async_get_region(entity_id, roi, fetch, crop)
+            if roi in crops:
+                self._crops_shared += 1
+                return crops[roi]
+            # Registered after this frame was cropped; rare enough to crop alone
+            self._crop_jobs += 1
+            return (await crop(image_bytes, [roi]))[0]
+
+        rois = list(self._regions.get(entity_id, ()))
+        if roi not in rois:
+            rois.append(roi)
+        future: asyncio.Future[Dict[Roi, bytes]] = asyncio.get_running_loop().create_future()
+        self._crops[entity_id] = (image_bytes, future)
+        self._crop_jobs += 1
+        try:
+            crops = dict(zip(rois, await crop(image_bytes, rois)))
+        except asyncio.CancelledError:
+            future.cancel()
+            self._drop_crops(entity_id, future)
+            raise
+        except Exception as err:
+            future.set_exception(err)
+            future.exception()
+            self._drop_crops(entity_id, future)
+            raise
+        # Kept until the frame expires, or until the next request when the frame
+        # is not held; waiters still waking up for this frame need it
+        future.set_result(crops)
+        return crops[roi]
+
+    @callback
+    def _drop_crops(self, entity_id: str, future: asyncio.Future) -> None:
+        pending = self._crops.get(entity_id)
+        if pending is not None and pending[1] is future:
+            del self._crops[entity_id]
+
+    @callback
+    def _drop_expired(self, now: float) -> None:
+        """Release snapshots older than the window so their bytes can be freed."""
+        if self._holds:
+            return
+        for entity_id, (fetched_at, _) in list(self._recent.items()):
+            if now - fetched_at >= self._window:
+                del self._recent[entity_id]
+        for entity_id, (_, future) in list(self._crops.items()):
+            if future.done() and entity_id not in self._recent:
+                del self._crops[entity_id]
+
+
+def _owner_cancelled(future: asyncio.Future) -> bool:
+    """Return True if a shared future was cancelled by its owner, not the waiting task."""
+    return future.cancelled() and not asyncio.current_task().cancelling()
+
+
+@callback
+def async_get_snapshot_broker(hass: HomeAssistant) -> SnapshotBroker:
+    """Return the shared snapshot broker, creating it if needed."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    broker: SnapshotBroker | None = domain_data.get(DATA_SNAPSHOT_BROKER)
+    if broker is None:
+        broker = SnapshotBroker(get_settings(hass)[CONF_SNAPSHOT_SHARE_WINDOW])
+        domain_data[DATA_SNAPSHOT_BROKER] = broker
+    return broker
@@ -0,0 +1,218 @@
+"""Span timing for the check pipeline.
+
+A check runs inside track_check(), which makes a CheckTimer current for
+the task. Code anywhere down the call chain wraps its work in
+span(SPAN_...) without the timer being passed around; outside a check
+span() does nothing. Zones feed finished timers into a LatencyRecorder,
+which keeps rolling per-span samples and reports p50/p95/p99.
+
+All times come from time.perf_counter. This module has no Home Assistant
+dependencies.
+"""
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterator
+
+# Pipeline spans, in the order they happen
+SPAN_CAPTURE = "capture"  # camera snapshot or burst, plus the region-of-interest crop
+SPAN_PREPROCESS = "preprocess"  # local pre-filter fingerprint
+SPAN_INFERENCE = "inference"  # local model
+SPAN_ENCODE = "encode"  # request body envelope
+SPAN_UPLOAD = "upload"  # File API upload of the image
+SPAN_SEND = "send"  # connect + upload the request (image base64-encoded as it streams)
+SPAN_WAIT = "wait"  # request sent -> response headers
+SPAN_RECEIVE = "receive"  # reading the response body / stream
+SPAN_PARSE = "parse"  # JSON extraction
+SPAN_VALIDATE = "validate"  # schema normalization
+SPAN_NOTIFY = "notify"  # entity listeners + dispatcher
+SPAN_PERSIST = "persist"  # Store writes
+SPAN_TOTAL = "total"
+
+# Dashboard regeneration spans
+SPAN_DASHBOARD_GENERATE = "generate"  # build the card config
+SPAN_DASHBOARD_WRITE = "write"  # YAML export
+SPAN_DASHBOARD_REGISTER = "register"  # Lovelace storage + sidebar panel
+
+# Set by the HTTP trace hook when the request body has been written
+MARK_REQUEST_SENT = "request_sent"
+
+# Samples kept per span; enough for stable p99 at a few checks a day
+DEFAULT_WINDOW = 200
+
+_current_timer: ContextVar["CheckTimer | None"] = ContextVar("cleanme_check_timer", default=None)
+
+
+class CheckTimer:
+    """Accumulates span durations for one check."""
+
+    def __init__(self) -> None:
+        """Start the timer."""
+        self.spans: Dict[str, float] = {}
+        # Model requests started so far; 0 means the check never reached the API
+        self.requests = 0
+        self._marks: Dict[str, float] = {}
+        self._start = time.perf_counter()
+        self._end: float | None = None
+
+    @property
+    def total(self) -> float:
+        """Return seconds from start to stop (or now, if still running)."""
+        return (self._end or time.perf_counter()) - self._start
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add time to a span; repeated spans (retries) accumulate."""
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as a span."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def mark(self, name: str) -> None:
+        """Record the current time under a name (used by HTTP trace hooks)."""
+        self._marks[name] = time.perf_counter()
+
+    def pop_mark(self, name: str) -> float | None:
+        """Return and clear a mark."""
+        return self._marks.pop(name, None)
+
+    def stop(self) -> None:
+        """Freeze the total."""
+        if self._end is None:
+            self._end = time.perf_counter()
+
+
+def current_timer() -> CheckTimer | None:
+    """Return the timer of the check running in this task, if any."""
+    return _current_timer.get()
+
+
+@contextmanager
+def track_check() -> Iterator[CheckTimer]:
+    """Make a new CheckTimer current for the enclosed block."""
+    timer = CheckTimer()
+    token = _current_timer.set(timer)
+    try:
+        yield timer
+    finally:
+        timer.stop()
+        _current_timer.reset(token)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block on the current check timer, if there is one."""
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    with timer.span(name):
+        yield
+
+
+def request_started() -> None:
+    """Count a model request on the current check timer; call before sending it."""
+    timer = _current_timer.get()
+    if timer is not None:
+        timer.requests += 1
+
+
+def record_request(start: float) -> None:
+    """Split an HTTP request started at start into send and wait spans.
+
+    Call when the response headers arrive. The split point is the
+    MARK_REQUEST_SENT mark set by the session's trace hook; without it the
+    whole time counts as wait.
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        return
+    headers_at = time.perf_counter()
+    sent_at = timer.pop_mark(MARK_REQUEST_SENT)
+    if sent_at is None or not start <= sent_at <= headers_at:
+        sent_at = start
+    timer.add(SPAN_SEND, sent_at - start)
+    timer.add(SPAN_WAIT, headers_at - sent_at)
+
+
+def _nearest_rank(ordered: list[float], percent: float) -> float:
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LatencyHistogram:
+    """Rolling window of latency samples with percentile summaries."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        """Initialize an empty window."""
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._count = 0
+
+    @property
+    def count(self) -> int:
+        """Return the number of samples ever added."""
+        return self._count
+
+    def add(self, seconds: float) -> None:
+        """Add a sample."""
+        self._samples.append(seconds)
+        self._count += 1
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the nearest-rank percentile of the window, in seconds."""
+        if not self._samples:
+            return None
+        return _nearest_rank(sorted(self._samples), percent)
+
+    def summary(self) -> Dict[str, float | int | None]:
+        """Return count, p50, p95, p99 and max in milliseconds."""
+        if not self._samples:
+            return {"count": self._count, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+        ordered = sorted(self._samples)
+        return {
+            "count": self._count,
+            "p50_ms": round(_nearest_rank(ordered, 50) * 1000, 1),
+            "p95_ms": round(_nearest_rank(ordered, 95) * 1000, 1),
+            "p99_ms": round(_nearest_rank(ordered, 99) * 1000, 1),
+            "max_ms": round(ordered[-1] * 1000, 1),
+        }
+
+
+class LatencyRecorder:
+    """Per-span latency histograms for one zone."""
+
+    def __init__(self, window: int = DEFAULT_WINDOW) -> None:
+        """Initialize an empty recorder."""
+        self._window = window
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self.last: Dict[str, float] = {}
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        """Return the histogram for a span, creating it if needed."""
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            histogram = self._histograms[name] = LatencyHistogram(self._window)
+        return histogram
+
+    def add(self, name: str, seconds: float) -> None:
+        """Record a single span sample outside a check (e.g. persistence)."""
+        self.histogram(name).add(seconds)
+
+    def record(self, timer: CheckTimer) -> None:
+        """Record every span of a finished check plus its total."""
+        self.last = {**timer.spans, SPAN_TOTAL: timer.total}
+        for name, seconds in self.last.items():
+            self.histogram(name).add(seconds)
+
+    def summary(self) -> Dict[str, Dict[str, float | int | None]]:
+        """Return percentile summaries keyed by span name."""
+        return {name: histogram.summary() for name, histogram in self._histograms.items()}
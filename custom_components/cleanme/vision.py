@@ -0,0 +1,216 @@
+"""Pluggable vision backends for CleanMe.
+
+A backend turns a camera snapshot into the analysis dict every zone
+understands (tidy, tasks, comment, severity). GeminiClient is the default
+backend; other backends are registered by name and selected per zone with
+the vision_backend option.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Callable, Dict, Mapping, Protocol, runtime_checkable
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant
+
+from .const import (
+    CONF_API_KEY,
+    CONF_VISION_BACKEND,
+    CONF_LOCAL_MODEL_PATH,
+    CONF_FILE_UPLOAD,
+    CONF_RESULT_CACHE,
+    CONF_PRE_FILTER,
+    CONF_PRE_FILTER_THRESHOLD,
+    BACKEND_GEMINI,
+    BACKEND_LOCAL,
+    DEFAULT_VISION_BACKEND,
+    DEFAULT_LOCAL_MODEL_PATH,
+    PRE_FILTER_EDGE_TOLERANCE,
+)
+from .budget import async_get_request_budget
+from .executor import async_get_cpu_executor
+from .file_upload import async_get_file_store
+from .gemini_client import GeminiClient, PartialCallback
+from .imaging import PIL_AVAILABLE, Fingerprint, difference, fingerprint
+from .result_cache import async_get_result_cache
+from .settings import get_settings
+from .timing import SPAN_PREPROCESS, span
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@runtime_checkable
+class VisionBackend(Protocol):
+    """Contract shared by all analysis backends.
+
+    analyze_image must return a dict with at least tidy (bool), tasks
+    (list of str), comment (str) and severity (low/medium/high), and
+    should add api_response_time and image_size. Failures are raised as
+    GeminiClientError so zones can report them uniformly.
+    """
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return backend counters for diagnostics."""
+
+    async def analyze_image(
+        self,
+        session: aiohttp.ClientSession,
+        image_bytes: bytes,
+        room_name: str,
+        personality: str,
+        pickiness: int,
+        timeout: aiohttp.ClientTimeout | None = None,
+        on_partial: PartialCallback | None = None,
+    ) -> Dict[str, Any]:
+        """Analyze a room image."""
+
+
+BackendFactory = Callable[[HomeAssistant, Mapping[str, Any]], VisionBackend]
+
+_BACKENDS: Dict[str, BackendFactory] = {}
+
+
+def register_backend(name: str, factory: BackendFactory) -> None:
+    """Register a backend factory under a name usable in zone config."""
+    _BACKENDS[name] = factory
+
+
+def create_backend(hass: HomeAssistant, data: Mapping[str, Any]) -> VisionBackend:
+    """Create the backend selected in a zone's config data."""
+    name = data.get(CONF_VISION_BACKEND, DEFAULT_VISION_BACKEND)
+    factory = _BACKENDS.get(name)
+    if factory is None:
+        _LOGGER.warning("Unknown vision backend '%s', using %s", name, DEFAULT_VISION_BACKEND)
+        name = DEFAULT_VISION_BACKEND
+        factory = _BACKENDS[name]
+    backend = factory(hass, data)
+
+    settings = get_settings(hass)
+    # The local model is already cheap, so only remote backends are gated
+    if settings[CONF_PRE_FILTER] and name != BACKEND_LOCAL:
+        if PIL_AVAILABLE:
+            return TieredBackend(hass, backend, settings[CONF_PRE_FILTER_THRESHOLD])
+        _LOGGER.warning("pre_filter needs Pillow installed; analyzing every frame")
+    return backend
+
+
+class TieredBackend:
+    """Skip the wrapped backend when a frame matches the last tidy one.
+
+    Stage one fingerprints the snapshot in the executor and compares it
+    with the last frame the wrapped backend judged tidy. Frames that are
+    close enough are reported tidy straight away; everything else (no
+    reference yet, visible change, more clutter edges) goes to stage two.
+    """
+
+    def __init__(self, hass: HomeAssistant, primary: VisionBackend, threshold: float) -> None:
+        """Initialize the gate around a primary backend."""
+        self.hass = hass
+        self._primary = primary
+        self._threshold = threshold
+        self._reference: Fingerprint | None = None
+
+        self._saved = 0
+        self._passed = 0
+
+    @property
+    def primary(self) -> VisionBackend:
+        return self._primary
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return primary backend counters plus gate counters."""
+        checks = self._saved + self._passed
+        return {
+            **self._primary.metrics,
+            "gate_saved": self._saved,
+            "gate_passed": self._passed,
+            "gate_saved_ratio": round(self._saved / checks, 3) if checks else 0.0,
+        }
+
+    def reset_reference(self) -> None:
+        """Forget the tidy reference frame so the next check is never skipped."""
+        self._reference = None
+
+    async def analyze_image(
+        self,
+        session: aiohttp.ClientSession,
+        image_bytes: bytes,
+        room_name: str,
+        personality: str,
+        pickiness: int,
+        timeout: aiohttp.ClientTimeout | None = None,
+        on_partial: PartialCallback | None = None,
+    ) -> Dict[str, Any]:
+        """Answer from the reference frame when possible, else ask the primary."""
+        start_time = time.perf_counter()
+        try:
+            with span(SPAN_PREPROCESS):
+                current = await async_get_cpu_executor(self.hass).async_run(fingerprint, image_bytes)
+        except Exception as err:  # Undecodable frame - let the primary deal with it
+            _LOGGER.debug("Pre-filter could not fingerprint frame for %s: %s", room_name, err)
+            current = None
+
+        if current is not None and self._matches_reference(current):
+            self._saved += 1
+            _LOGGER.debug("Pre-filter: %s unchanged since last tidy check, skipping analysis", room_name)
+            return {
+                "tidy": True,
+                "tasks": [],
+                "comment": "Nothing has changed since the last tidy check.",
+                "severity": "low",
+                "gated": True,
+                "api_response_time": time.perf_counter() - start_time,
+                "image_size": len(image_bytes),
+            }
+
+        self._passed += 1
+        result = await self._primary.analyze_image(
+            session=session,
+            image_bytes=image_bytes,
+            room_name=room_name,
+            personality=personality,
+            pickiness=pickiness,
+            timeout=timeout,
+            on_partial=on_partial,
+        )
+        if current is not None:
+            self._reference = current if result.get("tidy") else None
+        return result
+
+    def _matches_reference(self, current: Fingerprint) -> bool:
+        reference = self._reference
+        if reference is None:
+            return False
+        if current.edge_density > reference.edge_density * (1 + PRE_FILTER_EDGE_TOLERANCE) + 0.005:
+            return False
+        return difference(reference, current) <= self._threshold
+
+
+def _create_gemini_backend(hass: HomeAssistant, data: Mapping[str, Any]) -> VisionBackend:
+    settings = get_settings(hass)
+    file_store = async_get_file_store(hass) if settings[CONF_FILE_UPLOAD] else None
+    result_cache = async_get_result_cache(hass) if settings[CONF_RESULT_CACHE] else None
+    return GeminiClient(
+        data.get(CONF_API_KEY) or "",
+        file_store=file_store,
+        result_cache=result_cache,
+        # Always counted, so the budget sensor shows usage even without a cap
+        budget=async_get_request_budget(hass),
+        executor=async_get_cpu_executor(hass),
+    )
+
+
+def _create_local_backend(hass: HomeAssistant, data: Mapping[str, Any]) -> VisionBackend:
+    # Imported lazily so the optional numpy/onnxruntime imports only happen when used
+    from .local_model import LocalOnnxBackend
+
+    model_path = data.get(CONF_LOCAL_MODEL_PATH) or DEFAULT_LOCAL_MODEL_PATH
+    return LocalOnnxBackend(hass, hass.config.path(model_path))
+
+
+register_backend(BACKEND_GEMINI, _create_gemini_backend)
+register_backend(BACKEND_LOCAL, _create_local_backend)
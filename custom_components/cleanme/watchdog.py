@@ -0,0 +1,214 @@
+"""Opt-in event loop watchdog for CleanMe code paths.
+
+A daemon thread posts a heartbeat to the event loop every half threshold.
+If a heartbeat has not run for longer than the threshold, the loop is
+blocked: the watchdog samples the loop thread's stack once per stall, and
+logs it when the loop recovers, together with the CleanMe operations
+that were active (check, setup, dashboard...). Stalls whose stack has no
+CleanMe frame are only logged at debug level, since they belong to
+someone else even if a CleanMe operation happened to be awaiting.
+
+CleanMe code marks its work with ``with operation("..."):``, which costs
+a dict insert and is always on; the thread only runs when enabled.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DOMAIN, CONF_LOOP_WATCHDOG, CONF_LOOP_WATCHDOG_THRESHOLD
+from .settings import get_settings
+from .timing import LatencyHistogram
+
+_LOGGER = logging.getLogger(__name__)
+
+DATA_LOOP_WATCHDOG = "loop_watchdog"
+
+# Frames shown per stack sample
+STACK_LIMIT = 25
+# Stack samples kept for diagnostics
+RECENT_STALLS = 10
+
+_PACKAGE_PATH = os.path.dirname(__file__)
+
+# Active CleanMe operations, keyed by a per-call token. Written on the loop
+# thread, read (as a copy) by the watchdog thread.
+_active_operations: Dict[int, str] = {}
+_tokens = itertools.count()
+
+
+@contextmanager
+def operation(name: str) -> Iterator[None]:
+    """Mark the enclosed block as a CleanMe operation for stall attribution."""
+    token = next(_tokens)
+    _active_operations[token] = name
+    try:
+        yield
+    finally:
+        _active_operations.pop(token, None)
+
+
+def active_operations() -> List[str]:
+    """Return the names of CleanMe operations currently running."""
+    return list(dict(_active_operations).values())
+
+
+class LoopWatchdog:
+    """Detect event loop stalls and attribute them to CleanMe operations."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, threshold: float) -> None:
+        """Initialize; must be called on the event loop thread."""
+        self._loop = loop
+        self._loop_thread_id = threading.get_ident()
+        self._threshold = threshold
+        self._interval = max(threshold / 2, 0.01)
+        self._last_beat = time.perf_counter()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+        self.lag = LatencyHistogram()
+        # Guards stall counters, written by the watchdog thread
+        self._lock = threading.Lock()
+        self._stalls: Dict[str, int] = {}
+        self._max_stall = 0.0
+        self._recent: List[Dict[str, Any]] = []
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """Return stall counters, lag percentiles and recent stack samples."""
+        with self._lock:
+            return {
+                "threshold_ms": round(self._threshold * 1000),
+                "stalls": dict(self._stalls),
+                "max_stall_ms": round(self._max_stall * 1000, 1),
+                "lag": self.lag.summary(),
+                "recent_stalls": list(self._recent),
+            }
+
+    def start(self) -> None:
+        """Start the watchdog thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._last_beat = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="cleanme-loop-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the watchdog thread."""
+        self._stop.set()
+        self._thread = None
+
+    def _beat(self, posted_at: float) -> None:
+        # Runs on the loop; how late it runs is the loop lag
+        self._last_beat = time.perf_counter()
+        self.lag.add(self._last_beat - posted_at)
+
+    def _run(self) -> None:
+        stall: Dict[str, Any] | None = None
+        while not self._stop.wait(self._interval):
+            since_beat = time.perf_counter() - self._last_beat
+
+            if since_beat > self._threshold:
+                if stall is None:
+                    stall = self._sample()
+                # A heartbeat is already queued; wait for the loop to run it
+                continue
+
+            if stall is not None:
+                stall["duration"] = self._last_beat - stall["started"]
+                self._report(stall)
+                stall = None
+
+            try:
+                self._loop.call_soon_threadsafe(self._beat, time.perf_counter())
+            except RuntimeError:  # Loop closed
+                return
+
+    def _sample(self) -> Dict[str, Any]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame, limit=STACK_LIMIT) if frame is not None else []
+
+        # The running coroutine chain is linked through f_back, so any CleanMe
+        # caller of the blocking code shows up here even beyond STACK_LIMIT
+        cleanme_frames = []
+        while frame is not None:
+            if frame.f_code.co_filename.startswith(_PACKAGE_PATH):
+                cleanme_frames.append(
+                    f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_lineno} in {frame.f_code.co_name}"
+                )
+            frame = frame.f_back
+
+        return {
+            "started": self._last_beat,
+            "operations": active_operations(),
+            "stack": stack,
+            "cleanme_frames": cleanme_frames,
+        }
+
+    def _report(self, stall: Dict[str, Any]) -> None:
+        duration = stall["duration"]
+        operations = stall["operations"]
+        ours = bool(stall["cleanme_frames"])
+
+        with self._lock:
+            self._max_stall = max(self._max_stall, duration)
+            for name in (operations or ["unmarked"]) if ours else ["other"]:
+                self._stalls[name] = self._stalls.get(name, 0) + 1
+            if ours:
+                self._recent = [
+                    *self._recent[-(RECENT_STALLS - 1):],
+                    {
+                        "duration_ms": round(duration * 1000, 1),
+                        "operations": operations,
+                        "frames": stall["cleanme_frames"],
+                    },
+                ]
+
+        if not ours:
+            _LOGGER.debug("Event loop blocked for %.0f ms outside CleanMe", duration * 1000)
+            return
+
+        _LOGGER.warning(
+            "CleanMe blocked the event loop for %.0f ms during %s. Stack sample:\n%s",
+            duration * 1000,
+            ", ".join(operations) or "unmarked CleanMe code",
+            "".join(stall["stack"]),
+        )
+
+
+@callback
+def async_setup_loop_watchdog(hass: HomeAssistant) -> LoopWatchdog | None:
+    """Start the watchdog if enabled in settings."""
+    settings = get_settings(hass)
+    if not settings[CONF_LOOP_WATCHDOG]:
+        return None
+
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    watchdog: LoopWatchdog | None = domain_data.get(DATA_LOOP_WATCHDOG)
+    if watchdog is None:
+        watchdog = LoopWatchdog(hass.loop, settings[CONF_LOOP_WATCHDOG_THRESHOLD])
+        domain_data[DATA_LOOP_WATCHDOG] = watchdog
+        watchdog.start()
+        _LOGGER.info(
+            "CleanMe loop watchdog enabled (threshold %.0f ms)",
+            settings[CONF_LOOP_WATCHDOG_THRESHOLD] * 1000,
+        )
+
+        @callback
+        def _stop(event: Event) -> None:
+            watchdog.stop()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, _stop)
+    return watchdog
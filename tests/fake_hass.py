@@ -0,0 +1,162 @@
+"""Lightweight Home Assistant stand-ins for CleanMe benchmarks and soak runs.
+
+FakeHass provides only what CleanMe zones touch (hass.data, config paths,
+the executor, task creation, bus listeners and the event loop thread check
+the dispatcher runs) so hundreds of zones can be set up in milliseconds.
+FakeStore keeps persisted zone state in memory and FakeCamera serves
+synthetic JPEG snapshots. Install them with install_fakes(monkeypatch, camera).
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import random
+import threading
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List
+
+from custom_components.cleanme import coordinator
+from custom_components.cleanme.const import (
+    DOMAIN,
+    CONF_API_KEY,
+    CONF_CAMERA_ENTITY,
+    CONF_CHECK_FREQUENCY,
+)
+from custom_components.cleanme.coordinator import CleanMeZone
+from custom_components.cleanme.gemini_client import GeminiClient
+
+
+class FakeBus:
+    """Records listeners without ever firing them."""
+
+    def __init__(self) -> None:
+        self.listeners: List[tuple[str, Callable[..., Any]]] = []
+
+    def async_listen_once(self, event_type: str, listener: Callable[..., Any]) -> Callable[[], None]:
+        entry = (event_type, listener)
+        self.listeners.append(entry)
+        return lambda: self.listeners.remove(entry)
+
+    def async_listen(self, event_type: str, listener: Callable[..., Any]) -> Callable[[], None]:
+        return self.async_listen_once(event_type, listener)
+
+
+class FakeHass:
+    """The parts of HomeAssistant CleanMe uses."""
+
+    def __init__(self, config_dir: str = "/tmp/cleanme-bench") -> None:
+        self.data: Dict[str, Any] = {}
+        self.bus = FakeBus()
+        # Zones run on the loop of the thread that creates the fake
+        self.loop_thread_id = threading.get_ident()
+        self.config = SimpleNamespace(
+            config_dir=config_dir,
+            debug=False,
+            path=lambda *parts: "/".join((config_dir, *parts)),
+        )
+
+    def verify_event_loop_thread(self, what: str) -> None:
+        if threading.get_ident() != self.loop_thread_id:
+            raise RuntimeError(f"Detected code that calls {what} from a thread other than the event loop")
+
+    def async_add_executor_job(self, target: Callable[..., Any], *args: Any) -> asyncio.Future:
+        return asyncio.get_running_loop().run_in_executor(None, target, *args)
+
+    def async_create_task(self, target: Any, *args: Any, **kwargs: Any) -> asyncio.Task:
+        return asyncio.get_running_loop().create_task(target)
+
+
+class FakeStore:
+    """In-memory replacement for helpers.storage.Store."""
+
+    saved: Dict[str, Any] = {}
+
+    def __init__(self, hass: Any, version: int, key: str, *args: Any, **kwargs: Any) -> None:
+        self.key = key
+        self.writes = 0
+
+    async def async_load(self) -> Any:
+        return FakeStore.saved.get(self.key)
+
+    async def async_save(self, data: Any) -> None:
+        self.writes += 1
+        FakeStore.saved[self.key] = data
+
+    def async_delay_save(self, data_func: Callable[[], Any], delay: float = 0) -> None:
+        FakeStore.saved[self.key] = data_func()
+
+
+def synthetic_jpeg(width: int = 640, height: int = 480, seed: int = 0) -> bytes:
+    """Return a JPEG-looking snapshot; a real JPEG when Pillow is available."""
+    rng = random.Random(seed)
+    try:
+        from PIL import Image, ImageDraw
+    except ImportError:
+        # Gemini stand-ins never decode the image, so plausible bytes are enough
+        body = bytes(rng.getrandbits(8) for _ in range(width * height // 20))
+        return b"\xff\xd8\xff\xe0" + body + b"\xff\xd9"
+
+    image = Image.new("RGB", (width, height), (200, 190, 170))
+    draw = ImageDraw.Draw(image)
+    for _ in range(40):
+        x, y = rng.randrange(width - 20), rng.randrange(height - 20)
+        draw.rectangle((x, y, x + 20, y + 14), fill=(rng.randrange(256), 60, 60))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+class FakeCamera:
+    """Serves one synthetic snapshot per camera entity, with optional delay and failures."""
+
+    def __init__(self, delay: float = 0.0, failure_rate: float = 0.0, seed: int = 0) -> None:
+        self.delay = delay
+        self.failure_rate = failure_rate
+        self.snapshots = 0
+        self.failures = 0
+        self._random = random.Random(seed)
+        self._images: Dict[str, bytes] = {}
+
+    async def async_get_image(self, hass: Any, entity_id: str, *args: Any, **kwargs: Any) -> Any:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            self.failures += 1
+            raise RuntimeError(f"{entity_id} is unavailable")
+        self.snapshots += 1
+        if entity_id not in self._images:
+            self._images[entity_id] = synthetic_jpeg(seed=len(self._images))
+        return SimpleNamespace(content=self._images[entity_id], content_type="image/jpeg")
+
+
+def install_fakes(monkeypatch: Any, camera: FakeCamera) -> None:
+    """Route zone storage and camera snapshots to the fakes."""
+    FakeStore.saved = {}
+    monkeypatch.setattr(coordinator, "Store", FakeStore)
+    monkeypatch.setattr(coordinator, "async_get_image", camera.async_get_image)
+
+
+async def async_create_zones(
+    hass: FakeHass, count: int, api_base: str | None = None, check_frequency: str = "manual"
+) -> List[CleanMeZone]:
+    """Create and set up count zones, pointing Gemini at api_base if given."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    zones = []
+    for index in range(count):
+        entry_id = f"entry_{index}"
+        zone = CleanMeZone(
+            hass,
+            entry_id,
+            f"Room {index}",
+            {
+                CONF_CAMERA_ENTITY: f"camera.room_{index}",
+                CONF_API_KEY: "bench-key",
+                CONF_CHECK_FREQUENCY: check_frequency,
+            },
+        )
+        if api_base is not None:
+            zone._backend = GeminiClient("bench-key", api_base=api_base)
+        await zone.async_setup()
+        domain_data[entry_id] = zone
+        zones.append(zone)
+    return zones
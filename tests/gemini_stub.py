@@ -0,0 +1,214 @@
+"""Local stand-in for the Gemini REST API used by CleanMe tests.
+
+Implements just enough of generateContent, streamGenerateContent (SSE)
+and resumable File API uploads for the integration's client code, and records every request so tests can assert
+on what was sent. Latency and an error rate can be injected for
+benchmarks; batched requests get one answer per zone.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import random
+from typing import Any, Dict, List
+
+from aiohttp import web
+
+# aiohttp rejects bodies over 1 MiB by default; Gemini takes inline requests
+# up to 20 MB and File API chunks of several MiB
+MAX_REQUEST_SIZE = 32 * 1024 * 1024
+
+DEFAULT_ANALYSIS = {
+    "tidy": False,
+    "tasks": ["Put the pizza box in the recycling"],
+    "comment": "Almost there!",
+    "severity": "low",
+}
+
+
+class GeminiStubServer:
+    """Minimal Gemini API server bound to localhost on a random port."""
+
+    def __init__(
+        self,
+        analysis: Dict[str, Any] | None = None,
+        stream_chunk_chars: int = 8,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        error_status: int = 503,
+        slow_rate: float = 0.0,
+        slow_latency: float = 1.0,
+        record_requests: bool = True,
+    ) -> None:
+        self.analysis = analysis or DEFAULT_ANALYSIS
+        self.stream_chunk_chars = stream_chunk_chars
+        # Seconds added before every generate reply, and the share of replies that fail
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        # Share of replies delayed by slow_latency instead of latency
+        self.slow_rate = slow_rate
+        self.slow_latency = slow_latency
+        self._random = random.Random(seed)
+        # Soak runs turn recording off: every request carries a whole snapshot
+        self.record_requests = record_requests
+        self.requests: List[Dict[str, Any]] = []
+        # Uploaded files by name, and resumable upload sessions by id
+        self.files: Dict[str, Dict[str, Any]] = {}
+        self.uploads: Dict[str, bytearray] = {}
+        self._ids = itertools.count(1)
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+
+    async def __aenter__(self) -> "GeminiStubServer":
+        app = web.Application(client_max_size=MAX_REQUEST_SIZE)
+        app.router.add_post("/v1beta/models/{model}:generateContent", self._generate_content)
+        app.router.add_post("/v1beta/models/{model}:streamGenerateContent", self._stream_generate_content)
+        app.router.add_get("/v1beta/models/{model}", self._get_model)
+        app.router.add_post("/upload/v1beta/files", self._start_upload)
+        app.router.add_post("/upload/v1beta/files/sessions/{upload_id}", self._upload_chunk)
+        app.router.add_delete("/v1beta/files/{file_id}", self._delete_file)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://127.0.0.1:{port}/v1beta"
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def requests_to(self, suffix: str) -> List[Dict[str, Any]]:
+        """Return recorded requests whose path ends with suffix."""
+        return [request for request in self.requests if request["path"].endswith(suffix)]
+
+    async def _record(self, request: web.Request) -> Dict[str, Any]:
+        body = await request.json() if request.can_read_body else {}
+        if self.record_requests:
+            self.requests.append(
+                {"method": request.method, "path": request.path, "query": dict(request.query), "body": body}
+            )
+        return body
+
+    async def _get_model(self, request: web.Request) -> web.Response:
+        await self._record(request)
+        return web.json_response({"name": f"models/{request.match_info['model']}"})
+
+    async def _simulate_load(self) -> web.Response | None:
+        """Apply injected latency; return an error response for injected failures."""
+        slow = self.slow_rate and self._random.random() < self.slow_rate
+        delay = self.slow_latency if slow else self.latency
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            return web.json_response(
+                {"error": {"code": self.error_status, "message": "Injected failure"}},
+                status=self.error_status,
+            )
+        return None
+
+    def _reply_for(self, body: Dict[str, Any]) -> Any:
+        schema = body.get("generationConfig", {}).get("responseSchema", {})
+        if schema.get("type") != "ARRAY":
+            return self.analysis
+        images = sum(
+            "inline_data" in part or "file_data" in part
+            for part in body.get("contents", [{}])[0].get("parts", [])
+        )
+        return [{"zone": f"Z{index + 1}", **self.analysis} for index in range(images)]
+
+    async def _generate_content(self, request: web.Request) -> web.Response:
+        body = await self._record(request)
+        if any(uri not in self._file_uris() for uri in self._referenced_files(body)):
+            return web.json_response(
+                {"error": {"code": 403, "message": "File not found or no permission"}}, status=403
+            )
+        failure = await self._simulate_load()
+        if failure is not None:
+            return failure
+        return web.json_response(
+            {"candidates": [{"content": {"parts": [{"text": json.dumps(self._reply_for(body))}]}}]}
+        )
+
+    async def _stream_generate_content(self, request: web.Request) -> web.StreamResponse:
+        await self._record(request)
+        failure = await self._simulate_load()
+        if failure is not None:
+            return failure
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        text = json.dumps(self.analysis)
+        for offset in range(0, len(text), self.stream_chunk_chars):
+            chunk = {"candidates": [{"content": {"parts": [{"text": text[offset:offset + self.stream_chunk_chars]}]}}]}
+            await response.write(f"data: {json.dumps(chunk)}\r\n\r\n".encode())
+        await response.write_eof()
+        return response
+
+    def _file_uris(self) -> set:
+        return {file["uri"] for file in self.files.values()}
+
+    @staticmethod
+    def _referenced_files(body: Dict[str, Any]) -> List[str]:
+        return [
+            part["file_data"]["file_uri"]
+            for content in body.get("contents", [])
+            for part in content.get("parts", [])
+            if "file_data" in part
+        ]
+
+    async def _start_upload(self, request: web.Request) -> web.Response:
+        await self._record(request)
+        upload_id = str(next(self._ids))
+        self.uploads[upload_id] = bytearray()
+        upload_url = f"{self.base_url.rsplit('/v1beta', 1)[0]}/upload/v1beta/files/sessions/{upload_id}"
+        return web.json_response(
+            {},
+            headers={
+                "X-Goog-Upload-URL": upload_url,
+                "X-Goog-Upload-Status": "active",
+                "X-Goog-Upload-Chunk-Granularity": str(256 * 1024),
+            },
+        )
+
+    async def _upload_chunk(self, request: web.Request) -> web.Response:
+        upload_id = request.match_info["upload_id"]
+        received = self.uploads.get(upload_id)
+        command = request.headers.get("X-Goog-Upload-Command", "")
+        chunk = await request.read()
+        self.requests.append(
+            {"method": request.method, "path": request.path, "command": command, "size": len(chunk)}
+        )
+        if received is None:
+            return web.json_response({"error": {"code": 404, "message": "no such upload"}}, status=404)
+        if command == "query":
+            return web.json_response({}, headers={"X-Goog-Upload-Size-Received": str(len(received))})
+        if int(request.headers.get("X-Goog-Upload-Offset", -1)) != len(received):
+            return web.json_response({"error": {"code": 400, "message": "bad offset"}}, status=400)
+        received.extend(chunk)
+        if "finalize" not in command:
+            return web.json_response({}, headers={"X-Goog-Upload-Status": "active"})
+
+        del self.uploads[upload_id]
+        name = f"files/stub{next(self._ids)}"
+        self.files[name] = {
+            "name": name,
+            "uri": f"{self.base_url}/{name}",
+            "mimeType": "image/jpeg",
+            "sizeBytes": str(len(received)),
+            "state": "ACTIVE",
+            "data": bytes(received),
+        }
+        file = {key: value for key, value in self.files[name].items() if key != "data"}
+        return web.json_response({"file": file}, headers={"X-Goog-Upload-Status": "final"})
+
+    async def _delete_file(self, request: web.Request) -> web.Response:
+        await self._record(request)
+        name = f"files/{request.match_info['file_id']}"
+        if self.files.pop(name, None) is None:
+            return web.json_response({"error": {"code": 404, "message": "not found"}}, status=404)
+        return web.json_response({})
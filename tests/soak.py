@@ -0,0 +1,301 @@
+"""Soak harness: many zones, days of simulated time, injected failures.
+
+Zones run on FakeHass with their auto-check timers driven by a
+VirtualClock, so a simulated day passes as fast as the checks themselves
+complete. The camera fails at a configurable rate and the Gemini stand-in
+returns 429s and slow replies. Every simulated hour the harness samples
+traced memory, live asyncio tasks and event-loop lag, then prints a
+summary at the end.
+
+    python tests/soak.py --zones 300 --days 3 --frequency 4x
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Awaitable, Callable, Dict, List
+
+import pytest
+
+if __name__ == "__main__":
+    sys.path[:0] = [str(Path(__file__).resolve().parent.parent), str(Path(__file__).resolve().parent)]
+
+from custom_components.cleanme import coordinator  # noqa: E402
+from custom_components.cleanme.const import DOMAIN  # noqa: E402
+from custom_components.cleanme.session import async_close_session_manager  # noqa: E402
+from custom_components.cleanme.settings import SETTINGS_SCHEMA  # noqa: E402
+from custom_components.cleanme.timing import LatencyHistogram  # noqa: E402
+from fake_hass import FakeCamera, FakeHass, async_create_zones, install_fakes  # noqa: E402
+from gemini_stub import GeminiStubServer  # noqa: E402
+
+LAG_PROBE_INTERVAL = 0.01  # seconds between event-loop lag probes
+# Every zone checks at least once a day, allocating its frames and histograms
+WARMUP_HOURS = 24
+
+
+class VirtualClock:
+    """Stands in for utcnow() and async_track_time_interval()."""
+
+    def __init__(self, start: datetime | None = None) -> None:
+        self.now = start or datetime(2025, 1, 1, tzinfo=timezone.utc)
+        # [next due, interval, action]
+        self._timers: List[List[Any]] = []
+
+    def utcnow(self) -> datetime:
+        return self.now
+
+    def async_track_time_interval(
+        self,
+        hass: Any,
+        action: Callable[[datetime], Awaitable[None]],
+        interval: timedelta,
+        **kwargs: Any,
+    ) -> Callable[[], None]:
+        timer = [self.now + interval, interval, action]
+        self._timers.append(timer)
+
+        def _cancel() -> None:
+            if timer in self._timers:
+                self._timers.remove(timer)
+
+        return _cancel
+
+    @property
+    def timer_count(self) -> int:
+        return len(self._timers)
+
+    async def advance(self, delta: timedelta) -> int:
+        """Fire every timer due within delta; timers due together run concurrently.
+
+        Returns the number of callbacks fired.
+        """
+        target = self.now + delta
+        fired = 0
+        while True:
+            due = [timer for timer in self._timers if timer[0] <= target]
+            if not due:
+                break
+            self.now = min(timer[0] for timer in due)
+            batch = [timer for timer in due if timer[0] == self.now]
+            for timer in batch:
+                timer[0] += timer[1]
+            await asyncio.gather(*(timer[2](self.now) for timer in batch))
+            fired += len(batch)
+        self.now = target
+        return fired
+
+
+def install_clock(monkeypatch: Any, clock: VirtualClock) -> None:
+    """Drive coordinator timers and timestamps from the virtual clock."""
+    monkeypatch.setattr(coordinator, "utcnow", clock.utcnow)
+    monkeypatch.setattr(
+        coordinator,
+        "event",
+        SimpleNamespace(async_track_time_interval=clock.async_track_time_interval),
+    )
+
+
+@dataclass
+class HourSample:
+    hour: int
+    checks: int
+    traced_bytes: int
+    tasks: int
+    lag_p99_ms: float | None
+
+
+@dataclass
+class SoakReport:
+    """Outcome of a soak run."""
+
+    zones: int
+    simulated_hours: int
+    wall_seconds: float = 0.0
+    checks: int = 0
+    errors: Dict[str, int] = field(default_factory=dict)
+    samples: List[HourSample] = field(default_factory=list)
+    lag: LatencyHistogram = field(default_factory=lambda: LatencyHistogram(window=100_000))
+    peak_traced_bytes: int = 0
+    leftover_tasks: int = 0
+
+    @property
+    def memory_growth_bytes(self) -> int:
+        """Traced memory growth from the end of the first day to the last hourly sample.
+
+        Runs of a day or less measure from the first hour instead.
+        """
+        if len(self.samples) < 2:
+            return 0
+        start = self.samples[WARMUP_HOURS - 1] if len(self.samples) > WARMUP_HOURS else self.samples[0]
+        return self.samples[-1].traced_bytes - start.traced_bytes
+
+    @property
+    def max_tasks(self) -> int:
+        return max((sample.tasks for sample in self.samples), default=0)
+
+    def format(self) -> str:
+        lag = self.lag.summary()
+        lines = [
+            f"Soak: {self.zones} zones, {self.simulated_hours} simulated hours in {self.wall_seconds:.1f}s",
+            f"Checks: {self.checks}  errors: "
+            + (", ".join(f"{kind}={count}" for kind, count in sorted(self.errors.items())) or "none"),
+            f"Memory: peak {self.peak_traced_bytes / 1024:.0f} KiB, "
+            f"growth {self.memory_growth_bytes / 1024:+.0f} KiB (after warm-up)",
+            f"Tasks: max {self.max_tasks} live, {self.leftover_tasks} left over",
+            f"Loop lag: p50 {lag['p50_ms']} ms, p99 {lag['p99_ms']} ms, max {lag['max_ms']} ms",
+        ]
+        return "\n".join(lines)
+
+
+def _error_kind(message: str) -> str:
+    if "camera" in message:
+        return "camera"
+    if "quota exceeded" in message or "429" in message:
+        return "rate_limited"
+    if "Network error" in message or "Timeout" in message:
+        return "network"
+    return "other"
+
+
+async def _async_probe_lag(histograms: List[LatencyHistogram], stop: asyncio.Event) -> None:
+    """Measure how late a short sleep wakes up, into every histogram given."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(LAG_PROBE_INTERVAL)
+        lag = max(0.0, loop.time() - start - LAG_PROBE_INTERVAL)
+        for histogram in histograms:
+            histogram.add(lag)
+
+
+async def async_run_soak(
+    monkeypatch: Any,
+    zones: int = 100,
+    days: float = 1,
+    frequency: str = "4x",
+    camera_failure_rate: float = 0.02,
+    rate_limit_rate: float = 0.05,
+    slow_rate: float = 0.02,
+    slow_latency: float = 0.2,
+    latency: float = 0.0,
+) -> SoakReport:
+    """Run a soak and return its report."""
+    clock = VirtualClock()
+    camera = FakeCamera(failure_rate=camera_failure_rate, seed=1)
+    install_fakes(monkeypatch, camera)
+    install_clock(monkeypatch, clock)
+
+    hours = int(days * 24)
+    report = SoakReport(zones=zones, simulated_hours=hours)
+
+    tracemalloc.start()
+    wall_start = time.perf_counter()
+    stop = asyncio.Event()
+    # [all-time lag, lag for the current hour]
+    lag_histograms = [report.lag, LatencyHistogram()]
+    probe = asyncio.create_task(_async_probe_lag(lag_histograms, stop))
+    baseline_tasks = len(asyncio.all_tasks())
+
+    async with GeminiStubServer(
+        latency=latency,
+        error_rate=rate_limit_rate,
+        error_status=429,
+        slow_rate=slow_rate,
+        slow_latency=slow_latency,
+        seed=2,
+        record_requests=False,
+    ) as stub:
+        hass = FakeHass()
+        hass.data[DOMAIN] = {"settings": SETTINGS_SCHEMA({})}
+        zone_list = await async_create_zones(
+            hass, zones, api_base=stub.base_url, check_frequency=frequency
+        )
+        for zone in zone_list:
+            zone.add_listener(_check_counter(zone, report))
+
+        try:
+            for hour in range(1, hours + 1):
+                lag_histograms[1] = LatencyHistogram()
+                await clock.advance(timedelta(hours=1))
+
+                current, peak = tracemalloc.get_traced_memory()
+                report.peak_traced_bytes = max(report.peak_traced_bytes, peak)
+                p99 = lag_histograms[1].percentile(99)
+                report.samples.append(
+                    HourSample(
+                        hour=hour,
+                        checks=report.checks,
+                        traced_bytes=current,
+                        tasks=len(asyncio.all_tasks()) - baseline_tasks,
+                        lag_p99_ms=round(p99 * 1000, 2) if p99 is not None else None,
+                    )
+                )
+        finally:
+            for zone in zone_list:
+                await zone.async_unload()
+            await async_close_session_manager(hass)
+
+    stop.set()
+    await probe
+    # The probe was part of the baseline and has finished now
+    report.leftover_tasks = max(0, len(asyncio.all_tasks()) - (baseline_tasks - 1))
+    report.wall_seconds = time.perf_counter() - wall_start
+    tracemalloc.stop()
+    return report
+
+
+def _check_counter(zone: Any, report: SoakReport) -> Callable[[], None]:
+    """Return a zone listener that counts finished checks and their errors."""
+    last_seen: List[Any] = [zone.state.last_checked]
+
+    def _listener() -> None:
+        state = zone.state
+        if state.last_checked is None or state.last_checked == last_seen[0] or state.partial:
+            return
+        last_seen[0] = state.last_checked
+        report.checks += 1
+        if state.last_error:
+            kind = _error_kind(state.last_error)
+            report.errors[kind] = report.errors.get(kind, 0) + 1
+
+    return _listener
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--zones", type=int, default=100)
+    parser.add_argument("--days", type=float, default=1)
+    parser.add_argument("--frequency", default="4x", choices=["1x", "2x", "4x"])
+    parser.add_argument("--camera-failure-rate", type=float, default=0.02)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.05)
+    parser.add_argument("--slow-rate", type=float, default=0.02)
+    parser.add_argument("--slow-latency", type=float, default=0.2)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        report = asyncio.run(
+            async_run_soak(
+                monkeypatch,
+                zones=args.zones,
+                days=args.days,
+                frequency=args.frequency,
+                camera_failure_rate=args.camera_failure_rate,
+                rate_limit_rate=args.rate_limit_rate,
+                slow_rate=args.slow_rate,
+                slow_latency=args.slow_latency,
+                latency=args.latency,
+            )
+        )
+    print(report.format())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Test activity-aware scheduling of zone checks."""
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.cleanme import coordinator  # noqa: E402
+from custom_components.cleanme.const import (  # noqa: E402
+    CONF_ACTIVITY_ENTITIES,
+    CONF_API_KEY,
+    CONF_CAMERA_ENTITY,
+    CONF_QUIET_PERIOD,
+)
+from custom_components.cleanme.coordinator import CleanMeZone  # noqa: E402
+
+from fake_hass import FakeHass  # noqa: E402
+
+MOTION = "binary_sensor.playroom_motion"
+
+
+class FakeStates:
+    def __init__(self):
+        self.states = {}
+
+    def get(self, entity_id):
+        return self.states.get(entity_id)
+
+    def set(self, entity_id, state):
+        self.states[entity_id] = SimpleNamespace(entity_id=entity_id, state=state)
+        return SimpleNamespace(data={"new_state": self.states[entity_id]})
+
+
+@pytest.fixture
+def zone(monkeypatch):
+    captures = []
+
+    async def _capture(self, now):
+        captures.append(self.name)
+        self._activity_since_capture = False
+        return None
+
+    monkeypatch.setattr(CleanMeZone, "_async_capture_image", _capture)
+    hass = FakeHass()
+    hass.states = FakeStates()
+    zone = CleanMeZone(
+        hass,
+        "entry_playroom",
+        "Playroom",
+        {
+            CONF_CAMERA_ENTITY: "camera.playroom",
+            CONF_API_KEY: "key",
+            CONF_ACTIVITY_ENTITIES: [MOTION],
+            CONF_QUIET_PERIOD: 15,
+        },
+    )
+    return zone, captures
+
+
+def test_auto_checks_wait_for_finished_activity(zone):
+    zone, captures = zone
+    counts = []
+
+    async def _run():
+        # Nothing happened since the last snapshot
+        zone._activity_since_capture = False
+        await zone.async_request_check(reason="auto")
+        # Someone is still in the room
+        zone._handle_activity_event(zone.hass.states.set(MOTION, "on"))
+        await zone.async_request_check(reason="auto")
+        # Manual checks always run
+        await zone.async_request_check(reason="manual")
+        counts.append(len(captures))
+        zone._activity_since_capture = True
+        zone.hass.states.set(MOTION, "off")
+        await zone.async_request_check(reason="auto")
+        counts.append(len(captures))
+
+    asyncio.run(_run())
+
+    assert counts == [1, 2]
+    assert zone.idle_skips == 2
+
+
+def test_check_runs_after_quiet_period(zone, monkeypatch):
+    zone, captures = zone
+    scheduled = []
+
+    def _call_later(hass, delay, action):
+        scheduled.append((delay, action))
+        return lambda: scheduled.remove((delay, action))
+
+    monkeypatch.setattr(coordinator.event, "async_call_later", _call_later)
+
+    async def _run():
+        zone._activity_since_capture = False
+        zone._handle_activity_event(zone.hass.states.set(MOTION, "on"))
+        assert not zone.quiet_check_pending
+
+        zone._handle_activity_event(zone.hass.states.set(MOTION, "off"))
+        assert zone.quiet_check_pending
+        # Activity resumed: the pending check is cancelled and rescheduled later
+        zone._handle_activity_event(zone.hass.states.set(MOTION, "on"))
+        assert not scheduled
+        zone._handle_activity_event(zone.hass.states.set(MOTION, "off"))
+
+        delay, action = scheduled[0]
+        assert delay == timedelta(minutes=15)
+        await action(None)
+
+    asyncio.run(_run())
+
+    assert captures == ["Playroom"]
+    assert not zone.quiet_check_pending
+    assert not zone.activity_since_capture
@@ -0,0 +1,78 @@
+"""Test the adaptive check frequency model."""
+import importlib.util
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+
+ADAPTIVE_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "cleanme" / "adaptive.py"
+
+START = datetime(2024, 3, 1, 8, tzinfo=timezone.utc)
+
+
+def load_adaptive_module():
+    spec = importlib.util.spec_from_file_location("cleanme_adaptive", ADAPTIVE_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    # dataclasses resolves string annotations through sys.modules
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _observe(model, observations):
+    for hours, score in observations:
+        model.observe(START + timedelta(hours=hours), score)
+
+
+def _next_check_in(model, hours, score):
+    return model.next_check_in(START + timedelta(hours=hours), score, 50, 1, 24)
+
+
+def test_volatile_rooms_are_checked_sooner_than_stable_ones():
+    adaptive = load_adaptive_module()
+    playroom, guest_room = adaptive.MessinessModel(), adaptive.MessinessModel()
+    # Playroom: 60 points within 4 hours of every tidy-up
+    _observe(playroom, [(0, 0), (4, 60), (5, 0), (9, 60), (10, 0)])
+    # Guest room: tidy at every check
+    _observe(guest_room, [(0, 0), (12, 0), (24, 0), (36, 0)])
+
+    assert playroom.rate == pytest.approx(15)
+    assert guest_room.rate == 0
+    assert _next_check_in(playroom, 10, 0) == pytest.approx(50 / 15)
+    assert _next_check_in(guest_room, 36, 0) == 24
+
+
+def test_lingering_mess_is_learned_once():
+    adaptive = load_adaptive_module()
+    model = adaptive.MessinessModel()
+    _observe(model, [(0, 0), (2, 20), (6, 40), (12, 60)])
+
+    assert model.samples == 1
+    assert model.rate == pytest.approx(10)
+
+
+def test_next_check_is_bounded():
+    adaptive = load_adaptive_module()
+    model = adaptive.MessinessModel()
+    assert _next_check_in(model, 0, 0) == 24  # nothing learned yet
+
+    _observe(model, [(0, 0), (1, 100), (2, 0)])
+    assert _next_check_in(model, 2, 0) == 1  # would be 30 minutes
+    assert _next_check_in(model, 3, 60) == 24  # already past the threshold
+
+    model.mark_clean(START + timedelta(hours=3))
+    assert model.reference == START + timedelta(hours=3)
+
+
+def test_round_trip():
+    adaptive = load_adaptive_module()
+    model = adaptive.MessinessModel()
+    _observe(model, [(0, 0), (3, 30), (4, 0)])
+
+    restored = adaptive.MessinessModel.from_dict(model.as_dict())
+
+    assert restored == model
+    assert adaptive.MessinessModel.from_dict(None) == adaptive.MessinessModel()
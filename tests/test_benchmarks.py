@@ -0,0 +1,162 @@
+"""Performance benchmarks for CleanMe (pytest-benchmark).
+
+Run with: pytest tests/test_benchmarks.py --benchmark-only
+
+Zones run against FakeHass, FakeCamera and the local Gemini stand-in, so
+numbers measure CleanMe's own overhead plus the injected API latency.
+Each benchmark asserts a generous regression threshold on the mean.
+"""
+import asyncio
+import tracemalloc
+from datetime import datetime, timezone
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("aiohttp")
+pytest.importorskip("pytest_benchmark")
+
+from custom_components.cleanme import dashboard  # noqa: E402
+from custom_components.cleanme.const import DOMAIN, CONF_BATCH_SIZE  # noqa: E402
+from custom_components.cleanme.coordinator import async_check_all_zones  # noqa: E402
+from custom_components.cleanme.sensor import (  # noqa: E402
+    CleanMeNextScheduledCheckSensor,
+    CleanMeSystemStatusSensor,
+    CleanMeZonesNeedingAttentionSensor,
+)
+from custom_components.cleanme.session import async_close_session_manager  # noqa: E402
+from custom_components.cleanme.settings import SETTINGS_SCHEMA  # noqa: E402
+from fake_hass import FakeCamera, FakeHass, async_create_zones, install_fakes  # noqa: E402
+from gemini_stub import GeminiStubServer  # noqa: E402
+
+# Regression thresholds (seconds, mean per round)
+STARTUP_THRESHOLDS = {1: 0.01, 10: 0.05, 100: 0.5, 500: 2.5}
+DASHBOARD_THRESHOLD_500 = 0.25
+GLOBAL_SENSORS_THRESHOLD_500 = 0.05
+API_LATENCY = 0.02
+CHECK_ALL_ZONES = 20
+ZONE_MEMORY_THRESHOLD = 32 * 1024  # bytes per zone, backend and latency windows included
+MEMORY_ZONES = 500
+CHORES = ("Make the bed", "Put away the dishes", "Fold the laundry", "Empty the bin", "Clear the desk")
+
+
+@pytest.fixture
+def camera(monkeypatch):
+    camera = FakeCamera()
+    install_fakes(monkeypatch, camera)
+    return camera
+
+
+def _populated_hass(count: int) -> FakeHass:
+    hass = FakeHass()
+    asyncio.run(async_create_zones(hass, count))
+    return hass
+
+
+def _assert_mean_below(benchmark, threshold):
+    """Check the mean run time; --benchmark-disable runs the code once and keeps no stats."""
+    if benchmark.stats is not None:
+        assert benchmark.stats.stats.mean < threshold
+
+
+@pytest.mark.parametrize("count", sorted(STARTUP_THRESHOLDS))
+def test_startup_time(benchmark, camera, count):
+    """Time creating and setting up count zones (storage load included)."""
+
+    def _startup():
+        asyncio.run(async_create_zones(FakeHass(), count))
+
+    benchmark.pedantic(_startup, rounds=5, iterations=1)
+    _assert_mean_below(benchmark, STARTUP_THRESHOLDS[count])
+
+
+def test_dashboard_generation_500_zones(benchmark, camera):
+    hass = _populated_hass(500)
+
+    config = benchmark(dashboard.generate_dashboard_config, hass)
+
+    assert len(config["cards"]) > 500
+    _assert_mean_below(benchmark, DASHBOARD_THRESHOLD_500)
+
+
+def test_global_sensor_update_500_zones(benchmark, camera):
+    """Time computing every global sensor's state and attributes once."""
+    hass = _populated_hass(500)
+    sensors = [
+        CleanMeSystemStatusSensor(hass),
+        CleanMeZonesNeedingAttentionSensor(hass),
+        CleanMeNextScheduledCheckSensor(hass),
+    ]
+
+    def _update():
+        for sensor in sensors:
+            sensor.native_value
+            sensor.extra_state_attributes
+
+    benchmark(_update)
+    _assert_mean_below(benchmark, GLOBAL_SENSORS_THRESHOLD_500)
+
+
+@pytest.mark.parametrize("batch_size", [1, 4])
+def test_check_all_throughput(benchmark, camera, batch_size):
+    """Time check_all over CHECK_ALL_ZONES zones against a stub with latency and errors."""
+    results = {}
+
+    async def _run():
+        async with GeminiStubServer(latency=API_LATENCY, error_rate=0.05) as stub:
+            hass = FakeHass()
+            hass.data[DOMAIN] = {"settings": SETTINGS_SCHEMA({CONF_BATCH_SIZE: batch_size})}
+            zones = await async_create_zones(hass, CHECK_ALL_ZONES, api_base=stub.base_url)
+            try:
+                await async_check_all_zones(hass, zones)
+            finally:
+                await async_close_session_manager(hass)
+            results["checked"] = sum(zone.state.last_checked is not None for zone in zones)
+            results["requests"] = len(stub.requests)
+
+    benchmark.pedantic(lambda: asyncio.run(_run()), rounds=3, iterations=1)
+
+    benchmark.extra_info["requests"] = results["requests"]
+    assert results["checked"] == CHECK_ALL_ZONES
+    if benchmark.stats is not None:
+        benchmark.extra_info["zones_per_second"] = round(CHECK_ALL_ZONES / benchmark.stats.stats.mean, 1)
+    requests = -(-CHECK_ALL_ZONES // batch_size)
+    # Sequential requests dominate; allow 3x the injected latency per request plus setup
+    _assert_mean_below(benchmark, requests * API_LATENCY * 3 + 0.5)
+
+
+def test_zone_memory_footprint(benchmark, camera):
+    """Measure traced memory per zone once every zone holds a five-task analysis."""
+    footprint = {}
+
+    async def _populate():
+        now = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        zones = await async_create_zones(FakeHass(), MEMORY_ZONES)
+        for index, zone in enumerate(zones):
+            zone._apply_result(
+                {
+                    "tidy": False,
+                    # Fresh string objects, as parsed from each reply
+                    "tasks": ["".join(chore) for chore in CHORES],
+                    "comment": f"Room {index} needs some work.",
+                    "severity": "medium",
+                    "image_size": 40_000,
+                    "api_response_time": 1.2,
+                },
+                now,
+            )
+        return zones
+
+    def _measure():
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            zones = asyncio.run(_populate())
+            footprint["bytes_per_zone"] = (tracemalloc.get_traced_memory()[0] - before) / len(zones)
+        finally:
+            tracemalloc.stop()
+
+    benchmark.pedantic(_measure, rounds=1, iterations=1)
+
+    benchmark.extra_info["bytes_per_zone"] = round(footprint["bytes_per_zone"])
+    assert footprint["bytes_per_zone"] < ZONE_MEMORY_THRESHOLD
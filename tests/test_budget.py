@@ -0,0 +1,96 @@
+"""Test the daily request budget shared by all zones."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.cleanme.budget import RequestBudget  # noqa: E402
+
+
+def _run_check(budget, entry_id, scheduled=True, weights=None):
+    """Acquire the budget for one check and spend one request if admitted."""
+    admitted = asyncio.run(budget.async_acquire(entry_id, scheduled, weights or {entry_id: 1.0}))
+    if admitted:
+        budget.count_request(200)
+    return admitted
+
+
+def test_unlimited_budget_only_counts():
+    budget = RequestBudget(0, 20)
+
+    assert all(_run_check(budget, "kitchen") for _ in range(50))
+    assert budget.remaining is None
+    assert budget.metrics["used_today"] == 50
+
+
+def test_scheduled_checks_leave_the_manual_reserve():
+    budget = RequestBudget(10, 20)
+
+    scheduled = [_run_check(budget, "kitchen") for _ in range(10)]
+    assert scheduled.count(True) == 8
+    assert budget.metrics["deferred_checks"] == 2
+
+    # Manual checks may use the reserve, but not more
+    assert _run_check(budget, "kitchen", scheduled=False)
+    assert _run_check(budget, "kitchen", scheduled=False)
+    assert not _run_check(budget, "kitchen", scheduled=False)
+    assert budget.remaining == 0
+
+
+def test_pool_is_shared_by_weight():
+    budget = RequestBudget(10, 0)
+    weights = {"playroom": 3.0, "guest_room": 1.0}
+
+    playroom = [_run_check(budget, "playroom", weights=weights) for _ in range(10)]
+    # 7.5 of 10 requests; the guest room's 2.5 stay available to it
+    assert playroom.count(True) == 8
+
+    guest_room = [_run_check(budget, "guest_room", weights=weights) for _ in range(5)]
+    assert guest_room.count(True) == 2
+
+
+def test_unclaimed_share_is_redistributed():
+    budget = RequestBudget(10, 0)
+    weights = {"playroom": 1.0, "guest_room": 1.0}
+
+    for _ in range(5):
+        assert _run_check(budget, "guest_room", weights=weights)
+    # The guest room used its share, so the playroom may take everything left
+    assert [_run_check(budget, "playroom", weights=weights) for _ in range(6)].count(True) == 5
+
+
+def test_released_admission_is_given_back():
+    budget = RequestBudget(2, 0)
+
+    assert asyncio.run(budget.async_acquire("kitchen", True, {"kitchen": 1.0}))
+    assert budget.remaining == 1
+    # The check ended without a request (failed snapshot, cached result)
+    budget.release("kitchen")
+    assert budget.remaining == 2
+
+    # Only admissions can be given back
+    budget.release("kitchen")
+    assert budget.remaining == 2
+
+
+def test_quota_error_ends_the_day(monkeypatch):
+    budget = RequestBudget(100, 20)
+    budget.count_request(429)
+
+    assert budget.remaining == 0
+    assert not _run_check(budget, "kitchen", scheduled=False)
+
+    # A new quota day starts from scratch
+    next_day = budget.resets_at.date()
+    monkeypatch.setattr(RequestBudget, "_quota_day", staticmethod(lambda: next_day))
+    assert budget.remaining == 100
+    assert _run_check(budget, "kitchen")
+    assert budget.metrics["used_today"] == 1
+
+
+def test_resets_at_pacific_midnight():
+    resets_at = RequestBudget(100, 20).resets_at
+
+    assert (resets_at.hour, resets_at.minute) == (0, 0)
+    assert str(resets_at.tzinfo) == "America/Los_Angeles"
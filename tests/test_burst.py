@@ -0,0 +1,76 @@
+"""Test burst capture and best-frame selection."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.cleanme import burst  # noqa: E402
+from custom_components.cleanme.imaging import FrameScore  # noqa: E402
+
+
+class BurstCamera:
+    def __init__(self, fail_at=()):
+        self.calls = 0
+        self.fail_at = set(fail_at)
+
+    async def fetch(self):
+        self.calls += 1
+        if self.calls in self.fail_at:
+            raise RuntimeError("camera.kitchen is unavailable")
+        return b"frame-%d" % self.calls
+
+
+def _hass():
+    return SimpleNamespace(data={}, bus=SimpleNamespace(async_listen_once=lambda *args: None))
+
+
+def _score_by_frame(scores):
+    def _score(frames):
+        return [FrameScore(1.0, 1.0, 0.0, scores[frame]) for frame in frames]
+
+    return _score
+
+
+@pytest.fixture(autouse=True)
+def scoring_available(monkeypatch):
+    monkeypatch.setattr(burst, "SCORING_AVAILABLE", True)
+
+
+def test_best_frame_is_returned(monkeypatch):
+    monkeypatch.setattr(
+        burst, "score_frames", _score_by_frame({b"frame-1": 0.2, b"frame-2": 0.9, b"frame-3": 0.5})
+    )
+    camera = BurstCamera()
+    capture = burst.BurstCapture(_hass(), frames=3, interval=0)
+
+    assert asyncio.run(capture.async_capture(camera.fetch)) == b"frame-2"
+    assert camera.calls == 3
+    assert capture.metrics["last_scores"] == [0.2, 0.9, 0.5]
+
+
+def test_single_frame_skips_scoring(monkeypatch):
+    monkeypatch.setattr(burst, "score_frames", None)
+    camera = BurstCamera()
+    capture = burst.BurstCapture(_hass(), frames=1, interval=0)
+
+    assert asyncio.run(capture.async_capture(camera.fetch)) == b"frame-1"
+    assert camera.calls == 1
+
+
+def test_failed_frames(monkeypatch):
+    monkeypatch.setattr(burst, "score_frames", _score_by_frame({b"frame-1": 0.1, b"frame-2": 0.3}))
+
+    # A later failure keeps the frames captured so far
+    camera = BurstCamera(fail_at={3})
+    capture = burst.BurstCapture(_hass(), frames=4, interval=0)
+    assert asyncio.run(capture.async_capture(camera.fetch)) == b"frame-2"
+    assert camera.calls == 3
+    assert capture.metrics["frames_failed"] == 1
+
+    # A camera that fails straight away is reported without finishing the burst
+    camera = BurstCamera(fail_at={1})
+    with pytest.raises(RuntimeError):
+        asyncio.run(capture.async_capture(camera.fetch))
+    assert camera.calls == 1
@@ -0,0 +1,244 @@
+"""Test check deadlines and cancellation of running checks."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.cleanme.budget import (  # noqa: E402
+    DATA_REQUEST_BUDGET,
+    RequestBudget,
+)
+from custom_components.cleanme.const import (  # noqa: E402
+    DOMAIN,
+    CONF_API_KEY,
+    CONF_BATCH_SIZE,
+    CONF_CAMERA_ENTITY,
+    CONF_CHECK_TIMEOUT,
+)
+from custom_components.cleanme.coordinator import CleanMeZone, async_check_all_zones  # noqa: E402
+from custom_components.cleanme.session import async_close_session_manager  # noqa: E402
+from custom_components.cleanme.settings import SETTINGS_SCHEMA, get_settings  # noqa: E402
+from custom_components.cleanme.timing import request_started  # noqa: E402
+
+from fake_hass import FakeCamera, FakeHass, async_create_zones, install_fakes  # noqa: E402
+from gemini_stub import GeminiStubServer  # noqa: E402
+
+
+@pytest.fixture
+def zone(monkeypatch):
+    captures = []
+
+    async def _capture(self, now):
+        captures.append(asyncio.current_task())
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(CleanMeZone, "_async_capture_image", _capture)
+    hass = FakeHass()
+    zone = CleanMeZone(
+        hass,
+        "entry_kitchen",
+        "Kitchen",
+        {CONF_CAMERA_ENTITY: "camera.kitchen", CONF_API_KEY: "key"},
+    )
+    return zone, captures
+
+
+def test_check_stops_at_the_deadline(zone):
+    zone, _ = zone
+    get_settings(zone.hass)[CONF_CHECK_TIMEOUT] = 0.01
+
+    asyncio.run(zone.async_request_check(reason="manual"))
+
+    assert zone.check_timeouts == 1
+    assert zone.checks_in_flight == 0
+    assert "did not finish within" in zone.state.last_error
+
+
+def test_check_without_a_request_hands_back_its_admission(zone):
+    zone, _ = zone
+    get_settings(zone.hass)[CONF_CHECK_TIMEOUT] = 0.01
+    budget = zone.hass.data.setdefault(DOMAIN, {})[DATA_REQUEST_BUDGET] = RequestBudget(10, 0)
+
+    asyncio.run(zone.async_request_check(reason="manual"))
+
+    assert zone.check_timeouts == 1
+    assert budget.remaining == 10
+
+
+def test_newer_check_supersedes_the_running_one(zone):
+    zone, captures = zone
+    get_settings(zone.hass)[CONF_CHECK_TIMEOUT] = 0.05
+
+    async def _run():
+        first = asyncio.create_task(zone.async_request_check(reason="auto"))
+        while not captures:
+            await asyncio.sleep(0)
+        # Both callers return; only the newer check runs to its deadline
+        await asyncio.gather(first, zone.async_request_check(reason="button"))
+
+    asyncio.run(_run())
+    assert len(captures) == 2
+    assert captures[0].cancelled()
+    assert zone.checks_superseded == 1
+    assert zone.check_timeouts == 1
+
+
+def test_check_that_sent_its_request_is_not_superseded(zone, monkeypatch):
+    zone, captures = zone
+    get_settings(zone.hass)[CONF_CHECK_TIMEOUT] = 0.02
+
+    async def _capture(self, now):
+        captures.append(asyncio.current_task())
+        # The request is out; cancelling now would waste it
+        request_started()
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(CleanMeZone, "_async_capture_image", _capture)
+
+    async def _run():
+        first = asyncio.create_task(zone.async_request_check(reason="auto"))
+        while not captures:
+            await asyncio.sleep(0)
+        await asyncio.gather(first, zone.async_request_check(reason="button"))
+
+    asyncio.run(_run())
+    # The button check waited for the running one instead of cancelling it
+    assert len(captures) == 2
+    assert not captures[0].cancelled()
+    assert zone.checks_superseded == 0
+    assert zone.check_timeouts == 2
+
+
+def test_batched_timeout_only_hits_admitted_zones(zone):
+    kitchen, _ = zone
+    hass = kitchen.hass
+    office = CleanMeZone(
+        hass, "entry_office", "Office", {CONF_CAMERA_ENTITY: "camera.office", CONF_API_KEY: "key"}
+    )
+    settings = get_settings(hass)
+    settings[CONF_CHECK_TIMEOUT] = 0.01
+    settings[CONF_BATCH_SIZE] = 4
+    # Room for one check; the office is turned away
+    budget = hass.data.setdefault(DOMAIN, {})[DATA_REQUEST_BUDGET] = RequestBudget(1, 0)
+
+    asyncio.run(async_check_all_zones(hass, [kitchen, office]))
+
+    assert kitchen.check_timeouts == 1
+    assert "did not finish within" in kitchen.state.last_error
+    assert office.check_timeouts == 0
+    assert "budget" in office.state.last_error
+    assert kitchen.checks_in_flight == office.checks_in_flight == 0
+    # The kitchen's request never went out, so its admission came back
+    assert budget.remaining == 1
+
+
+def test_cancelled_streaming_check_is_no_longer_partial(zone, monkeypatch):
+    zone, captures = zone
+
+    async def _capture(self, now):
+        captures.append(asyncio.current_task())
+        self._publish_partial({"tidy": False, "severity": "high"})
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(CleanMeZone, "_async_capture_image", _capture)
+
+    async def _run():
+        check = asyncio.create_task(zone.async_request_check(reason="auto"))
+        while not captures:
+            await asyncio.sleep(0)
+        assert zone.state.partial
+        await zone.async_unload()
+        await check
+
+    asyncio.run(_run())
+    assert not zone.state.partial
+
+
+def test_unload_cancels_running_check(zone):
+    zone, captures = zone
+
+    async def _run():
+        check = asyncio.create_task(zone.async_request_check(reason="auto"))
+        while not captures:
+            await asyncio.sleep(0)
+        await zone.async_unload()
+        await check
+
+    asyncio.run(_run())
+    assert captures[0].cancelled()
+    assert zone.check_timeouts == 0
+    assert zone.checks_in_flight == 0
+
+
+async def _async_batch_sweep(stub, zone_count, during, budget=None):
+    """Run a batched check_all over zone_count zones; await during(zones) once its request is out."""
+    hass = FakeHass()
+    hass.data[DOMAIN] = {"settings": SETTINGS_SCHEMA({CONF_BATCH_SIZE: 4})}
+    if budget is not None:
+        hass.data[DOMAIN][DATA_REQUEST_BUDGET] = budget
+    zones = await async_create_zones(hass, zone_count, api_base=stub.base_url)
+    try:
+        sweep = asyncio.create_task(async_check_all_zones(hass, zones))
+        while not stub.requests_to(":generateContent"):
+            await asyncio.sleep(0.01)
+        await during(zones)
+        await sweep
+    finally:
+        await async_close_session_manager(hass)
+    return zones
+
+
+def test_unloading_one_zone_leaves_the_batch_running(monkeypatch):
+    install_fakes(monkeypatch, FakeCamera())
+
+    async def _unload_first(zones):
+        await zones[0].async_unload()
+
+    async def _run():
+        async with GeminiStubServer(latency=0.1) as stub:
+            return await _async_batch_sweep(stub, 2, _unload_first)
+
+    kitchen, office = asyncio.run(_run())
+
+    assert office.state.last_checked is not None
+    assert office.state.last_error is None
+    # The unloaded zone's share of the answer is dropped
+    assert kitchen.state.last_checked is None
+    assert kitchen.checks_in_flight == 0
+
+
+def test_zone_in_a_running_batch_is_not_checked_twice(monkeypatch):
+    install_fakes(monkeypatch, FakeCamera())
+
+    async def _activity(zones):
+        await zones[0].async_request_check(reason="activity")
+
+    async def _run():
+        async with GeminiStubServer(latency=0.1) as stub:
+            await _async_batch_sweep(stub, 2, _activity)
+            return stub
+
+    stub = asyncio.run(_run())
+
+    # The activity check joined the batch instead of sending its own request
+    assert len(stub.requests_to(":generateContent")) == 1
+
+
+def test_batch_keeps_one_admission_per_request(monkeypatch):
+    install_fakes(monkeypatch, FakeCamera())
+    budget = RequestBudget(10, 0)
+
+    async def _idle(zones):
+        pass
+
+    async def _run():
+        async with GeminiStubServer() as stub:
+            await _async_batch_sweep(stub, 3, _idle, budget)
+            return stub
+
+    stub = asyncio.run(_run())
+
+    assert len(stub.requests_to(":generateContent")) == 1
+    # Three zones were admitted up front; two admissions came back after the request
+    assert budget.remaining == 9
@@ -0,0 +1,216 @@
+"""Test the priority queue that runs zone checks."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.cleanme.check_queue import CheckQueue  # noqa: E402
+
+
+def _hass():
+    return SimpleNamespace(
+        async_create_task=lambda coro, *args: asyncio.get_running_loop().create_task(coro)
+    )
+
+
+class Checks:
+    """Records the order checks start in; each waits until released."""
+
+    def __init__(self):
+        self.started = []
+        self.release = asyncio.Event()
+
+    def run(self, name):
+        async def _run():
+            self.started.append(name)
+            await self.release.wait()
+
+        return _run
+
+
+def test_manual_and_high_priority_checks_go_first():
+    async def _run():
+        queue = CheckQueue(_hass(), workers=1)
+        checks = Checks()
+        tasks = [
+            asyncio.create_task(queue.async_run("busy", "auto", 1, checks.run("busy"))),
+            asyncio.create_task(queue.async_run("low", "auto", 0, checks.run("low"))),
+            asyncio.create_task(queue.async_run("high", "auto", 2, checks.run("high"))),
+            asyncio.create_task(queue.async_run("sweep", "check_all", 0, checks.run("sweep"))),
+        ]
+        await asyncio.sleep(0)
+        assert queue.metrics["depth"] == 3
+        checks.release.set()
+        await asyncio.gather(*tasks)
+        return checks.started, queue.metrics
+
+    started, metrics = asyncio.run(_run())
+    assert started == ["busy", "sweep", "high", "low"]
+    assert metrics["depth"] == 0
+    assert metrics["wait"]["count"] == 4
+
+
+def test_manual_check_gets_an_extra_worker():
+    async def _run():
+        queue = CheckQueue(_hass(), workers=1)
+        checks = Checks()
+        background = asyncio.create_task(queue.async_run("kitchen", "auto", 1, checks.run("kitchen")))
+        manual = asyncio.create_task(queue.async_run("office", "button", 1, checks.run("office")))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        running = list(checks.started)
+        checks.release.set()
+        await asyncio.gather(background, manual)
+        return running
+
+    assert asyncio.run(_run()) == ["kitchen", "office"]
+
+
+def test_duplicate_requests_merge_and_upgrade():
+    async def _run():
+        queue = CheckQueue(_hass(), workers=1)
+        checks = Checks()
+        busy = asyncio.create_task(queue.async_run("busy", "auto", 1, checks.run("busy")))
+        await asyncio.sleep(0)
+        other = asyncio.create_task(queue.async_run("other", "auto", 2, checks.run("other")))
+        first = asyncio.create_task(queue.async_run("kitchen", "auto", 1, checks.run("kitchen auto")))
+        second = asyncio.create_task(queue.async_run("kitchen", "auto", 1, checks.run("kitchen again")))
+        await asyncio.sleep(0)
+        # A button press takes over the waiting auto check and jumps the queue
+        manual = asyncio.create_task(queue.async_run("kitchen", "button", 1, checks.run("kitchen button")))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        checks.release.set()
+        await asyncio.gather(busy, other, first, second, manual)
+        return checks.started, queue.metrics
+
+    started, metrics = asyncio.run(_run())
+    assert started == ["busy", "kitchen button", "other"]
+    assert metrics["submitted"] == 3
+    assert metrics["merged"] == 2
+
+
+def test_background_request_for_running_zone_is_dropped():
+    async def _run():
+        queue = CheckQueue(_hass(), workers=2)
+        checks = Checks()
+        running = asyncio.create_task(queue.async_run("kitchen", "auto", 1, checks.run("first")))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        stale = asyncio.create_task(queue.async_run("kitchen", "activity", 1, checks.run("stale")))
+        await asyncio.sleep(0)
+        checks.release.set()
+        await asyncio.gather(running, stale)
+        return checks.started, queue.metrics
+
+    started, metrics = asyncio.run(_run())
+    assert started == ["first"]
+    assert metrics["dropped"] == 1
+
+
+def test_failed_check_reaches_every_waiter():
+    async def _run():
+        queue = CheckQueue(_hass(), workers=1)
+
+        async def _fail():
+            raise RuntimeError("camera.kitchen is unavailable")
+
+        results = await asyncio.gather(
+            queue.async_run("kitchen", "auto", 1, _fail),
+            queue.async_run("kitchen", "auto", 1, _fail),
+            return_exceptions=True,
+        )
+        return results, queue.metrics
+
+    results, metrics = asyncio.run(_run())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert metrics["running"] == 0
+
+
+def test_cancel_drops_a_queued_check():
+    async def _run():
+        queue = CheckQueue(_hass(), workers=1)
+        checks = Checks()
+        busy = asyncio.create_task(queue.async_run("busy", "auto", 1, checks.run("busy")))
+        queued = asyncio.create_task(queue.async_run("kitchen", "auto", 1, checks.run("kitchen")))
+        await asyncio.sleep(0)
+        queue.cancel("kitchen")
+        await queued
+        checks.release.set()
+        await busy
+        return checks.started, queue.metrics
+
+    started, metrics = asyncio.run(_run())
+    assert started == ["busy"]
+    assert metrics["cancelled"] == 1
+
+
+def test_manual_request_for_running_zone_runs_after_it():
+    async def _run():
+        queue = CheckQueue(_hass(), workers=2)
+        checks = Checks()
+        running = asyncio.create_task(queue.async_run("kitchen", "auto", 1, checks.run("auto")))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        manual = asyncio.create_task(queue.async_run("kitchen", "button", 1, checks.run("button")))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # Never two checks of one zone at once
+        waiting = list(checks.started)
+        checks.release.set()
+        await asyncio.gather(running, manual)
+        return waiting, checks.started
+
+    waiting, started = asyncio.run(_run())
+    assert waiting == ["auto"]
+    assert started == ["auto", "button"]
+
+
+def test_async_cancel_stops_a_started_check_before_it_runs():
+    async def _run():
+        queue = CheckQueue(_hass(), workers=1)
+        checks = Checks()
+        caller = asyncio.create_task(queue.async_run("kitchen", "auto", 1, checks.run("kitchen")))
+        await asyncio.sleep(0)
+        # Started by the queue, but its task has not run yet
+        assert queue.metrics["running"] == 1
+        await queue.async_cancel("kitchen")
+        await caller
+        return checks.started, queue.metrics
+
+    started, metrics = asyncio.run(_run())
+    assert started == []
+    assert metrics["running"] == 0
+    assert metrics["cancelled"] == 1
+
+
+def test_batch_counts_as_the_running_check_of_its_zones():
+    async def _run():
+        queue = CheckQueue(_hass(), workers=2)
+        checks = Checks()
+        batch = asyncio.create_task(
+            queue.async_run(
+                "check_all", "check_all", 1, checks.run("batch"), members=("kitchen", "office")
+            )
+        )
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # The batch answers the activity check; the button press waits for it
+        activity = asyncio.create_task(queue.async_run("kitchen", "activity", 1, checks.run("activity")))
+        manual = asyncio.create_task(queue.async_run("office", "button", 1, checks.run("button")))
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        # Unloading a member zone leaves the batch running
+        await queue.async_cancel("kitchen")
+        waiting = list(checks.started)
+        checks.release.set()
+        await asyncio.gather(batch, activity, manual)
+        return waiting, checks.started, queue.metrics
+
+    waiting, started, metrics = asyncio.run(_run())
+    assert waiting == ["batch"]
+    assert started == ["batch", "button"]
+    assert metrics["dropped"] == 1
+    assert metrics["cancelled"] == 0
@@ -0,0 +1,83 @@
+"""Test API key validation in the CleanMe options flow."""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.cleanme import config_flow  # noqa: E402
+from custom_components.cleanme.const import (  # noqa: E402
+    CONF_API_KEY,
+    CONF_CAMERA_ENTITY,
+    CONF_NAME,
+    CONF_VISION_BACKEND,
+    BACKEND_GEMINI,
+    BACKEND_LOCAL,
+)
+
+
+def _options_flow(monkeypatch, data, key_is_valid=True):
+    """Return an options flow for an entry with data, and the keys it validates."""
+    validated = []
+
+    async def _validate_api_key(client, session):
+        validated.append(client.api_key)
+        return key_is_valid
+
+    async def _async_reload(entry_id):
+        return True
+
+    monkeypatch.setattr(config_flow.GeminiClient, "validate_api_key", _validate_api_key)
+    monkeypatch.setattr(config_flow.aiohttp_client, "async_get_clientsession", lambda hass: None)
+
+    entry = SimpleNamespace(entry_id="entry", title="Kitchen", data=data, options={})
+    flow = config_flow.CleanMeOptionsFlow(entry)
+    flow.hass = SimpleNamespace(
+        config_entries=SimpleNamespace(
+            async_update_entry=lambda entry, data: setattr(entry, "data", data),
+            async_reload=_async_reload,
+        )
+    )
+    return flow, validated
+
+
+def _local_zone(api_key=""):
+    return {
+        CONF_NAME: "Kitchen",
+        CONF_CAMERA_ENTITY: "camera.kitchen",
+        CONF_VISION_BACKEND: BACKEND_LOCAL,
+        CONF_API_KEY: api_key,
+    }
+
+
+def test_unchanged_key_is_validated_when_switching_to_gemini(monkeypatch):
+    flow, validated = _options_flow(monkeypatch, _local_zone("stale-key"), key_is_valid=False)
+
+    result = asyncio.run(
+        flow.async_step_init({**_local_zone("stale-key"), CONF_VISION_BACKEND: BACKEND_GEMINI})
+    )
+
+    assert validated == ["stale-key"]
+    assert result["errors"] == {"base": "invalid_api_key"}
+    assert flow._entry.data[CONF_VISION_BACKEND] == BACKEND_LOCAL
+
+
+def test_missing_key_is_a_field_error_when_switching_to_gemini(monkeypatch):
+    flow, validated = _options_flow(monkeypatch, _local_zone())
+
+    result = asyncio.run(
+        flow.async_step_init({**_local_zone(), CONF_VISION_BACKEND: BACKEND_GEMINI})
+    )
+
+    assert validated == []
+    assert result["errors"] == {CONF_API_KEY: "missing_api_key"}
+
+
+def test_local_zones_skip_key_validation(monkeypatch):
+    flow, validated = _options_flow(monkeypatch, _local_zone())
+
+    result = asyncio.run(flow.async_step_init(_local_zone()))
+
+    assert validated == []
+    assert result["reason"] == "reconfigure_successful"
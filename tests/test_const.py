@@ -84,3 +84,10 @@ def test_platforms_include_all_entity_types():
     expected_platforms = ["sensor", "binary_sensor", "button", "number", "select"]
     for platform in expected_platforms:
         assert platform in const.PLATFORMS, f"Platform '{platform}' should be in PLATFORMS"
+
+
+def test_level_tuples_match_options():
+    const = load_const_module()
+    assert set(const.PRIORITY_LEVELS) == set(const.PRIORITY_OPTIONS)
+    assert const.DEFAULT_PRIORITY in const.PRIORITY_LEVELS
+    assert const.SEVERITY_LEVELS == ("low", "medium", "high")
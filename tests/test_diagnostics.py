@@ -0,0 +1,41 @@
+"""Test the diagnostics platform."""
+from pathlib import Path
+
+
+COMPONENT_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "cleanme"
+DIAGNOSTICS_PATH = COMPONENT_PATH / "diagnostics.py"
+
+
+def test_diagnostics_platform_exists():
+    """Test that entry and device diagnostics are provided."""
+    source = DIAGNOSTICS_PATH.read_text(encoding="utf-8")
+    assert "async def async_get_config_entry_diagnostics" in source
+    assert "async def async_get_device_diagnostics" in source
+
+
+def test_api_key_is_redacted():
+    """Test that the Gemini API key never ends up in a diagnostics download."""
+    source = DIAGNOSTICS_PATH.read_text(encoding="utf-8")
+    assert "TO_REDACT = {CONF_API_KEY}" in source
+    assert "async_redact_data(dict(entry.data), TO_REDACT)" in source
+    assert "async_redact_data(dict(entry.options), TO_REDACT)" in source
+
+
+def test_diagnostics_include_performance_snapshot():
+    """Test that the performance counters are all part of the download."""
+    source = DIAGNOSTICS_PATH.read_text(encoding="utf-8")
+    for key in (
+        '"checks_in_flight"',
+        '"connection_pool"',
+        '"file_uploads"',
+        '"result_cache"',
+        '"snapshots"',
+        '"burst_capture"',
+        '"request_budget"',
+        '"check_queue"',
+        '"cpu_executor"',
+        '"percentiles"',
+        '"store_writes"',
+        '"regeneration_ms"',
+    ):
+        assert key in source
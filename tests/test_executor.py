@@ -0,0 +1,76 @@
+"""Test the dedicated executor for CPU-bound work."""
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.cleanme.executor import (  # noqa: E402
+    CpuExecutor,
+    async_get_cpu_executor,
+    async_shutdown_cpu_executor,
+)
+
+from fake_hass import FakeHass  # noqa: E402
+
+
+def test_work_runs_off_the_event_loop():
+    executor = CpuExecutor(workers=1)
+
+    async def _run():
+        return await executor.async_run(lambda: threading.current_thread().name)
+
+    try:
+        assert asyncio.run(_run()).startswith("cleanme_cpu")
+    finally:
+        executor.shutdown()
+    assert executor.metrics["jobs"] == 1
+    assert executor.metrics["run"]["count"] == 1
+
+
+def test_jobs_beyond_the_pool_size_are_queued():
+    executor = CpuExecutor(workers=2)
+    release = threading.Event()
+
+    async def _run():
+        jobs = [asyncio.create_task(executor.async_run(release.wait)) for _ in range(5)]
+        await asyncio.sleep(0)
+        busy = executor.metrics
+        release.set()
+        await asyncio.gather(*jobs)
+        return busy
+
+    try:
+        busy = asyncio.run(_run())
+    finally:
+        executor.shutdown()
+    assert (busy["running"], busy["queued"]) == (2, 3)
+    assert executor.metrics["queued"] == 0
+    assert executor.metrics["max_queued"] == 3
+    assert executor.metrics["wait"]["count"] == 5
+
+
+def test_failures_are_counted_and_raised():
+    executor = CpuExecutor(workers=1)
+
+    async def _run():
+        return await executor.async_run(int, "not a number")
+
+    try:
+        with pytest.raises(ValueError):
+            asyncio.run(_run())
+    finally:
+        executor.shutdown()
+    assert executor.metrics["failures"] == 1
+
+
+def test_recreated_executor_keeps_one_close_listener():
+    hass = FakeHass()
+
+    for _ in range(3):
+        async_get_cpu_executor(hass)
+        async_shutdown_cpu_executor(hass)
+    async_get_cpu_executor(hass).shutdown()
+
+    assert len(hass.bus.listeners) == 1
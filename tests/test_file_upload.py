@@ -0,0 +1,157 @@
+"""Test Gemini File API uploads against a local stub server."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+aiohttp = pytest.importorskip("aiohttp")
+
+from custom_components.cleanme import gemini_client  # noqa: E402
+from custom_components.cleanme.file_upload import FileStore  # noqa: E402
+from custom_components.cleanme.gemini_client import BatchImage, GeminiClient  # noqa: E402
+from gemini_stub import GeminiStubServer  # noqa: E402
+
+LARGE_IMAGE = bytes(range(256)) * 4096  # 1 MiB
+SMALL_IMAGE = b"small-jpeg"
+
+
+async def _analyze(client, session, image_bytes=LARGE_IMAGE):
+    return await client.analyze_image(
+        session=session,
+        image_bytes=image_bytes,
+        room_name="Kitchen",
+        personality="friendly",
+        pickiness=3,
+    )
+
+
+def _image_parts(request):
+    return [part for part in request["body"]["contents"][0]["parts"] if "text" not in part]
+
+
+def test_large_image_is_uploaded_once_and_referenced_by_uri():
+    async def _run():
+        async with GeminiStubServer() as stub, aiohttp.ClientSession() as session:
+            store = FileStore(min_size=1024)
+            client = GeminiClient("key", api_base=stub.base_url, file_store=store)
+            result = await _analyze(client, session)
+            await _analyze(client, session)
+            return stub, store, result
+
+    stub, store, result = asyncio.run(_run())
+
+    assert result["image_size"] == len(LARGE_IMAGE)
+    assert len(stub.files) == 1
+    file = next(iter(stub.files.values()))
+    assert file["data"] == LARGE_IMAGE
+    for request in stub.requests_to(":generateContent"):
+        assert _image_parts(request) == [
+            {"file_data": {"mime_type": "image/jpeg", "file_uri": file["uri"]}}
+        ]
+    assert store.metrics["uploads"] == 1
+    assert store.metrics["reuses"] == 1
+
+
+def test_small_image_stays_inline():
+    async def _run():
+        async with GeminiStubServer() as stub, aiohttp.ClientSession() as session:
+            client = GeminiClient("key", api_base=stub.base_url, file_store=FileStore(min_size=1024))
+            await _analyze(client, session, SMALL_IMAGE)
+            return stub
+
+    stub = asyncio.run(_run())
+
+    assert not stub.files
+    assert "inline_data" in _image_parts(stub.requests_to(":generateContent")[0])[0]
+
+
+def test_upload_is_sent_in_chunks(monkeypatch):
+    monkeypatch.setattr(gemini_client, "UPLOAD_CHUNK_SIZE", 256 * 1024)
+
+    async def _run():
+        async with GeminiStubServer() as stub, aiohttp.ClientSession() as session:
+            client = GeminiClient("key", api_base=stub.base_url, file_store=FileStore(min_size=1024))
+            await _analyze(client, session)
+            return stub
+
+    stub = asyncio.run(_run())
+
+    chunks = [request for request in stub.requests if "/files/sessions/" in request["path"]]
+    assert [request["command"] for request in chunks] == ["upload"] * 3 + ["upload, finalize"]
+    assert next(iter(stub.files.values()))["data"] == LARGE_IMAGE
+
+
+def test_batched_requests_reuse_uploads():
+    async def _run():
+        async with GeminiStubServer() as stub, aiohttp.ClientSession() as session:
+            store = FileStore(min_size=1024)
+            client = GeminiClient("key", api_base=stub.base_url, file_store=store)
+            await _analyze(client, session)
+            await client.analyze_images(
+                session,
+                [
+                    BatchImage("entry_a", "Kitchen", LARGE_IMAGE, "friendly", 3),
+                    BatchImage("entry_b", "Office", SMALL_IMAGE, "pirate", 5),
+                ],
+            )
+            return stub, store
+
+    stub, store = asyncio.run(_run())
+
+    batch = stub.requests_to(":generateContent")[-1]
+    assert [next(iter(part)) for part in _image_parts(batch)] == ["file_data", "inline_data"]
+    assert store.metrics["uploads"] == 1
+    assert store.metrics["reuses"] == 1
+
+
+def test_expired_uploads_are_deleted():
+    async def _run():
+        async with GeminiStubServer() as stub, aiohttp.ClientSession() as session:
+            store = FileStore(ttl_seconds=0, min_size=1024)
+            client = GeminiClient("key", api_base=stub.base_url, file_store=store)
+            await _analyze(client, session)
+            return stub, store
+
+    stub, store = asyncio.run(_run())
+
+    assert len(stub.requests_to("/files/stub2")) == 1
+    assert not stub.files
+    assert store.metrics["deletes"] == 1
+
+
+def test_missing_upload_falls_back_to_inline():
+    async def _run():
+        async with GeminiStubServer() as stub, aiohttp.ClientSession() as session:
+            store = FileStore(min_size=1024)
+            client = GeminiClient("key", api_base=stub.base_url, file_store=store)
+            await _analyze(client, session)
+            stub.files.clear()
+            result = await _analyze(client, session)
+            return stub, store, result
+
+    stub, store, result = asyncio.run(_run())
+
+    assert result["tasks"] == ["Put the pizza box in the recycling"]
+    generate = stub.requests_to(":generateContent")
+    assert "file_data" in _image_parts(generate[1])[0]
+    assert "inline_data" in _image_parts(generate[2])[0]
+    assert store.metrics["entries"] == 0
+
+
+def test_rejected_upload_is_deleted_in_the_background():
+    async def _run():
+        async with GeminiStubServer() as stub, aiohttp.ClientSession() as session:
+            store = FileStore(min_size=1024)
+            client = GeminiClient("key", api_base=stub.base_url, file_store=store)
+            await _analyze(client, session)
+            # Gemini refuses the file but still stores it
+            next(iter(stub.files.values()))["uri"] = "revoked"
+            await _analyze(client, session)
+            await asyncio.gather(*client._delete_tasks)
+            return stub, store
+
+    stub, store = asyncio.run(_run())
+
+    assert len(stub.requests_to("/files/stub2")) == 1
+    assert not stub.files
+    assert store.metrics["deletes"] == 1
@@ -0,0 +1,101 @@
+"""Test batched multi-image analysis in the Gemini client."""
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.cleanme.gemini_client import (  # noqa: E402
+    BatchImage,
+    GeminiClient,
+    GeminiClientError,
+)
+
+
+class _CannedGeminiClient(GeminiClient):
+    """Gemini client that returns a canned response instead of calling the API."""
+
+    def __init__(self, reply, *retry_replies) -> None:
+        super().__init__("test-key")
+        self.payloads = []
+        # The last reply is repeated once the others are used up
+        self._replies = [reply, *retry_replies]
+
+    async def _async_generate_content(self, session, payload, timeout):
+        self.payloads.append(payload)
+        reply = self._replies[min(len(self.payloads), len(self._replies)) - 1]
+        text = reply if isinstance(reply, str) else json.dumps(reply)
+        return {"candidates": [{"content": {"parts": [{"text": text}]}}]}
+
+
+def _images():
+    return [
+        BatchImage("entry_a", "Kitchen", b"kitchen-jpeg", "friendly", 3),
+        BatchImage("entry_b", "Office", b"office-jpeg", "pirate", 5),
+    ]
+
+
+def test_batched_results_are_fanned_out_per_zone():
+    client = _CannedGeminiClient(
+        [
+            {"zone": "Z2", "tidy": False, "tasks": [" Swab the deck "], "comment": "Arr!", "severity": "high"},
+            {"zone": "Z1", "tidy": True, "tasks": [], "comment": "Lovely!", "severity": "low"},
+        ]
+    )
+
+    results = asyncio.run(client.analyze_images(session=None, images=_images()))
+
+    assert results["entry_a"]["tidy"] is True
+    assert results["entry_b"]["tasks"] == ["Swab the deck"]
+    assert results["entry_b"]["image_size"] == len(b"office-jpeg")
+    assert len(client.payloads) == 1, "All zones should share one request"
+
+
+def test_each_zone_gets_its_own_prompt_section():
+    client = _CannedGeminiClient([])
+    asyncio.run(client.analyze_images(session=None, images=_images()))
+
+    parts = client.payloads[0]["contents"][0]["parts"]
+    texts = "\n".join(part["text"] for part in parts if "text" in part)
+    assert 'Zone Z1: "Kitchen"' in texts
+    assert 'Zone Z2: "Office"' in texts
+    assert "Pickiness level: 5/5" in texts
+    assert sum(1 for part in parts if "inline_data" in part) == 2
+
+
+def test_missing_or_invalid_zones_become_errors():
+    client = _CannedGeminiClient([{"zone": "Z1", "tidy": "maybe"}])
+
+    results = asyncio.run(client.analyze_images(session=None, images=_images()))
+
+    assert isinstance(results["entry_a"], GeminiClientError)
+    assert isinstance(results["entry_b"], GeminiClientError)
+
+
+def test_unusable_zones_are_retried_on_their_own():
+    client = _CannedGeminiClient(
+        [{"zone": "Z1", "tidy": True, "tasks": [], "comment": "Lovely!", "severity": "low"}],
+        [{"zone": "Z1", "tidy": False, "tasks": ["Swab the deck"], "comment": "Arr!", "severity": "high"}],
+    )
+
+    results = asyncio.run(client.analyze_images(session=None, images=_images()))
+
+    assert results["entry_a"]["tidy"] is True
+    assert results["entry_b"]["tasks"] == ["Swab the deck"]
+    assert len(client.payloads) == 2
+    retry_parts = client.payloads[1]["contents"][0]["parts"]
+    retry_text = "\n".join(part["text"] for part in retry_parts if "text" in part)
+    assert 'Zone Z1: "Office"' in retry_text
+    assert "Kitchen" not in retry_text
+    assert client.metrics == {"parse_failures": 1, "parse_retries": 1}
+
+
+def test_malformed_batch_is_retried_then_raised():
+    client = _CannedGeminiClient("not json at all")
+
+    with pytest.raises(GeminiClientError):
+        asyncio.run(client.analyze_images(session=None, images=_images()))
+
+    assert len(client.payloads) == 2
+    assert client.metrics == {"parse_failures": 4, "parse_retries": 1}
@@ -0,0 +1,68 @@
+"""Test that Gemini traffic uses the dedicated connection pool."""
+import asyncio
+from pathlib import Path
+
+import pytest
+
+
+COMPONENT_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "cleanme"
+SESSION_PATH = COMPONENT_PATH / "session.py"
+COORDINATOR_PATH = COMPONENT_PATH / "coordinator.py"
+GEMINI_CLIENT_PATH = COMPONENT_PATH / "gemini_client.py"
+
+
+def test_coordinator_uses_dedicated_session():
+    """Test that checks no longer go through the shared HA client session."""
+    source = COORDINATOR_PATH.read_text(encoding="utf-8")
+    assert "async_get_clientsession" not in source, (
+        "Gemini checks should not use the shared Home Assistant session"
+    )
+    assert "async_get_session_manager" in source
+    assert "timeout=session_manager.timeout" in source
+
+
+def test_session_manager_tunes_connector():
+    """Test that the dedicated connector sets pool limits and keep-alive."""
+    source = SESSION_PATH.read_text(encoding="utf-8")
+    assert "aiohttp.TCPConnector(" in source
+    assert "limit_per_host=" in source
+    assert "keepalive_timeout=" in source
+    assert "sock_read=" in source and "sock_connect=" in source, (
+        "Connect and read timeouts should be split"
+    )
+
+
+def test_session_manager_tracks_connection_reuse():
+    """Test that connection reuse is measured through aiohttp tracing."""
+    source = SESSION_PATH.read_text(encoding="utf-8")
+    assert "on_connection_create_end" in source
+    assert "on_connection_reuseconn" in source
+    assert "reuse_ratio" in source
+
+
+def test_gemini_client_has_no_bare_timeout():
+    """Test that the bare 90 second timeout was replaced by ClientTimeout."""
+    source = GEMINI_CLIENT_PATH.read_text(encoding="utf-8")
+    assert "timeout=90)" not in source
+    assert "aiohttp.ClientTimeout(total=90)" in source
+
+
+def test_recreated_session_manager_keeps_one_close_listener():
+    """Test that closing the manager removes its close-on-shutdown listener."""
+    pytest.importorskip("homeassistant")
+    from custom_components.cleanme.session import (
+        async_close_session_manager,
+        async_get_session_manager,
+    )
+    from fake_hass import FakeHass
+
+    hass = FakeHass()
+
+    async def _run():
+        for _ in range(3):
+            async_get_session_manager(hass)
+            await async_close_session_manager(hass)
+        async_get_session_manager(hass)
+
+    asyncio.run(_run())
+    assert len(hass.bus.listeners) == 1
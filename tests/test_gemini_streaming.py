@@ -0,0 +1,46 @@
+"""Test streamed analysis with early publishing of tidy and severity."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+aiohttp = pytest.importorskip("aiohttp")
+
+from custom_components.cleanme.gemini_client import GeminiClient  # noqa: E402
+from gemini_stub import GeminiStubServer  # noqa: E402
+
+ANALYSIS = {
+    "tidy": False,
+    "severity": "high",
+    "tasks": ["Wash the dishes", "Wipe the counter", "Sweep the floor"],
+    "comment": "The sink is overflowing. Let's tackle it together!",
+}
+
+
+def test_tidy_and_severity_are_published_before_the_reply_completes():
+    partials = []
+
+    async def _run():
+        async with GeminiStubServer(analysis=ANALYSIS, stream_chunk_chars=5) as stub:
+            async with aiohttp.ClientSession() as session:
+                client = GeminiClient("key", api_base=stub.base_url)
+                result = await client.analyze_image(
+                    session=session,
+                    image_bytes=b"jpeg",
+                    room_name="Kitchen",
+                    personality="friendly",
+                    pickiness=3,
+                    on_partial=partials.append,
+                )
+                return stub, result
+
+    stub, result = asyncio.run(_run())
+
+    assert partials == [{"tidy": False, "severity": "high"}]
+    assert result["tasks"] == ANALYSIS["tasks"]
+    assert result["comment"] == ANALYSIS["comment"]
+
+    streamed = stub.requests_to(":streamGenerateContent")
+    assert len(streamed) == 1
+    assert streamed[0]["query"] == {"alt": "sse"}
+    assert not stub.requests_to(":generateContent")
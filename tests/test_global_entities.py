@@ -102,7 +102,8 @@ def test_next_scheduled_check_sensor_name():
     source = SENSOR_PATH.read_text(encoding="utf-8")
     
     start = source.find("class CleanMeNextScheduledCheckSensor")
-    section = source[start:]
+    end = source.find("class CleanMeApiBudgetSensor")
+    section = source[start:end]
     
     assert '_attr_name = "CleanMe Next Scheduled Check"' in section, (
         "CleanMeNextScheduledCheckSensor must have full name 'CleanMe Next Scheduled Check' "
@@ -111,6 +112,21 @@ def test_next_scheduled_check_sensor_name():
     assert '_attr_unique_id = "cleanme_next_scheduled_check"' in section
 
 
+def test_api_budget_sensor_name():
+    """Test that CleanMeApiBudgetSensor has correct full name."""
+    source = SENSOR_PATH.read_text(encoding="utf-8")
+
+    start = source.find("class CleanMeApiBudgetSensor")
+    section = source[start:]
+
+    assert '_attr_name = "CleanMe API Budget Remaining"' in section, (
+        "CleanMeApiBudgetSensor must have full name 'CleanMe API Budget Remaining' "
+        "to generate entity_id sensor.cleanme_api_budget_remaining"
+    )
+    assert '_attr_unique_id = "cleanme_api_budget_remaining"' in section
+    assert "entities.append(CleanMeApiBudgetSensor(hass))" in source
+
+
 def test_ready_binary_sensor_name():
     """Test that CleanMeReadyBinarySensor has correct full name."""
     source = BINARY_SENSOR_PATH.read_text(encoding="utf-8")
@@ -0,0 +1,102 @@
+"""Test the pre-filter image heuristics."""
+import importlib.util
+import io
+import sys
+from pathlib import Path
+
+import pytest
+
+Image = pytest.importorskip("PIL.Image")
+ImageDraw = pytest.importorskip("PIL.ImageDraw")
+
+
+IMAGING_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "cleanme" / "imaging.py"
+
+
+def load_imaging_module():
+    spec = importlib.util.spec_from_file_location("cleanme_imaging", IMAGING_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    # dataclasses resolves string annotations through sys.modules
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _room(clutter: int = 0) -> bytes:
+    image = Image.new("RGB", (640, 480), (200, 190, 170))
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((80, 300, 560, 420), fill=(120, 80, 50))  # a table
+    for index in range(clutter):
+        x = 100 + (index * 37) % 420
+        y = 310 + (index * 23) % 90
+        draw.rectangle((x, y, x + 14, y + 10), fill=(20, 20, 200))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return buffer.getvalue()
+
+
+def test_identical_rooms_match():
+    imaging = load_imaging_module()
+    first = imaging.fingerprint(_room())
+    second = imaging.fingerprint(_room())
+    assert imaging.difference(first, second) < 0.01
+
+
+def test_clutter_raises_difference_and_edges():
+    imaging = load_imaging_module()
+    tidy = imaging.fingerprint(_room())
+    messy = imaging.fingerprint(_room(clutter=25))
+    assert messy.edge_density > tidy.edge_density
+    assert imaging.difference(tidy, messy) > imaging.difference(tidy, imaging.fingerprint(_room()))
+
+
+
+def test_parse_roi():
+    imaging = load_imaging_module()
+    assert imaging.parse_roi("") is None
+    assert imaging.parse_roi("0,40; 50,100") == ((0.0, 0.4), (0.5, 1.0))
+    assert len(imaging.parse_roi("10,30; 60,20; 95,90;")) == 3
+    for text in ("50,50", "10,20; 10,80", "10,20; 120,80", "10;20", "a,b; 1,2"):
+        with pytest.raises(ValueError):
+            imaging.parse_roi(text)
+
+
+def test_crop_regions_from_one_frame():
+    imaging = load_imaging_module()
+    rectangle = imaging.parse_roi("0,0; 50,50")
+    triangle = imaging.parse_roi("50,50; 100,50; 100,100")
+
+    crops = imaging.crop_regions(_room(clutter=10), [rectangle, triangle])
+
+    sizes = [Image.open(io.BytesIO(crop)).size for crop in crops]
+    assert sizes == [(320, 240), (320, 240)]
+    # The corner outside the triangle is blanked to the neutral background
+    with Image.open(io.BytesIO(crops[1])) as image:
+        assert all(abs(a - b) < 8 for a, b in zip(image.getpixel((5, 230)), imaging.CROP_BACKGROUND))
+
+
+def test_score_frames_prefers_the_clean_frame():
+    pytest.importorskip("numpy")
+    ImageFilter = pytest.importorskip("PIL.ImageFilter")
+    imaging = load_imaging_module()
+
+    def _jpeg(image):
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=85)
+        return buffer.getvalue()
+
+    sharp = Image.open(io.BytesIO(_room(clutter=25)))
+    blurred = _jpeg(sharp.filter(ImageFilter.GaussianBlur(4)))
+    dark = _jpeg(sharp.point(lambda value: value // 6))
+    walker = sharp.copy()
+    ImageDraw.Draw(walker).rectangle((200, 40, 420, 470), fill=(30, 30, 30))
+
+    frames = [blurred, _jpeg(walker), _room(clutter=25), _room(clutter=25), dark]
+    scores = imaging.score_frames(frames)
+
+    best = max(range(len(frames)), key=lambda index: scores[index].score)
+    assert best in (2, 3)
+    assert scores[0].sharpness < scores[2].sharpness
+    assert scores[1].motion > scores[2].motion
+    assert scores[4].exposure < scores[2].exposure
@@ -0,0 +1,72 @@
+"""Test the tolerant incremental JSON extractor used for Gemini replies."""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+JSON_EXTRACT_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "cleanme" / "json_extract.py"
+
+
+def load_json_extract_module():
+    spec = importlib.util.spec_from_file_location("cleanme_json_extract", JSON_EXTRACT_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_plain_and_fenced_json():
+    json_extract = load_json_extract_module()
+    expected = {"tidy": True, "tasks": [], "comment": "Nice {room}", "severity": "low"}
+
+    assert json_extract.extract_json('{"tidy": true, "tasks": [], "comment": "Nice {room}", "severity": "low"}') == expected
+    assert json_extract.extract_json(
+        '```json\n{"tidy": true, "tasks": [], "comment": "Nice {room}", "severity": "low"}\n```'
+    ) == expected
+
+
+def test_prose_and_trailing_commas_are_tolerated():
+    json_extract = load_json_extract_module()
+    text = 'Here is my analysis: {"tidy": false, "tasks": ["Fold laundry",],} Hope it helps!'
+    assert json_extract.extract_json(text) == {"tidy": False, "tasks": ["Fold laundry"]}
+
+
+def test_truncated_reply_is_salvaged():
+    json_extract = load_json_extract_module()
+
+    # Cut off inside the tasks array
+    assert json_extract.extract_json('{"tidy": false, "severity": "high", "tasks": ["Wash dishes", "Take out') == {
+        "tidy": False,
+        "severity": "high",
+        "tasks": ["Wash dishes", "Take out"],
+    }
+    # Cut off inside a key - keep the members that completed
+    assert json_extract.extract_json('{"tidy": true, "severity": "low", "comm') == {
+        "tidy": True,
+        "severity": "low",
+    }
+
+
+def test_top_level_fields_are_available_while_streaming():
+    json_extract = load_json_extract_module()
+    extractor = json_extract.IncrementalJSONExtractor()
+
+    extractor.feed('{"tidy": false, "sev')
+    assert extractor.fields == {"tidy": False}
+
+    extractor.feed('erity": "high", "tasks": ["Wash')
+    assert extractor.fields == {"tidy": False, "severity": "high"}
+    assert not extractor.complete
+
+    extractor.feed(' dishes"], "comment": "Yikes."}')
+    assert extractor.complete
+    assert extractor.result()["tasks"] == ["Wash dishes"]
+
+
+def test_arrays_and_missing_json():
+    json_extract = load_json_extract_module()
+    assert json_extract.extract_json('[{"zone": "Z1", "tidy": true}]') == [{"zone": "Z1", "tidy": True}]
+
+    with pytest.raises(ValueError):
+        json_extract.extract_json("I cannot see the image.")
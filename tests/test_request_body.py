@@ -0,0 +1,84 @@
+"""Test streaming JSON request bodies with inline images."""
+import asyncio
+import base64
+import json
+
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from custom_components.cleanme.request_body import (  # noqa: E402
+    CHUNK_SIZE,
+    OFFLOAD_CHUNK_SIZE,
+    InlineImage,
+    JsonImagePayload,
+)
+
+
+class CollectingWriter:
+    def __init__(self):
+        self.chunks = []
+
+    async def write(self, data):
+        self.chunks.append(bytes(data))
+
+
+def _write(body):
+    writer = CollectingWriter()
+    asyncio.run(body.write(writer))
+    return b"".join(writer.chunks), writer.chunks
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 3, CHUNK_SIZE - 1, CHUNK_SIZE, CHUNK_SIZE * 2 + 1])
+def test_body_matches_json_encoding(length):
+    """Test that the streamed body decodes to the same document as json.dumps."""
+    image = bytes(index % 251 for index in range(length))
+    payload = {
+        "contents": [
+            {"parts": [{"text": "Kitchen \"quoted\" ✓"}, {"inline_data": {"data": InlineImage(image)}}]}
+        ],
+        "generationConfig": {"temperature": 0.4},
+    }
+
+    body = JsonImagePayload(payload)
+    written, _ = _write(body)
+
+    expected = json.loads(json.dumps(payload, default=lambda obj: base64.b64encode(image).decode()))
+    assert json.loads(written) == expected
+    assert body.size == len(written)
+    assert json.loads(body.decode()) == expected
+
+
+def test_images_are_written_in_chunks():
+    """Test that no single write holds a whole image."""
+    images = [bytes(CHUNK_SIZE * 4), bytes(CHUNK_SIZE * 3)]
+    payload = {"parts": [{"inline_data": {"data": InlineImage(image)}} for image in images]}
+
+    written, chunks = _write(JsonImagePayload(payload))
+
+    assert max(len(chunk) for chunk in chunks) <= CHUNK_SIZE // 3 * 4
+    parts = json.loads(written)["parts"]
+    assert [base64.b64decode(part["inline_data"]["data"]) for part in parts] == images
+
+
+def test_offloaded_encoding_matches_inline_encoding():
+    """Test that encoding on worker threads writes the same body in larger chunks."""
+    image = bytes(index % 251 for index in range(OFFLOAD_CHUNK_SIZE * 2 + 5))
+    payload = {"parts": [{"text": "Kitchen"}, {"inline_data": {"data": InlineImage(image)}}]}
+    offloaded = []
+
+    async def _offload(func, *args):
+        offloaded.append(len(args[0]))
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    body = JsonImagePayload(payload, offload=_offload)
+    written, _ = _write(body)
+
+    assert written == _write(JsonImagePayload(payload))[0]
+    assert body.size == len(written)
+    assert offloaded == [OFFLOAD_CHUNK_SIZE, OFFLOAD_CHUNK_SIZE, 5]
+
+
+def test_unserializable_values_still_raise():
+    with pytest.raises(TypeError):
+        JsonImagePayload({"value": object()})
@@ -0,0 +1,119 @@
+"""Test the analysis result cache."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+aiohttp = pytest.importorskip("aiohttp")
+
+from custom_components.cleanme import result_cache as result_cache_module  # noqa: E402
+from custom_components.cleanme.gemini_client import BatchImage, GeminiClient  # noqa: E402
+from custom_components.cleanme.result_cache import ResultCache  # noqa: E402
+from gemini_stub import GeminiStubServer  # noqa: E402
+
+RESULT = {"tidy": False, "tasks": ["Make the bed"], "comment": "Nearly!", "severity": "low"}
+
+
+class MemoryStore:
+    """Stands in for helpers.storage.Store; delayed saves are written at once."""
+
+    def __init__(self, data=None):
+        self.data = data
+
+    async def async_load(self):
+        return self.data
+
+    def async_delay_save(self, data_func, delay):
+        self.data = data_func()
+
+
+def _key(room="Kitchen"):
+    return ("digest", room, "friendly", 3, "model")
+
+
+def test_least_recently_used_entry_is_evicted():
+    async def _run():
+        cache = ResultCache(max_entries=2)
+        cache.put(_key("A"), RESULT)
+        cache.put(_key("B"), RESULT)
+        await cache.async_get(_key("A"))
+        cache.put(_key("C"), RESULT)
+        return cache, [await cache.async_get(_key(room)) is not None for room in "ABC"]
+
+    cache, present = asyncio.run(_run())
+
+    assert present == [True, False, True]
+    assert cache.metrics["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(result_cache_module.time, "time", lambda: now[0])
+
+    async def _run():
+        cache = ResultCache(ttl_seconds=60)
+        cache.put(_key(), RESULT)
+        fresh = await cache.async_get(_key())
+        now[0] += 61
+        return fresh, await cache.async_get(_key())
+
+    fresh, expired = asyncio.run(_run())
+
+    assert fresh == RESULT
+    assert expired is None
+
+
+def test_hits_are_copies():
+    async def _run():
+        cache = ResultCache()
+        cache.put(_key(), RESULT)
+        (await cache.async_get(_key()))["tasks"].append("Mutated")
+        return await cache.async_get(_key())
+
+    assert asyncio.run(_run())["tasks"] == ["Make the bed"]
+
+
+def test_persistent_tier_survives_a_restart():
+    store = MemoryStore()
+
+    async def _run():
+        ResultCache(store=store).put(_key(), {**RESULT, "api_response_time": 1.5})
+        return await ResultCache(store=store).async_get(_key())
+
+    assert asyncio.run(_run()) == RESULT
+
+
+def test_identical_frames_skip_the_network():
+    async def _run():
+        async with GeminiStubServer() as stub, aiohttp.ClientSession() as session:
+            client = GeminiClient("key", api_base=stub.base_url, result_cache=ResultCache())
+            results = []
+            for room in ("Kitchen", "Kitchen", "Office"):
+                results.append(
+                    await client.analyze_image(
+                        session=session,
+                        image_bytes=b"placeholder-jpeg",
+                        room_name=room,
+                        personality="friendly",
+                        pickiness=3,
+                    )
+                )
+            await client.analyze_images(
+                session,
+                [
+                    BatchImage("entry_a", "Kitchen", b"placeholder-jpeg", "friendly", 3),
+                    BatchImage("entry_b", "Hall", b"hall-jpeg", "friendly", 3),
+                ],
+            )
+            return stub, results
+
+    stub, results = asyncio.run(_run())
+
+    assert "cached" not in results[0]
+    assert results[1]["cached"] is True
+    assert results[1]["tasks"] == results[0]["tasks"]
+    assert "cached" not in results[2], "A different room is a different prompt"
+    generate = stub.requests_to(":generateContent")
+    assert len(generate) == 3
+    batch_images = [part for part in generate[-1]["body"]["contents"][0]["parts"] if "text" not in part]
+    assert len(batch_images) == 1, "Cached zones are left out of the batch"
@@ -0,0 +1,186 @@
+"""Test sharing camera snapshots between zones."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.cleanme.snapshots import SnapshotBroker  # noqa: E402
+
+
+class SlowCamera:
+    def __init__(self, delay=0.01, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("camera.kitchen is unavailable")
+        return b"frame-%d" % self.calls
+
+
+def test_concurrent_requests_share_one_fetch():
+    camera = SlowCamera()
+    broker = SnapshotBroker(window=0)
+
+    async def _run():
+        return await asyncio.gather(
+            *(broker.async_get_image("camera.kitchen", camera.fetch) for _ in range(3))
+        )
+
+    assert asyncio.run(_run()) == [b"frame-1"] * 3
+    assert camera.calls == 1
+    assert broker.metrics["shared"] == 2
+
+
+def test_snapshot_is_reused_within_window_only():
+    camera = SlowCamera(delay=0)
+
+    async def _run(window):
+        broker = SnapshotBroker(window=window)
+        first = await broker.async_get_image("camera.kitchen", camera.fetch)
+        second = await broker.async_get_image("camera.kitchen", camera.fetch)
+        other = await broker.async_get_image("camera.hall", camera.fetch)
+        return first, second, other
+
+    first, second, other = asyncio.run(_run(10))
+    assert first == second
+    assert other != first
+    assert camera.calls == 2
+
+    first, second, _ = asyncio.run(_run(0))
+    assert first != second
+
+
+def test_failures_reach_waiters_and_are_not_reused():
+    camera = SlowCamera(fail=True)
+    broker = SnapshotBroker(window=10)
+
+    async def _run():
+        results = await asyncio.gather(
+            broker.async_get_image("camera.kitchen", camera.fetch),
+            broker.async_get_image("camera.kitchen", camera.fetch),
+            return_exceptions=True,
+        )
+        camera.fail = False
+        return results, await broker.async_get_image("camera.kitchen", camera.fetch)
+
+    results, retry = asyncio.run(_run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert retry == b"frame-2"
+    assert broker.metrics["failures"] == 1
+
+
+def test_cancelled_waiter_does_not_cancel_the_fetch():
+    camera = SlowCamera(delay=0.05)
+    broker = SnapshotBroker(window=0)
+
+    async def _run():
+        owner = asyncio.create_task(broker.async_get_image("camera.kitchen", camera.fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(broker.async_get_image("camera.kitchen", camera.fetch))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        return await owner
+
+    assert asyncio.run(_run()) == b"frame-1"
+
+
+class Cropper:
+    def __init__(self):
+        self.calls = []
+
+    async def crop(self, image_bytes, rois):
+        self.calls.append(list(rois))
+        await asyncio.sleep(0)
+        return [image_bytes + b":" + repr(roi).encode() for roi in rois]
+
+
+KITCHEN = ((0.0, 0.0), (0.5, 1.0))
+DINING = ((0.5, 0.0), (1.0, 1.0))
+
+
+def test_registered_regions_are_cropped_once_per_frame():
+    camera = SlowCamera()
+    cropper = Cropper()
+    broker = SnapshotBroker(window=0)
+    broker.register_region("camera.kitchen", KITCHEN)
+    broker.register_region("camera.kitchen", DINING)
+
+    async def _run():
+        return await asyncio.gather(
+            *(
+                broker.async_get_region("camera.kitchen", roi, camera.fetch, cropper.crop)
+                for roi in (KITCHEN, DINING)
+            )
+        )
+
+    kitchen, dining = asyncio.run(_run())
+
+    assert kitchen.endswith(repr(KITCHEN).encode())
+    assert dining.endswith(repr(DINING).encode())
+    assert camera.calls == 1
+    assert cropper.calls == [[KITCHEN, DINING]]
+    assert broker.metrics["crops_shared"] == 1
+
+
+def test_crops_follow_the_share_window():
+    camera = SlowCamera(delay=0)
+    cropper = Cropper()
+
+    async def _run(window):
+        broker = SnapshotBroker(window=window)
+        unregister = broker.register_region("camera.kitchen", KITCHEN)
+        await broker.async_get_region("camera.kitchen", KITCHEN, camera.fetch, cropper.crop)
+        await broker.async_get_region("camera.kitchen", KITCHEN, camera.fetch, cropper.crop)
+        # Unregistered regions are still cropped, just on their own
+        await broker.async_get_region("camera.kitchen", DINING, camera.fetch, cropper.crop)
+        unregister()
+        return broker.metrics
+
+    metrics = asyncio.run(_run(10))
+    assert len(cropper.calls) == 2
+    assert metrics["crops_shared"] == 1
+    assert metrics["regions"] == 0
+
+    cropper.calls.clear()
+    asyncio.run(_run(0))
+    assert len(cropper.calls) == 3
+
+
+def test_waiters_fetch_again_when_the_owner_is_cancelled():
+    camera = SlowCamera(delay=0.05)
+    broker = SnapshotBroker(window=0)
+
+    async def _run():
+        owner = asyncio.create_task(broker.async_get_image("camera.kitchen", camera.fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(broker.async_get_image("camera.kitchen", camera.fetch))
+        await asyncio.sleep(0)
+        owner.cancel()
+        return await waiter
+
+    assert asyncio.run(_run()) == b"frame-2"
+    assert camera.calls == 2
+
+
+def test_hold_keeps_snapshots_until_the_sweep_ends():
+    camera = SlowCamera(delay=0)
+    broker = SnapshotBroker(window=0)
+
+    async def _run():
+        with broker.hold():
+            first = await broker.async_get_image("camera.kitchen", camera.fetch)
+            second = await broker.async_get_image("camera.kitchen", camera.fetch)
+        third = await broker.async_get_image("camera.kitchen", camera.fetch)
+        return first, second, third
+
+    first, second, third = asyncio.run(_run())
+
+    assert first == second
+    assert third != first
+    assert broker.metrics["cameras_held"] == 0
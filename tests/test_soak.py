@@ -0,0 +1,36 @@
+"""Short soak run: many zones over simulated days with injected failures."""
+import asyncio
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("aiohttp")
+
+from soak import async_run_soak  # noqa: E402
+
+ZONES = 50
+DAYS = 2
+
+
+def test_soak_has_no_leaks_and_survives_failures(monkeypatch):
+    report = asyncio.run(
+        async_run_soak(
+            monkeypatch,
+            zones=ZONES,
+            days=DAYS,
+            frequency="4x",
+            camera_failure_rate=0.05,
+            rate_limit_rate=0.1,
+            slow_rate=0.02,
+            slow_latency=0.05,
+        )
+    )
+    print(report.format())
+
+    assert report.checks == ZONES * 4 * DAYS
+    assert report.errors.get("camera", 0) > 0
+    assert report.errors.get("rate_limited", 0) > 0
+    assert report.leftover_tasks == 0, "Checks should not leave tasks behind"
+    # Per-zone state is bounded; allow some allocator noise but not per-check growth
+    assert report.memory_growth_bytes < 512 * 1024
+    assert report.max_tasks < ZONES * 2
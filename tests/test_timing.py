@@ -0,0 +1,90 @@
+"""Test check pipeline span timing and latency percentiles."""
+import importlib.util
+from pathlib import Path
+
+
+COMPONENT_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "cleanme"
+TIMING_PATH = COMPONENT_PATH / "timing.py"
+
+
+def load_timing_module():
+    spec = importlib.util.spec_from_file_location("cleanme_timing", TIMING_PATH)
+    module = importlib.util.module_from_spec(spec)
+    assert spec and spec.loader
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_spans_only_record_inside_a_check():
+    timing = load_timing_module()
+
+    with timing.span(timing.SPAN_ENCODE):
+        pass
+    assert timing.current_timer() is None
+
+    with timing.track_check() as timer:
+        with timing.span(timing.SPAN_ENCODE):
+            pass
+        with timing.span(timing.SPAN_PARSE):
+            pass
+        with timing.span(timing.SPAN_PARSE):
+            pass
+    assert set(timer.spans) == {timing.SPAN_ENCODE, timing.SPAN_PARSE}
+    assert timer.total >= sum(timer.spans.values())
+    assert timing.current_timer() is None
+
+
+def test_record_request_splits_send_and_wait():
+    timing = load_timing_module()
+
+    with timing.track_check() as timer:
+        start = timing.time.perf_counter()
+        timer.mark(timing.MARK_REQUEST_SENT)
+        timing.record_request(start)
+    assert set(timer.spans) == {timing.SPAN_SEND, timing.SPAN_WAIT}
+
+
+def test_histogram_percentiles_use_nearest_rank():
+    timing = load_timing_module()
+    histogram = timing.LatencyHistogram(window=100)
+    for millis in range(1, 101):
+        histogram.add(millis / 1000)
+
+    summary = histogram.summary()
+    assert summary["count"] == 100
+    assert summary["p50_ms"] == 50.0
+    assert summary["p95_ms"] == 95.0
+    assert summary["p99_ms"] == 99.0
+    assert summary["max_ms"] == 100.0
+
+
+def test_histogram_window_is_rolling():
+    timing = load_timing_module()
+    histogram = timing.LatencyHistogram(window=10)
+    for _ in range(10):
+        histogram.add(5.0)
+    for _ in range(10):
+        histogram.add(0.1)
+    assert histogram.percentile(99) == 0.1
+    assert histogram.count == 20
+
+
+def test_recorder_tracks_total_per_check():
+    timing = load_timing_module()
+    recorder = timing.LatencyRecorder()
+    with timing.track_check() as timer:
+        with timing.span(timing.SPAN_CAPTURE):
+            pass
+    recorder.record(timer)
+
+    summary = recorder.summary()
+    assert summary[timing.SPAN_TOTAL]["count"] == 1
+    assert summary[timing.SPAN_CAPTURE]["count"] == 1
+    assert timing.SPAN_TOTAL in recorder.last
+
+
+def test_gemini_client_is_instrumented():
+    source = (COMPONENT_PATH / "gemini_client.py").read_text(encoding="utf-8")
+    for name in ("SPAN_ENCODE", "SPAN_PARSE", "SPAN_VALIDATE", "SPAN_RECEIVE", "record_request("):
+        assert name in source
+    assert "time.time()" not in source, "Latency should be measured with perf_counter"
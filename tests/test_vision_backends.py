@@ -0,0 +1,98 @@
+"""Test the pluggable vision backend wiring."""
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+
+COMPONENT_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "cleanme"
+VISION_PATH = COMPONENT_PATH / "vision.py"
+LOCAL_MODEL_PATH = COMPONENT_PATH / "local_model.py"
+COORDINATOR_PATH = COMPONENT_PATH / "coordinator.py"
+MANIFEST_PATH = COMPONENT_PATH / "manifest.json"
+
+
+def test_zones_create_backends_through_registry():
+    """Test that zones no longer construct GeminiClient directly."""
+    source = COORDINATOR_PATH.read_text(encoding="utf-8")
+    assert "create_backend(hass, data)" in source
+    assert "GeminiClient(" not in source
+
+
+def test_gemini_and_local_backends_are_registered():
+    """Test that both built-in backends are registered by name."""
+    source = VISION_PATH.read_text(encoding="utf-8")
+    assert "register_backend(BACKEND_GEMINI" in source
+    assert "register_backend(BACKEND_LOCAL" in source
+
+
+def test_local_backend_runs_in_executor():
+    """Test that ONNX inference runs on the CPU executor, off the event loop."""
+    source = LOCAL_MODEL_PATH.read_text(encoding="utf-8")
+    assert "async_run(self.classify" in source
+    assert "CPUExecutionProvider" in source
+
+
+def test_local_backend_dependencies_are_optional():
+    """Test that onnxruntime is not a hard requirement of the integration."""
+    manifest = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+    assert not any("onnxruntime" in req for req in manifest.get("requirements", []))
+    source = LOCAL_MODEL_PATH.read_text(encoding="utf-8")
+    assert "except ImportError" in source
+
+
+def test_pre_filter_only_references_tidy_frames():
+    """Test that only frames the primary backend judged tidy can skip later checks."""
+    source = VISION_PATH.read_text(encoding="utf-8")
+    assert 'self._reference = current if result.get("tidy") else None' in source
+    assert "async_run(fingerprint" in source
+    assert '"gate_saved"' in source
+
+
+def test_local_backend_flags_messy_rooms(monkeypatch):
+    """Test that messy local results carry a task and a messiness score."""
+    pytest.importorskip("homeassistant")
+    from custom_components.cleanme import local_model
+
+    class InlineExecutor:
+        async def async_run(self, func, *args):
+            return func(*args)
+
+    monkeypatch.setattr(local_model, "ONNX_AVAILABLE", True)
+    monkeypatch.setattr(local_model, "async_get_cpu_executor", lambda hass: InlineExecutor())
+    backend = local_model.LocalOnnxBackend(None, "model.onnx")
+
+    results = {}
+    for label in ("tidy", "high"):
+        monkeypatch.setattr(backend, "classify", lambda image_bytes, label=label: (label, 0.9))
+        results[label] = asyncio.run(backend.analyze_image(None, b"jpeg", "Kitchen", "friendly", 3))
+
+    assert results["tidy"]["tasks"] == []
+    assert results["tidy"]["messiness_score"] == 0
+    assert results["high"]["tasks"] == ["Tidy up the Kitchen"]
+    assert results["high"]["severity"] == "high"
+    assert results["high"]["messiness_score"] == 90
+
+
+def test_personality_change_and_mark_clean_reset_the_pre_filter(monkeypatch):
+    """Test that the zone forgets the tidy reference frame when what counts as tidy changes."""
+    pytest.importorskip("homeassistant")
+    from custom_components.cleanme.const import CONF_API_KEY, CONF_CAMERA_ENTITY
+    from custom_components.cleanme.coordinator import CleanMeZone
+    from custom_components.cleanme.vision import TieredBackend
+    from fake_hass import FakeHass
+
+    zone = CleanMeZone(
+        FakeHass(), "entry_kitchen", "Kitchen", {CONF_CAMERA_ENTITY: "camera.kitchen", CONF_API_KEY: "key"}
+    )
+    backend = zone._backend = TieredBackend(zone.hass, zone._backend, 0.05)
+    monkeypatch.setattr(CleanMeZone, "_async_save_state", lambda self: asyncio.sleep(0))
+
+    backend._reference = object()
+    asyncio.run(zone.async_set_personality("pirate"))
+    assert backend._reference is None
+
+    backend._reference = object()
+    asyncio.run(zone.async_mark_clean())
+    assert backend._reference is None
@@ -0,0 +1,82 @@
+"""Test the event loop watchdog."""
+import asyncio
+import logging
+import time
+from pathlib import Path
+
+import pytest
+
+
+COMPONENT_PATH = Path(__file__).resolve().parent.parent / "custom_components" / "cleanme"
+
+
+def test_operations_are_marked():
+    """Test that checks, setup and dashboard regeneration are attributed."""
+    coordinator = (COMPONENT_PATH / "coordinator.py").read_text(encoding="utf-8")
+    init = (COMPONENT_PATH / "__init__.py").read_text(encoding="utf-8")
+    assert 'operation(f"check:{self._name}")' in coordinator
+    assert 'operation(f"setup:{self._name}")' in coordinator
+    assert 'operation("check_all")' in coordinator
+    assert 'operation("dashboard")' in init
+    assert "async_setup_loop_watchdog(hass)" in init
+
+
+def test_watchdog_is_opt_in():
+    """Test that the watchdog thread only runs when enabled."""
+    const = (COMPONENT_PATH / "const.py").read_text(encoding="utf-8")
+    assert "DEFAULT_LOOP_WATCHDOG = False" in const
+
+
+def _block_loop(seconds):
+    """Hold the loop without time.sleep, which Home Assistant flags as a blocking call."""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+def test_stall_is_detected():
+    """Test that blocking the loop is measured, and not blamed on CleanMe from outside it."""
+    pytest.importorskip("homeassistant")
+    from custom_components.cleanme.watchdog import LoopWatchdog, operation
+
+    async def _run():
+        watchdog = LoopWatchdog(asyncio.get_running_loop(), 0.05)
+        watchdog.start()
+        try:
+            await asyncio.sleep(0.1)
+            # An awaiting CleanMe operation while foreign code blocks the loop
+            with operation("check:Kitchen"):
+                _block_loop(0.3)
+            await asyncio.sleep(0.2)
+        finally:
+            watchdog.stop()
+        return watchdog.metrics
+
+    metrics = asyncio.run(_run())
+
+    assert metrics["stalls"] == {"other": 1}
+    assert metrics["max_stall_ms"] >= 250
+    assert metrics["recent_stalls"] == []
+
+
+def test_stall_in_cleanme_code_is_attributed(caplog):
+    """Test that a stall with CleanMe frames is logged with its operation."""
+    pytest.importorskip("homeassistant")
+    from custom_components.cleanme.watchdog import LoopWatchdog
+
+    watchdog = LoopWatchdog(asyncio.new_event_loop(), 0.1)
+    with caplog.at_level(logging.WARNING):
+        watchdog._report(
+            {
+                "started": 0.0,
+                "duration": 0.4,
+                "operations": ["check:Kitchen"],
+                "stack": ["  File \"coordinator.py\", line 1, in async_request_check\n"],
+                "cleanme_frames": ["coordinator.py:1 in async_request_check"],
+            }
+        )
+
+    metrics = watchdog.metrics
+    assert metrics["stalls"] == {"check:Kitchen": 1}
+    assert metrics["recent_stalls"][0]["frames"] == ["coordinator.py:1 in async_request_check"]
+    assert "400 ms during check:Kitchen" in caplog.text